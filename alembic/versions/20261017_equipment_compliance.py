@@ -0,0 +1,159 @@
+"""add equipment_compliance snapshot table
+
+Revision ID: 20261017_equipment_compliance
+Revises: 20260306_sample_disposed_by
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_equipment_compliance"
+down_revision = "20260306_sample_disposed_by"
+branch_labels = None
+depends_on = None
+
+compliance_type = sa.Enum(
+    "calibration",
+    "inspection",
+    "verification",
+    name="compliancetype",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "equipment_compliance",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("equipment_id", sa.Integer(), nullable=False),
+        sa.Column("terminal_id", sa.Integer(), nullable=False),
+        sa.Column("compliance_type", compliance_type, nullable=False),
+        sa.Column("verification_type_id", sa.Integer(), nullable=True),
+        sa.Column("frequency_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_performed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("next_due_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["equipment_id"], ["equipment.id"]),
+        sa.ForeignKeyConstraint(["terminal_id"], ["company_terminal.id"]),
+        sa.ForeignKeyConstraint(
+            ["verification_type_id"],
+            ["equipment_type_verification.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_equipment_compliance_equipment_id",
+        "equipment_compliance",
+        ["equipment_id"],
+    )
+    op.create_index(
+        "ix_equipment_compliance_terminal_due",
+        "equipment_compliance",
+        ["terminal_id", "next_due_at"],
+    )
+    op.create_index(
+        "ix_equipment_compliance_next_due_at",
+        "equipment_compliance",
+        ["next_due_at"],
+    )
+
+    # Backfill: misma regla que app.utils.equipment_compliance.
+    op.execute(
+        """
+        INSERT INTO equipment_compliance (
+            equipment_id, terminal_id, compliance_type, verification_type_id,
+            frequency_days, last_performed_at, next_due_at, updated_at
+        )
+        SELECT
+            e.id,
+            e.terminal_id,
+            'calibration',
+            NULL,
+            et.calibration_days,
+            last.performed_at,
+            CASE
+                WHEN last.performed_at IS NULL THEN e.created_at
+                WHEN et.calibration_days > 0
+                    THEN last.performed_at + make_interval(days => et.calibration_days)
+            END,
+            now()
+        FROM equipment e
+        JOIN equipment_type et ON et.id = e.equipment_type_id
+        LEFT JOIN (
+            SELECT equipment_id, MAX(calibrated_at) AS performed_at
+            FROM equipment_calibration
+            GROUP BY equipment_id
+        ) last ON last.equipment_id = e.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO equipment_compliance (
+            equipment_id, terminal_id, compliance_type, verification_type_id,
+            frequency_days, last_performed_at, next_due_at, updated_at
+        )
+        SELECT
+            e.id,
+            e.terminal_id,
+            'inspection',
+            NULL,
+            freq.days,
+            last.performed_at,
+            CASE
+                WHEN freq.days <= 0 AND last.performed_at IS NULL THEN NULL
+                WHEN last.performed_at IS NULL THEN e.created_at
+                WHEN freq.days > 0
+                    THEN last.performed_at + make_interval(days => freq.days)
+            END,
+            now()
+        FROM equipment e
+        JOIN equipment_type et ON et.id = e.equipment_type_id
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(e.inspection_days_override, et.inspection_days) AS days
+        ) freq
+        LEFT JOIN (
+            SELECT equipment_id, MAX(inspected_at) AS performed_at
+            FROM equipment_inspection
+            GROUP BY equipment_id
+        ) last ON last.equipment_id = e.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO equipment_compliance (
+            equipment_id, terminal_id, compliance_type, verification_type_id,
+            frequency_days, last_performed_at, next_due_at, updated_at
+        )
+        SELECT
+            e.id,
+            e.terminal_id,
+            'verification',
+            etv.id,
+            etv.frequency_days,
+            last.performed_at,
+            CASE
+                WHEN etv.frequency_days <= 0 THEN NULL
+                WHEN last.performed_at IS NULL THEN e.created_at
+                ELSE last.performed_at + make_interval(days => etv.frequency_days)
+            END,
+            now()
+        FROM equipment e
+        JOIN equipment_type_verification etv
+            ON etv.equipment_type_id = e.equipment_type_id
+            AND etv.is_active
+        LEFT JOIN (
+            SELECT equipment_id, verification_type_id, MAX(verified_at) AS performed_at
+            FROM equipment_verification
+            GROUP BY equipment_id, verification_type_id
+        ) last ON last.equipment_id = e.id AND last.verification_type_id = etv.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_equipment_compliance_next_due_at", table_name="equipment_compliance")
+    op.drop_index("ix_equipment_compliance_terminal_due", table_name="equipment_compliance")
+    op.drop_index("ix_equipment_compliance_equipment_id", table_name="equipment_compliance")
+    op.drop_table("equipment_compliance")
+    compliance_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""keyset index for external_analysis_record listing
+
+Revision ID: 20261017_ext_record_keyset
+Revises: 20261017_sample_disposal_due
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_ext_record_keyset"
+down_revision = "20261017_sample_disposal_due"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # El listado por terminal pagina por (performed_at, id); el índice por
+    # terminal_id solo queda cubierto por el nuevo.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_external_analysis_record_terminal_performed_id",
+            "external_analysis_record",
+            ["terminal_id", "performed_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_external_analysis_record_terminal_id",
+            table_name="external_analysis_record",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_external_analysis_record_terminal_id",
+            "external_analysis_record",
+            ["terminal_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_external_analysis_record_terminal_performed_id",
+            table_name="external_analysis_record",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
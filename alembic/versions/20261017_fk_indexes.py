@@ -0,0 +1,114 @@
+"""add indexes on history and child table foreign keys
+
+Revision ID: 20261017_fk_indexes
+Revises: 20261017_equipment_compliance
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_fk_indexes"
+down_revision = "20261017_equipment_compliance"
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas). Mismo orden que las consultas: filtro por
+# igualdad primero y columna de orden/rango al final.
+INDEXES: list[tuple[str, str, list[str]]] = [
+    (
+        "ix_equipment_reading_equipment_measured",
+        "equipment_reading",
+        ["equipment_id", "measured_at"],
+    ),
+    (
+        "ix_equipment_inspection_equipment_inspected",
+        "equipment_inspection",
+        ["equipment_id", "inspected_at"],
+    ),
+    (
+        "ix_equipment_inspection_response_inspection_id",
+        "equipment_inspection_response",
+        ["inspection_id"],
+    ),
+    (
+        "ix_equipment_verification_equipment_verified",
+        "equipment_verification",
+        ["equipment_id", "verified_at"],
+    ),
+    (
+        "ix_equipment_verification_equipment_type_verified",
+        "equipment_verification",
+        ["equipment_id", "verification_type_id", "verified_at"],
+    ),
+    (
+        "ix_equipment_verification_response_verification_id",
+        "equipment_verification_response",
+        ["verification_id"],
+    ),
+    (
+        "ix_equipment_calibration_equipment_calibrated",
+        "equipment_calibration",
+        ["equipment_id", "calibrated_at"],
+    ),
+    (
+        "ix_equipment_calibration_result_calibration_id",
+        "equipment_calibration_result",
+        ["calibration_id"],
+    ),
+    (
+        "ix_equipment_status_history_equipment_ended",
+        "equipment_status_history",
+        ["equipment_id", "ended_at"],
+    ),
+    (
+        "ix_equipment_terminal_history_equipment_ended",
+        "equipment_terminal_history",
+        ["equipment_id", "ended_at"],
+    ),
+    (
+        "ix_equipment_type_history_equipment_ended",
+        "equipment_type_history",
+        ["equipment_id", "ended_at"],
+    ),
+    (
+        "ix_sample_terminal_created",
+        "sample",
+        ["terminal_id", "created_at"],
+    ),
+    (
+        "ix_sample_analysis_sample_id",
+        "sample_analysis",
+        ["sample_id"],
+    ),
+    (
+        "ix_external_analysis_record_terminal_type_performed",
+        "external_analysis_record",
+        ["terminal_id", "analysis_type_id", "performed_at"],
+    ),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY evita bloquear escrituras en tablas con historial grande;
+    # no puede ejecutarse dentro de una transacción.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,52 @@
+"""move sample sequence to terminal_sample_counter
+
+Revision ID: 20261017_sample_counter
+Revises: 20261017_fk_indexes
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_sample_counter"
+down_revision = "20261017_fk_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "terminal_sample_counter",
+        sa.Column("terminal_id", sa.Integer(), nullable=False),
+        sa.Column("next_sequence", sa.Integer(), nullable=False, server_default="1"),
+        sa.ForeignKeyConstraint(["terminal_id"], ["company_terminal.id"]),
+        sa.PrimaryKeyConstraint("terminal_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO terminal_sample_counter (terminal_id, next_sequence)
+        SELECT ct.id, GREATEST(ct.next_sample_sequence, COALESCE(MAX(s.sequence), 0) + 1)
+        FROM company_terminal ct
+        LEFT JOIN sample s ON s.terminal_id = ct.id
+        GROUP BY ct.id, ct.next_sample_sequence
+        """
+    )
+    op.drop_column("company_terminal", "next_sample_sequence")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "company_terminal",
+        sa.Column("next_sample_sequence", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.execute(
+        """
+        UPDATE company_terminal ct
+        SET next_sample_sequence = tsc.next_sequence
+        FROM terminal_sample_counter tsc
+        WHERE tsc.terminal_id = ct.id
+        """
+    )
+    op.alter_column("company_terminal", "next_sample_sequence", server_default=None)
+    op.drop_table("terminal_sample_counter")
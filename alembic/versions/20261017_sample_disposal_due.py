@@ -0,0 +1,50 @@
+"""add sample.disposal_due_at with partial index for the retention sweep
+
+Revision ID: 20261017_sample_disposal_due
+Revises: 20261017_sample_keyset_index
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_sample_disposal_due"
+down_revision = "20261017_sample_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sample",
+        sa.Column("disposal_due_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Misma regla que app.utils.sample_retention.disposal_due_at.
+    op.execute(
+        """
+        UPDATE sample
+        SET disposal_due_at = created_at + make_interval(days => retention_days)
+        WHERE retention_days IS NOT NULL
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sample_disposal_due_pending",
+            "sample",
+            ["disposal_due_at", "id"],
+            postgresql_where=sa.text("disposed_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_sample_disposal_due_pending",
+            table_name="sample",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("sample", "disposal_due_at")
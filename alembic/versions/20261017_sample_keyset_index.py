@@ -0,0 +1,50 @@
+"""replace sample (terminal_id, created_at) index with keyset index
+
+Revision ID: 20261017_sample_keyset_index
+Revises: 20261017_sample_counter
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_sample_keyset_index"
+down_revision = "20261017_sample_counter"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # El listado pagina por (created_at, id) dentro de la terminal; con `id`
+    # en el índice el cursor y el orden se resuelven sin ordenar aparte.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sample_terminal_created_id",
+            "sample",
+            ["terminal_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_sample_terminal_created",
+            table_name="sample",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sample_terminal_created",
+            "sample",
+            ["terminal_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_sample_terminal_created_id",
+            table_name="sample",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
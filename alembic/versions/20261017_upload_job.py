@@ -0,0 +1,72 @@
+"""add upload_job queue table
+
+Revision ID: 20261017_upload_job
+Revises: 20261017_ext_record_keyset
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_upload_job"
+down_revision = "20261017_ext_record_keyset"
+branch_labels = None
+depends_on = None
+
+upload_job_kind = sa.Enum(
+    "calibration_certificate",
+    "external_analysis_report",
+    name="uploadjobkind",
+)
+upload_job_status = sa.Enum(
+    "pending",
+    "processing",
+    "done",
+    "failed",
+    name="uploadjobstatus",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_job",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", upload_job_kind, nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("terminal_id", sa.Integer(), nullable=False),
+        sa.Column("storage_path", sa.String(), nullable=False),
+        sa.Column("spool_path", sa.String(), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=False),
+        sa.Column("status", upload_job_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("result_url", sa.String(), nullable=True),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["terminal_id"], ["company_terminal.id"]),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_upload_job_status_next_attempt",
+        "upload_job",
+        ["status", "next_attempt_at"],
+    )
+    op.create_index(
+        "ix_upload_job_kind_target",
+        "upload_job",
+        ["kind", "target_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_job_kind_target", table_name="upload_job")
+    op.drop_index("ix_upload_job_status_next_attempt", table_name="upload_job")
+    op.drop_table("upload_job")
+    upload_job_status.drop(op.get_bind(), checkfirst=True)
+    upload_job_kind.drop(op.get_bind(), checkfirst=True)
@@ -20,6 +20,7 @@ from app.api.v1 import (
     external_analyses,
     hydrometer,
     samples,
+    upload_jobs,
     users,
 )
 
@@ -42,3 +43,4 @@ api_router.include_router(equipment_calibrations.router)
 api_router.include_router(equipment_readings.router)
 api_router.include_router(hydrometer.router)
 api_router.include_router(samples.router)
+api_router.include_router(upload_jobs.router)
@@ -10,6 +10,7 @@ from app.core.security.refresh_token import (
     generate_refresh_token,
     hash_refresh_token,
 )
+from app.core.security.user_cache import revoke_user_tokens
 from app.db.session import get_session
 from app.models.user import User
 
@@ -161,6 +162,6 @@ def logout(
     - 401: token inválido o expirado.
     """
     current_user.refresh_token_hash = None
-    current_user.token_version += 1
+    revoke_user_tokens(current_user)
     session.add(current_user)
     session.commit()
@@ -3,9 +3,11 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import field_validator
 from sqlmodel import Session, SQLModel, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security.authorization import require_role
-from app.db.session import get_session
+from app.core.security.authorization import require_role, require_role_async
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope, get_terminal_scope_async
+from app.db.session import get_async_session, get_session
 from app.models.company import Company
 from app.models.company_block import CompanyBlock
 from app.models.company_terminal import (
@@ -22,8 +24,11 @@ from app.models.external_analysis_terminal import ExternalAnalysisTerminal
 from app.models.refs import CompanyBlockRef, CompanyRef, UserRef
 from app.models.sample import Sample
 from app.models.terminal_product_type import TerminalProduct
+from app.models.terminal_sample_counter import TerminalSampleCounter
 from app.models.user import User
 from app.models.user_terminal import UserTerminal
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_id_cursor, encode_cursor
+from app.utils.sample_sequence import get_next_sample_sequences
 
 router = APIRouter(
     prefix="/company-terminals",
@@ -92,18 +97,91 @@ def _get_terminal_has_samples_map(
     }
 
 
-def _assert_terminal_access(
+def _load_terminal_prefetch_data(
     session: Session,
-    current_user: User,
-    terminal_id: int,
-) -> None:
-    if current_user.user_type == UserType.superadmin:
-        return
-    allowed_terminal_ids = session.exec(
-        select(UserTerminal.terminal_id).where(UserTerminal.user_id == current_user.id)
-    ).all()
-    if allowed_terminal_ids and terminal_id not in allowed_terminal_ids:
-        raise HTTPException(status_code=404, detail="Terminal no encontrado.")
+    terminals: list[CompanyTerminal],
+    include_set: set[str],
+) -> dict[str, Any]:
+    terminal_ids = [terminal.id for terminal in terminals if terminal.id is not None]
+    blocks_by_id: dict[int, CompanyBlock] = {}
+    companies_by_id: dict[int, Company] = {}
+    users_by_id: dict[int, User] = {}
+
+    if "block" in include_set:
+        block_ids = {terminal.block_id for terminal in terminals}
+        if block_ids:
+            blocks_by_id = {
+                block.id: block
+                for block in session.exec(
+                    select(CompanyBlock).where(CompanyBlock.id.in_(block_ids))  # type: ignore[union-attr]
+                ).all()
+                if block.id is not None
+            }
+
+    # Propietaria y administradora salen de la misma tabla: una sola consulta.
+    company_ids: set[int] = set()
+    if "owner_company" in include_set:
+        company_ids.update(terminal.owner_company_id for terminal in terminals)
+    if "admin_company" in include_set:
+        company_ids.update(terminal.admin_company_id for terminal in terminals)
+    if company_ids:
+        companies_by_id = {
+            company.id: company
+            for company in session.exec(
+                select(Company).where(Company.id.in_(company_ids))  # type: ignore[union-attr]
+            ).all()
+            if company.id is not None
+        }
+
+    if "creator" in include_set:
+        creator_ids = {terminal.created_by_user_id for terminal in terminals}
+        if creator_ids:
+            users_by_id = {
+                user.id: user
+                for user in session.exec(
+                    select(User).where(User.id.in_(creator_ids))  # type: ignore[union-attr]
+                ).all()
+                if user.id is not None
+            }
+
+    return {
+        "has_samples_by_terminal_id": _get_terminal_has_samples_map(session, terminal_ids),
+        "next_sequence_by_terminal_id": get_next_sample_sequences(session, terminal_ids),
+        "blocks_by_id": blocks_by_id,
+        "companies_by_id": companies_by_id,
+        "users_by_id": users_by_id,
+    }
+
+
+def _build_terminal_read_with_includes(
+    terminal: CompanyTerminal,
+    *,
+    include_set: set[str],
+    prefetch_data: dict[str, Any],
+) -> CompanyTerminalReadWithIncludes:
+    terminal_id = terminal.id if terminal.id is not None else -1
+    response = CompanyTerminalReadWithIncludes(
+        **terminal.model_dump(),
+        has_samples=prefetch_data["has_samples_by_terminal_id"].get(terminal_id, False),
+        next_sample_sequence=prefetch_data["next_sequence_by_terminal_id"].get(terminal_id, 1),
+    )
+    if "block" in include_set:
+        block = prefetch_data["blocks_by_id"].get(terminal.block_id)
+        if block is not None:
+            response.block = _to_block_ref(block)
+    if "owner_company" in include_set:
+        owner_company = prefetch_data["companies_by_id"].get(terminal.owner_company_id)
+        if owner_company is not None:
+            response.owner_company = _to_company_ref(owner_company)
+    if "admin_company" in include_set:
+        admin_company = prefetch_data["companies_by_id"].get(terminal.admin_company_id)
+        if admin_company is not None:
+            response.admin_company = _to_company_ref(admin_company)
+    if "creator" in include_set:
+        creator = prefetch_data["users_by_id"].get(terminal.created_by_user_id)
+        if creator is not None:
+            response.creator = _to_user_ref(creator)
+    return response
 
 
 def _list_terminal_products(session: Session, terminal_id: int) -> list[TerminalProduct]:
@@ -182,7 +260,7 @@ def create_company_terminal(
     terminal_in: CompanyTerminalCreate,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
-) -> CompanyTerminal:
+) -> CompanyTerminalReadWithIncludes:
     """
     Crea una terminal para una empresa.
 
@@ -265,9 +343,19 @@ def create_company_terminal(
     )
 
     session.add(terminal)
+    session.flush()
+    if terminal.id is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Company terminal has no ID",
+        )
+    session.add(TerminalSampleCounter(terminal_id=terminal.id))
     session.commit()
     session.refresh(terminal)
-    return terminal
+    return CompanyTerminalReadWithIncludes(
+        **terminal.model_dump(),
+        next_sample_sequence=1,
+    )
 
 
 @router.get(
@@ -278,22 +366,35 @@ def create_company_terminal(
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def list_company_terminals(
-    session: Session = Depends(get_session),
-    current_user: User = Depends(require_role(UserType.visitor, UserType.user, UserType.admin, UserType.superadmin)),
+async def list_company_terminals(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(
+        require_role_async(UserType.visitor, UserType.user, UserType.admin, UserType.superadmin)
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
     include: str | None = Query(
         default=None,
         description=("Relaciones a incluir, separadas por coma: `block`, `owner_company`, `admin_company`, `creator`."),
     ),
     owner_company_id: int | None = Query(default=None, description="Filtrar por ID de empresa propietaria."),
+    block_id: int | None = Query(default=None, description="Filtrar por ID de bloque."),
+    is_active: bool | None = Query(default=None, description="Filtrar por estado activo/inactivo."),
+    cursor: str | None = Query(
+        default=None,
+        description="Cursor `next_cursor` de la página anterior.",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ) -> Any:
     """
-    Lista terminales visibles para el usuario actual.
+    Lista terminales visibles para el usuario actual, paginadas por `id`.
 
     Permisos: `visitor`, `user`, `admin`, `superadmin`.
     Parámetros:
     - `include`: relaciones `block`, `owner_company`, `admin_company`, `creator`.
-    - `owner_company_id`: filtra por empresa propietaria.
+    - `owner_company_id`, `block_id`, `is_active`: filtros.
+    - `cursor`, `limit`: paginación; `next_cursor` es nulo en la última página.
+    Respuestas:
+    - 400: cursor inválido.
 
     Nota: usuarios que no son `superadmin` solo ven las terminales
     que tienen asignadas.
@@ -301,68 +402,46 @@ def list_company_terminals(
     statement = select(CompanyTerminal)
     if owner_company_id is not None:
         statement = statement.where(CompanyTerminal.owner_company_id == owner_company_id)
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(UserTerminal.user_id == current_user.id)
-        ).all()
-        if allowed_terminal_ids:
-            statement = statement.where(
-                CompanyTerminal.id.in_(allowed_terminal_ids)  # type: ignore[union-attr]
-            )
-    terminals = session.exec(statement).all()
+    if block_id is not None:
+        statement = statement.where(CompanyTerminal.block_id == block_id)
+    if is_active is not None:
+        statement = statement.where(CompanyTerminal.is_active == is_active)
+    statement = terminal_scope.apply(statement, CompanyTerminal.id)
+    if cursor:
+        try:
+            after_id = decode_id_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(CompanyTerminal.id > after_id)  # type: ignore[operator]
+    statement = statement.order_by(CompanyTerminal.id).limit(limit + 1)  # type: ignore[arg-type]
+    terminals = list((await session.exec(statement)).all())
     if not terminals:
         return CompanyTerminalListResponse(message="No records found")
+    next_cursor = None
+    if len(terminals) > limit:
+        terminals = terminals[:limit]
+        next_cursor = encode_cursor(terminals[-1].id)
 
-    terminal_ids = [terminal.id for terminal in terminals if terminal.id is not None]
-    has_samples_by_terminal_id = _get_terminal_has_samples_map(session, terminal_ids)
     include_set = {item.strip() for item in (include or "").split(",") if item.strip()}
-    if not include_set:
-        return CompanyTerminalListResponse(
-            items=[
-                CompanyTerminalReadWithIncludes(
-                    **terminal.model_dump(),
-                    has_samples=has_samples_by_terminal_id.get(
-                        terminal.id or -1,
-                        False,
-                    ),
-                )
-                for terminal in terminals
-            ]
-        )
-
-    results: list[CompanyTerminalReadWithIncludes] = []
-    for terminal in terminals:
-        block: CompanyBlockRef | None = None
-        if "block" in include_set:
-            block_db = session.get(CompanyBlock, terminal.block_id)
-            if block_db is not None:
-                block = _to_block_ref(block_db)
-        owner_company_obj: CompanyRef | None = None
-        if "owner_company" in include_set:
-            owner_company_db = session.get(Company, terminal.owner_company_id)
-            if owner_company_db is not None:
-                owner_company_obj = _to_company_ref(owner_company_db)
-        admin_company_obj: CompanyRef | None = None
-        if "admin_company" in include_set:
-            admin_company_db = session.get(Company, terminal.admin_company_id)
-            if admin_company_db is not None:
-                admin_company_obj = _to_company_ref(admin_company_db)
-        creator: UserRef | None = None
-        if "creator" in include_set:
-            creator_db = session.get(User, terminal.created_by_user_id)
-            if creator_db is not None:
-                creator = _to_user_ref(creator_db)
-        results.append(
-            CompanyTerminalReadWithIncludes(
-                **terminal.model_dump(),
-                has_samples=has_samples_by_terminal_id.get(terminal.id or -1, False),
-                block=block,
-                owner_company=owner_company_obj,
-                admin_company=admin_company_obj,
-                creator=creator,
+    prefetch_data = await session.run_sync(
+        _load_terminal_prefetch_data,
+        terminals,
+        include_set,
+    )
+    return CompanyTerminalListResponse(
+        items=[
+            _build_terminal_read_with_includes(
+                terminal,
+                include_set=include_set,
+                prefetch_data=prefetch_data,
             )
-        )
-    return CompanyTerminalListResponse(items=results)
+            for terminal in terminals
+        ],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get(
@@ -378,6 +457,7 @@ def get_company_terminal(
     terminal_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.visitor, UserType.user, UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
     include: str | None = Query(
         default=None,
         description=("Relaciones a incluir, separadas por coma: `block`, `owner_company`, `admin_company`, `creator`."),
@@ -395,62 +475,22 @@ def get_company_terminal(
     - 403: permisos insuficientes.
     - 404: terminal no encontrada o no pertenece a la empresa indicada.
     """
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(UserTerminal.user_id == current_user.id)
-        ).all()
-        if allowed_terminal_ids and terminal_id not in allowed_terminal_ids:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Company terminal not found",
-            )
+    if not terminal_scope.has_access(terminal_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company terminal not found",
+        )
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal or terminal.owner_company_id != owner_company_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Company terminal not found",
         )
-    has_samples = False
-    if terminal.id is not None:
-        has_samples = _get_terminal_has_samples_map(session, [terminal.id]).get(
-            terminal.id,
-            False,
-        )
     include_set = {item.strip() for item in (include or "").split(",") if item.strip()}
-    if not include_set:
-        return CompanyTerminalReadWithIncludes(
-            **terminal.model_dump(),
-            has_samples=has_samples,
-        )
-
-    block: CompanyBlockRef | None = None
-    if "block" in include_set:
-        block_db = session.get(CompanyBlock, terminal.block_id)
-        if block_db is not None:
-            block = _to_block_ref(block_db)
-    owner_company_obj: CompanyRef | None = None
-    if "owner_company" in include_set:
-        owner_company_db = session.get(Company, terminal.owner_company_id)
-        if owner_company_db is not None:
-            owner_company_obj = _to_company_ref(owner_company_db)
-    admin_company_obj: CompanyRef | None = None
-    if "admin_company" in include_set:
-        admin_company_db = session.get(Company, terminal.admin_company_id)
-        if admin_company_db is not None:
-            admin_company_obj = _to_company_ref(admin_company_db)
-    creator: UserRef | None = None
-    if "creator" in include_set:
-        creator_db = session.get(User, terminal.created_by_user_id)
-        if creator_db is not None:
-            creator = _to_user_ref(creator_db)
-
-    return CompanyTerminalReadWithIncludes(
-        **terminal.model_dump(),
-        has_samples=has_samples,
-        block=block,
-        owner_company=owner_company_obj,
-        admin_company=admin_company_obj,
-        creator=creator,
+    return _build_terminal_read_with_includes(
+        terminal,
+        include_set=include_set,
+        prefetch_data=_load_terminal_prefetch_data(session, [terminal], include_set),
     )
 
 
@@ -559,14 +599,17 @@ def update_company_terminal(
     session.commit()
     session.refresh(terminal)
     has_samples = False
+    next_sample_sequence = 1
     if terminal.id is not None:
         has_samples = _get_terminal_has_samples_map(session, [terminal.id]).get(
             terminal.id,
             False,
         )
+        next_sample_sequence = get_next_sample_sequences(session, [terminal.id])[terminal.id]
     return CompanyTerminalReadWithIncludes(
         **terminal.model_dump(),
         has_samples=has_samples,
+        next_sample_sequence=next_sample_sequence,
     )
 
 
@@ -603,14 +646,17 @@ def delete_company_terminal(
         )
 
     has_samples = False
+    next_sample_sequence = 1
     if terminal.id is not None:
         has_samples = _get_terminal_has_samples_map(session, [terminal.id]).get(
             terminal.id,
             False,
         )
+        next_sample_sequence = get_next_sample_sequences(session, [terminal.id])[terminal.id]
     terminal_data = CompanyTerminalReadWithIncludes(
         **terminal.model_dump(),
         has_samples=has_samples,
+        next_sample_sequence=next_sample_sequence,
     )
     session.exec(
         delete(ExternalAnalysisRecord).where(
@@ -632,6 +678,11 @@ def delete_company_terminal(
             TerminalProduct.terminal_id == terminal_id  # type: ignore[arg-type]
         )
     )
+    session.exec(
+        delete(TerminalSampleCounter).where(
+            TerminalSampleCounter.terminal_id == terminal_id  # type: ignore[arg-type]
+        )
+    )
     session.delete(terminal)
     session.commit()
     return CompanyTerminalDeleteResponse(
@@ -646,11 +697,13 @@ def get_terminal_products(
     terminal_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.visitor, UserType.user, UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> list[TerminalProductPayload]:
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal no encontrado.")
-    _assert_terminal_access(session, current_user, terminal_id)
+    if not terminal_scope.has_access(terminal_id):
+        raise HTTPException(status_code=404, detail="Terminal no encontrado.")
     items = _list_terminal_products(session, terminal_id)
     return [TerminalProductPayload(name=item.name, product_type=item.product_type) for item in items]
 
@@ -661,11 +714,13 @@ def update_terminal_products(
     payload: TerminalProductsPayload,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> list[TerminalProductPayload]:
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal no encontrado.")
-    _assert_terminal_access(session, current_user, terminal_id)
+    if not terminal_scope.has_access(terminal_id):
+        raise HTTPException(status_code=404, detail="Terminal no encontrado.")
     items = _replace_terminal_products(session, terminal_id, payload.products)
     return [TerminalProductPayload(name=item.name, product_type=item.product_type) for item in items]
 
@@ -675,11 +730,13 @@ def get_terminal_product_types(
     terminal_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.visitor, UserType.user, UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> list[str]:
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal no encontrado.")
-    _assert_terminal_access(session, current_user, terminal_id)
+    if not terminal_scope.has_access(terminal_id):
+        raise HTTPException(status_code=404, detail="Terminal no encontrado.")
     items = _list_terminal_products(session, terminal_id)
     product_types: list[str] = []
     seen: set[str] = set()
@@ -698,11 +755,13 @@ def update_terminal_product_types(
     payload: TerminalProductTypesPayload,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> list[str]:
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal no encontrado.")
-    _assert_terminal_access(session, current_user, terminal_id)
+    if not terminal_scope.has_access(terminal_id):
+        raise HTTPException(status_code=404, detail="Terminal no encontrado.")
     products: list[TerminalProductPayload] = []
     seen: set[ProductType] = set()
     for pt in payload.product_types:
@@ -2,14 +2,22 @@ from datetime import UTC, datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
 from sqlmodel import Session, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.equipment_verifications import _parse_monthly_readings_from_notes
-from app.core.security.authorization import require_role
-from app.db.session import get_session
+from app.core.security.authorization import require_role, require_role_async
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope, get_terminal_scope_async
+from app.db.session import get_async_session, get_session
 from app.models.company import Company
 from app.models.company_terminal import CompanyTerminal
-from app.models.enums import EquipmentMeasureType, UserType
+from app.models.enums import (
+    ComplianceType,
+    EquipmentMeasureType,
+    EquipmentStatus,
+    UserType,
+)
 from app.models.equipment import (
     Equipment,
     EquipmentComponentSerial,
@@ -27,6 +35,11 @@ from app.models.equipment_calibration import (
     EquipmentCalibrationResult,
     EquipmentCalibrationResultRead,
 )
+from app.models.equipment_compliance import (
+    EquipmentCompliance,
+    EquipmentComplianceListResponse,
+    EquipmentComplianceRead,
+)
 from app.models.equipment_history import (
     EquipmentHistoryEntry,
     EquipmentHistoryListResponse,
@@ -63,12 +76,18 @@ from app.models.equipment_verification import (
 )
 from app.models.refs import CompanyRef, CompanyTerminalRef, EquipmentTypeRef, UserRef
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
 from app.utils.emp_weights import get_emp
+from app.utils.equipment_compliance import refresh_equipment_compliance
 from app.utils.equipment_status_history import record_equipment_status_change
 from app.utils.measurements.length import Length
 from app.utils.measurements.temperature import Temperature
 from app.utils.measurements.weight import Weight
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_id_cursor,
+    encode_cursor,
+)
 
 router = APIRouter(
     prefix="/equipment",
@@ -76,13 +95,10 @@ router = APIRouter(
 )
 
 
-def _get_allowed_terminal_ids(session: Session, user: User) -> set[int]:
-    if user.user_type == UserType.superadmin:
-        return set()
-    links = session.exec(
-        select(UserTerminal).where(UserTerminal.user_id == user.id)
-    ).all()
-    return {link.terminal_id for link in links}
+def _as_utc(dt_value: datetime) -> datetime:
+    if dt_value.tzinfo is None:
+        return dt_value.replace(tzinfo=UTC)
+    return dt_value.astimezone(UTC)
 
 
 def _normalize_temperature(value: float, unit: str) -> float:
@@ -307,15 +323,81 @@ def _require_id(value: int | None, label: str) -> int:
     return value
 
 
+_LIMITABLE_INCLUDES = {"inspections", "verifications", "calibrations"}
+
+
 def _parse_include_set(include: str | None) -> set[str]:
-    return {item.strip() for item in (include or "").split(",") if item.strip()}
+    return {
+        item.split(":", 1)[0].strip()
+        for item in (include or "").split(",")
+        if item.split(":", 1)[0].strip()
+    }
+
+
+def _parse_include_limits(include: str | None) -> dict[str, int]:
+    """
+    Extrae modificadores `relacion:latest` o `relacion:N` del parámetro include.
+    """
+    limits: dict[str, int] = {}
+    for item in (include or "").split(","):
+        name, _, modifier = item.partition(":")
+        name = name.strip()
+        modifier = modifier.strip()
+        if not modifier:
+            continue
+        if name not in _LIMITABLE_INCLUDES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Include '{name}' does not accept a limit",
+            )
+        if modifier == "latest":
+            limits[name] = 1
+        elif modifier.isdigit() and int(modifier) > 0:
+            limits[name] = int(modifier)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid include modifier '{modifier}' for '{name}'",
+            )
+    return limits
+
+
+def _latest_per_equipment_statement(
+    model: Any,
+    performed_column: Any,
+    equipment_ids: list[int],
+    limit: int | None,
+) -> Any:
+    statement = select(model).where(model.equipment_id.in_(equipment_ids))
+    if limit is None:
+        return statement
+    row_number = (
+        func.row_number()
+        .over(
+            partition_by=model.equipment_id,
+            order_by=(performed_column.desc(), model.id.desc()),
+        )
+        .label("row_number")
+    )
+    ranked = (
+        select(model.id, row_number)
+        .where(model.equipment_id.in_(equipment_ids))
+        .subquery()
+    )
+    return (
+        statement.join(ranked, model.id == ranked.c.id)
+        .where(ranked.c.row_number <= limit)
+        .order_by(performed_column.desc(), model.id.desc())
+    )
 
 
 def _load_equipment_prefetch_data(
     session: Session,
     equipment_items: list[Equipment],
     include_set: set[str],
+    include_limits: dict[str, int] | None = None,
 ) -> dict[str, Any]:
+    include_limits = include_limits or {}
     equipment_ids = [equipment.id for equipment in equipment_items if equipment.id is not None]
     measure_specs_by_equipment_id: dict[int, list[EquipmentMeasureSpecRead]] = {}
     component_serials_by_equipment_id: dict[int, list[EquipmentComponentSerialRead]] = {}
@@ -412,8 +494,11 @@ def _load_equipment_prefetch_data(
 
     if "inspections" in include_set:
         inspections = session.exec(
-            select(EquipmentInspection).where(
-                EquipmentInspection.equipment_id.in_(equipment_ids)  # type: ignore[attr-defined]
+            _latest_per_equipment_statement(
+                EquipmentInspection,
+                EquipmentInspection.inspected_at,
+                equipment_ids,
+                include_limits.get("inspections"),
             )
         ).all()
         inspection_ids = [inspection.id for inspection in inspections if inspection.id is not None]
@@ -448,8 +533,11 @@ def _load_equipment_prefetch_data(
 
     if "verifications" in include_set:
         verifications = session.exec(
-            select(EquipmentVerification).where(
-                EquipmentVerification.equipment_id.in_(equipment_ids)  # type: ignore[attr-defined]
+            _latest_per_equipment_statement(
+                EquipmentVerification,
+                EquipmentVerification.verified_at,
+                equipment_ids,
+                include_limits.get("verifications"),
             )
         ).all()
         verification_ids = [
@@ -494,8 +582,11 @@ def _load_equipment_prefetch_data(
 
     if "calibrations" in include_set:
         calibrations = session.exec(
-            select(EquipmentCalibration).where(
-                EquipmentCalibration.equipment_id.in_(equipment_ids)  # type: ignore[attr-defined]
+            _latest_per_equipment_statement(
+                EquipmentCalibration,
+                EquipmentCalibration.calibrated_at,
+                equipment_ids,
+                include_limits.get("calibrations"),
             )
         ).all()
         calibration_ids = [
@@ -830,6 +921,7 @@ def create_equipment(
                 resolution=resolution,
             )
         )
+    refresh_equipment_compliance(session, equipment)
     session.commit()
 
     response = EquipmentReadWithIncludes.model_validate(
@@ -853,16 +945,18 @@ def create_equipment(
     response_model=EquipmentListResponse,
     status_code=status.HTTP_200_OK,
     responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Cursor inválido"},
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def list_equipment(
-    session: Session = Depends(get_session),
+async def list_equipment(
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(
-        require_role(
+        require_role_async(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
     include: str | None = Query(
         default=None,
         description=(
@@ -870,32 +964,85 @@ def list_equipment(
             "`owner_company`, `terminal`."
         ),
     ),
+    equipment_status: EquipmentStatus | None = Query(
+        default=None,
+        alias="status",
+        description="Filtra por estado del equipo.",
+    ),
+    equipment_type_id: int | None = Query(default=None),
+    terminal_id: int | None = Query(default=None),
+    is_active: bool | None = Query(default=None),
+    serial_prefix: str | None = Query(default=None, min_length=1),
+    internal_code_prefix: str | None = Query(default=None, min_length=1),
+    cursor: str | None = Query(
+        default=None,
+        description="Cursor `next_cursor` de la página anterior.",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ) -> Any:
     """
-    Lista equipos visibles para el usuario actual.
+    Lista equipos visibles para el usuario actual, paginados por `id`.
 
     Permisos: `visitor`, `user`, `admin`, `superadmin`.
     Parámetros:
     - `include`: relaciones opcionales (`equipment_type`, `owner_company`,
       `terminal`, `creator`, `inspections`, `verifications`, `calibrations`).
+      `inspections`, `verifications` y `calibrations` aceptan `:latest` o `:N`
+      para traer solo los N registros más recientes por equipo.
+    - `status`, `equipment_type_id`, `terminal_id`, `is_active`: filtros.
+    - `serial_prefix`, `internal_code_prefix`: filtran por prefijo.
+    - `cursor`, `limit`: paginación; `next_cursor` es nulo en la última página.
+    Respuestas:
+    - 400: cursor o modificador de include inválido.
 
     Nota: usuarios que no son `superadmin` solo ven equipos de las
     terminales que tienen asignadas.
     """
+    include_set = _parse_include_set(include)
+    include_limits = _parse_include_limits(include)
     statement = select(Equipment)
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids:
+    statement = terminal_scope.apply(statement, Equipment.terminal_id)
+    if equipment_status is not None:
+        statement = statement.where(Equipment.status == equipment_status)
+    if equipment_type_id is not None:
+        statement = statement.where(Equipment.equipment_type_id == equipment_type_id)
+    if terminal_id is not None:
+        statement = statement.where(Equipment.terminal_id == terminal_id)
+    if is_active is not None:
+        statement = statement.where(Equipment.is_active == is_active)
+    if serial_prefix:
+        statement = statement.where(
+            Equipment.serial.startswith(serial_prefix, autoescape=True)  # type: ignore[attr-defined]
+        )
+    if internal_code_prefix:
         statement = statement.where(
-            Equipment.terminal_id.in_(allowed_terminal_ids)  # type: ignore[attr-defined]
+            Equipment.internal_code.startswith(  # type: ignore[union-attr]
+                internal_code_prefix,
+                autoescape=True,
+            )
         )
-    equipment_items = session.exec(statement).all()
+    if cursor:
+        try:
+            after_id = decode_id_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(Equipment.id > after_id)  # type: ignore[operator]
+    statement = statement.order_by(Equipment.id).limit(limit + 1)  # type: ignore[arg-type]
+    equipment_items = list((await session.exec(statement)).all())
     if not equipment_items:
         return EquipmentListResponse(message="No records found")
-    include_set = _parse_include_set(include)
-    prefetch_data = _load_equipment_prefetch_data(
-        session,
+    next_cursor = None
+    if len(equipment_items) > limit:
+        equipment_items = equipment_items[:limit]
+        next_cursor = encode_cursor(equipment_items[-1].id)
+    prefetch_data = await session.run_sync(
+        _load_equipment_prefetch_data,
         equipment_items,
         include_set,
+        include_limits,
     )
     items = [
         _build_equipment_read_with_includes(
@@ -906,7 +1053,77 @@ def list_equipment(
         for equipment in equipment_items
         if equipment.id is not None
     ]
-    return EquipmentListResponse(items=items)
+    return EquipmentListResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/compliance",
+    response_model=EquipmentComplianceListResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+    },
+)
+def list_equipment_compliance(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(
+        require_role(
+            UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
+        )
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
+    terminal_id: int | None = Query(default=None),
+    due_before: datetime | None = Query(
+        default=None,
+        description="Solo registros que vencen antes de esta fecha (UTC).",
+    ),
+    compliance_type: ComplianceType | None = Query(default=None),
+) -> EquipmentComplianceListResponse:
+    """
+    Lista vencimientos de calibración, inspección y verificaciones por equipo.
+
+    Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `terminal_id`: filtra por terminal.
+    - `due_before`: solo vencimientos anteriores a la fecha indicada.
+    - `compliance_type`: `calibration`, `inspection` o `verification`.
+
+    Nota: solo incluye equipos activos. Un registro nunca realizado vence
+    desde la fecha de creación del equipo.
+    """
+    statement = (
+        select(EquipmentCompliance)
+        .join(Equipment, Equipment.id == EquipmentCompliance.equipment_id)  # type: ignore[arg-type]
+        .where(Equipment.is_active == True)  # noqa: E712
+    )
+    statement = terminal_scope.apply(statement, EquipmentCompliance.terminal_id)
+    if terminal_id is not None:
+        statement = statement.where(EquipmentCompliance.terminal_id == terminal_id)
+    if compliance_type is not None:
+        statement = statement.where(EquipmentCompliance.compliance_type == compliance_type)
+    if due_before is not None:
+        statement = statement.where(
+            EquipmentCompliance.next_due_at < _as_utc(due_before)  # type: ignore[operator]
+        )
+    statement = statement.order_by(
+        EquipmentCompliance.next_due_at,  # type: ignore[arg-type]
+        EquipmentCompliance.id,  # type: ignore[arg-type]
+    )
+    rows = session.exec(statement).all()
+    if not rows:
+        return EquipmentComplianceListResponse(message="No records found")
+    now = datetime.now(UTC)
+    items = []
+    for row in rows:
+        next_due_at = _as_utc(row.next_due_at) if row.next_due_at else None
+        items.append(
+            EquipmentComplianceRead(
+                **row.model_dump(exclude={"next_due_at"}),
+                next_due_at=next_due_at,
+                is_overdue=next_due_at is not None and next_due_at < now,
+            )
+        )
+    return EquipmentComplianceListResponse(items=items)
 
 
 @router.get(
@@ -926,6 +1143,7 @@ def get_equipment(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
     include: str | None = Query(
         default=None,
         description=(
@@ -941,7 +1159,9 @@ def get_equipment(
     Parámetros:
     - `include`: relaciones opcionales (`equipment_type`, `owner_company`,
       `terminal`, `creator`, `inspections`, `verifications`, `calibrations`).
+      Las tres últimas aceptan `:latest` o `:N`.
     Respuestas:
+    - 400: modificador de include inválido.
     - 403: sin acceso a la terminal del equipo.
     - 404: equipo no encontrado.
     """
@@ -951,17 +1171,13 @@ def get_equipment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids and equipment.terminal_id not in allowed_terminal_ids:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
-        )
+    terminal_scope.check(equipment.terminal_id)
     include_set = _parse_include_set(include)
     prefetch_data = _load_equipment_prefetch_data(
         session,
         [equipment],
         include_set,
+        _parse_include_limits(include),
     )
     return _build_equipment_read_with_includes(
         equipment,
@@ -986,6 +1202,7 @@ def update_equipment(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentReadWithIncludes:
     """
     Actualiza un equipo y sus relaciones dependientes.
@@ -1011,12 +1228,7 @@ def update_equipment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids and equipment.terminal_id not in allowed_terminal_ids:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
-        )
+    terminal_scope.check(equipment.terminal_id)
     if equipment.id is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1104,11 +1316,7 @@ def update_equipment(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Terminal not found",
             )
-        if allowed_terminal_ids and terminal_id not in allowed_terminal_ids:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this terminal",
-            )
+        terminal_scope.check(terminal_id)
         if terminal_id is not None and terminal_id != equipment.terminal_id:
             current_terminal_history = session.exec(
                 select(EquipmentTerminalHistory).where(
@@ -1141,6 +1349,7 @@ def update_equipment(
         setattr(equipment, field, value)
 
     session.add(equipment)
+    refresh_equipment_compliance(session, equipment)
     session.commit()
     session.refresh(equipment)
 
@@ -1303,6 +1512,7 @@ def delete_equipment(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentDeleteResponse:
     """
     Elimina un equipo o lo desactiva si tiene operaciones asociadas.
@@ -1322,12 +1532,7 @@ def delete_equipment(
             detail="Equipment not found",
         )
 
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids and equipment.terminal_id not in allowed_terminal_ids:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
-        )
+    terminal_scope.check(equipment.terminal_id)
     if equipment.id is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1407,6 +1612,11 @@ def delete_equipment(
             EquipmentTerminalHistory.equipment_id == equip_id  # type: ignore[arg-type]
         )
     )
+    session.exec(
+        delete(EquipmentCompliance).where(
+            EquipmentCompliance.equipment_id == equip_id  # type: ignore[arg-type]
+        )
+    )
     session.delete(equipment)
     session.commit()
     return EquipmentDeleteResponse(
@@ -1433,6 +1643,7 @@ def list_equipment_type_history(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> Any:
     """
     Lista el historial de cambios de tipo del equipo.
@@ -1448,8 +1659,7 @@ def list_equipment_type_history(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids and equipment.terminal_id not in allowed_terminal_ids:
+    if not terminal_scope.has_access(equipment.terminal_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
@@ -1484,6 +1694,7 @@ def list_equipment_terminal_history(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> Any:
     """
     Lista el historial de cambios de terminal del equipo.
@@ -1499,8 +1710,7 @@ def list_equipment_terminal_history(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids and equipment.terminal_id not in allowed_terminal_ids:
+    if not terminal_scope.has_access(equipment.terminal_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
@@ -1535,6 +1745,7 @@ def list_equipment_history(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> Any:
     """
     Lista el historial combinado de cambios de tipo, terminal y estado.
@@ -1550,8 +1761,7 @@ def list_equipment_history(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    allowed_terminal_ids = _get_allowed_terminal_ids(session, current_user)
-    if allowed_terminal_ids and equipment.terminal_id not in allowed_terminal_ids:
+    if not terminal_scope.has_access(equipment.terminal_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
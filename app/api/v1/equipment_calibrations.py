@@ -3,11 +3,13 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlmodel import Session, delete, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security.authorization import require_role
-from app.db.session import get_session
+from app.core.security.authorization import require_role, require_role_async
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope, get_terminal_scope_async
+from app.db.session import get_async_session, get_session
 from app.models.company import Company
-from app.models.enums import EquipmentMeasureType, UserType
+from app.models.enums import EquipmentMeasureType, UploadJobKind, UserType
 from app.models.equipment import Equipment
 from app.models.equipment_calibration import (
     EquipmentCalibration,
@@ -22,10 +24,12 @@ from app.models.equipment_calibration import (
 from app.models.equipment_type import EquipmentType
 from app.models.equipment_type_max_error import EquipmentTypeMaxError
 from app.models.equipment_type_measure import EquipmentTypeMeasure
+from app.models.upload_job import UploadJobRead
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
-from app.services.supabase_storage import upload_calibration_certificate
+from app.services.storage import calibration_certificate_path
+from app.services.upload_queue import enqueue_pdf_upload
 from app.utils.emp_weights import get_emp
+from app.utils.equipment_compliance import refresh_equipment_compliance
 from app.utils.measurements.length import Length
 from app.utils.measurements.weight import Weight
 
@@ -69,23 +73,6 @@ def _validate_company(
     return calibration_company_id
 
 
-def _check_terminal_access(
-    session: Session,
-    user: User,
-    equipment: Equipment,
-) -> None:
-    if user.user_type == UserType.superadmin:
-        return
-    allowed_terminal_ids = session.exec(
-        select(UserTerminal.terminal_id).where(UserTerminal.user_id == user.id)
-    ).all()
-    if allowed_terminal_ids and equipment.terminal_id not in set(allowed_terminal_ids):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
-        )
-
-
 def _infer_measure_from_unit(unit: str | None) -> EquipmentMeasureType | None:
     if not unit:
         return None
@@ -402,6 +389,7 @@ def create_equipment_calibration(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentCalibrationRead:
     """
     Crea una calibración para un equipo.
@@ -423,7 +411,7 @@ def create_equipment_calibration(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
 
     calibration_company_id = _validate_company(
         session,
@@ -467,6 +455,7 @@ def create_equipment_calibration(
     calibration_id = _require_id(calibration.id, "Calibration")
 
     _replace_results(session, calibration_id, payload.results)
+    refresh_equipment_compliance(session, equipment)
     session.commit()
     session.refresh(calibration)
     return _read_with_results(session, calibration)
@@ -489,6 +478,7 @@ def list_equipment_calibrations(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> Any:
     """
     Lista calibraciones de un equipo.
@@ -504,7 +494,7 @@ def list_equipment_calibrations(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
 
     calibrations = session.exec(
         select(EquipmentCalibration).where(
@@ -553,6 +543,7 @@ def get_equipment_calibration(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentCalibrationRead:
     """
     Obtiene una calibración por ID.
@@ -574,7 +565,7 @@ def get_equipment_calibration(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
     return _read_with_results(session, calibration)
 
 
@@ -594,6 +585,7 @@ def update_equipment_calibration(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentCalibrationRead:
     """
     Actualiza una calibración por ID.
@@ -615,7 +607,7 @@ def update_equipment_calibration(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
 
     if payload.calibrated_at is not None:
         calibration.calibrated_at = _as_utc(payload.calibrated_at)
@@ -644,6 +636,8 @@ def update_equipment_calibration(
         _validate_uncertainty_max_error(session, equipment, payload.results)
         calibration_id = _require_id(calibration.id, "Calibration")
         _replace_results(session, calibration_id, payload.results)
+    if payload.calibrated_at is not None:
+        refresh_equipment_compliance(session, equipment)
     session.commit()
     session.refresh(calibration)
     return _read_with_results(session, calibration)
@@ -651,59 +645,71 @@ def update_equipment_calibration(
 
 @router.post(
     "/{calibration_id}/certificate",
-    response_model=EquipmentCalibrationRead,
-    status_code=status.HTTP_200_OK,
+    response_model=UploadJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Recurso no encontrado"},
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def upload_equipment_calibration_certificate(
+async def upload_equipment_calibration_certificate(
     calibration_id: int,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(
-        require_role(UserType.user, UserType.admin, UserType.superadmin)
+        require_role_async(UserType.user, UserType.admin, UserType.superadmin)
     ),
-) -> EquipmentCalibrationRead:
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
+) -> UploadJobRead:
     """
-    Sube el certificado PDF de una calibración.
+    Encola el certificado PDF de una calibración.
+
+    El archivo queda en el spool y un worker lo sube al almacenamiento; el
+    estado y la URL final se consultan en `GET /upload-jobs/{job_id}`.
 
     Permisos: `user`, `admin`, `superadmin`.
     Respuestas:
+    - 400: el archivo no es un PDF.
     - 403: permisos insuficientes.
     - 404: recurso no encontrado.
+    - 413: el PDF supera el tamaño máximo.
     """
-    calibration = session.get(EquipmentCalibration, calibration_id)
+    calibration = await session.get(EquipmentCalibration, calibration_id)
     if not calibration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Calibration not found",
         )
-    equipment = session.get(Equipment, calibration.equipment_id)
+    equipment = await session.get(Equipment, calibration.equipment_id)
     if not equipment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
 
     equipment_type_name = None
     if equipment.equipment_type_id:
-        equipment_type = session.get(EquipmentType, equipment.equipment_type_id)
+        equipment_type = await session.get(EquipmentType, equipment.equipment_type_id)
         equipment_type_name = equipment_type.name if equipment_type else None
-    certificate_url = upload_calibration_certificate(
+    # Cierra la transacción de lectura mientras se escribe el spool.
+    await session.commit()
+
+    job = await enqueue_pdf_upload(
+        session,
         file,
-        calibration_id,
-        equipment_serial=equipment.serial,
-        equipment_type_name=equipment_type_name,
-        calibrated_at=calibration.calibrated_at,
+        kind=UploadJobKind.calibration_certificate,
+        target_id=calibration_id,
+        terminal_id=equipment.terminal_id,
+        storage_path=calibration_certificate_path(
+            calibration_id,
+            equipment_serial=equipment.serial,
+            equipment_type_name=equipment_type_name,
+            calibrated_at=calibration.calibrated_at,
+        ),
+        user_id=_require_id(current_user.id, "User"),
     )
-    calibration.certificate_pdf_url = certificate_url
-    session.add(calibration)
-    session.commit()
-    session.refresh(calibration)
-    return _read_with_results(session, calibration)
+    return UploadJobRead.model_validate(job)
 
 
 @router.delete(
@@ -720,6 +726,7 @@ def delete_equipment_calibration(
     current_user: User = Depends(
         require_role(UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> None:
     """
     Elimina una calibración por ID (incluyendo sus resultados).
@@ -741,11 +748,12 @@ def delete_equipment_calibration(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
     session.exec(
         delete(EquipmentCalibrationResult).where(
             EquipmentCalibrationResult.calibration_id == calibration_id  # type: ignore[arg-type]
         )
     )
     session.delete(calibration)
+    refresh_equipment_compliance(session, equipment)
     session.commit()
@@ -2,10 +2,11 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
 from sqlmodel import Session, delete, select
 
 from app.core.security.authorization import require_role
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope
 from app.db.session import get_session
 from app.models.enums import EquipmentStatus, InspectionResponseType, UserType
 from app.models.equipment import Equipment
@@ -25,8 +26,9 @@ from app.models.equipment_type_inspection_item import (
     EquipmentTypeInspectionItem,
 )
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
+from app.utils.equipment_compliance import refresh_equipment_compliance
 from app.utils.equipment_status_history import record_equipment_status_change
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
 
 router = APIRouter(
     prefix="/equipment-inspections",
@@ -205,6 +207,7 @@ def create_equipment_inspection(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentInspectionRead:
     """
     Crea una inspección para un equipo.
@@ -230,19 +233,7 @@ def create_equipment_inspection(
             detail="Equipment not found",
         )
 
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(
-                UserTerminal.user_id == current_user.id
-            )
-        ).all()
-        if allowed_terminal_ids and equipment.terminal_id not in set(
-            allowed_terminal_ids
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this terminal",
-            )
+    terminal_scope.check(equipment.terminal_id)
 
     _require_valid_calibration(session, equipment)
 
@@ -325,6 +316,7 @@ def create_equipment_inspection(
                 is_ok=is_ok,
             )
         )
+    refresh_equipment_compliance(session, equipment)
     session.commit()
 
     responses = session.exec(
@@ -384,12 +376,23 @@ def list_equipment_inspections(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    inspected_from: datetime | None = Query(default=None),
+    inspected_to: datetime | None = Query(default=None),
+    before: str | None = Query(
+        default=None,
+        description="Cursor `next_cursor` de la página anterior.",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ) -> Any:
     """
-    Lista inspecciones de un equipo.
+    Lista inspecciones de un equipo, las más recientes primero.
 
     Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `inspected_from`, `inspected_to`: rango (inclusivo) sobre `inspected_at`.
+    - `before`, `limit`: paginación; `next_cursor` es nulo en la última página.
     Respuestas:
+    - 400: cursor inválido.
     - 403: permisos insuficientes.
     - 404: equipo no encontrado.
     """
@@ -400,33 +403,55 @@ def list_equipment_inspections(
             detail="Equipment not found",
         )
 
-    inspections = session.exec(
-        select(EquipmentInspection).where(
-            EquipmentInspection.equipment_id == equipment_id
-        )
-    ).all()
+    statement = select(EquipmentInspection).where(
+        EquipmentInspection.equipment_id == equipment_id
+    )
+    if inspected_from is not None:
+        statement = statement.where(EquipmentInspection.inspected_at >= _as_utc(inspected_from))
+    if inspected_to is not None:
+        statement = statement.where(EquipmentInspection.inspected_at <= _as_utc(inspected_to))
+    if before:
+        try:
+            before_inspected_at, before_id = decode_cursor(before, 2)
+            before_key = tuple_(datetime.fromisoformat(before_inspected_at), int(before_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(
+            tuple_(EquipmentInspection.inspected_at, EquipmentInspection.id) < before_key
+        )
+    statement = statement.order_by(
+        desc(EquipmentInspection.inspected_at), desc(EquipmentInspection.id)
+    ).limit(limit + 1)
+    inspections = list(session.exec(statement).all())
     if not inspections:
         return EquipmentInspectionListResponse(message="No records found")
-
-    items: list[EquipmentInspectionRead] = []
-    for inspection in inspections:
-        responses = session.exec(
-            select(EquipmentInspectionResponse).where(
-                EquipmentInspectionResponse.inspection_id == inspection.id
-            )
-        ).all()
-        items.append(
-            EquipmentInspectionRead(
-                **inspection.model_dump(),
-                responses=[
-                    EquipmentInspectionResponseRead.model_validate(
-                        r, from_attributes=True
-                    )
-                    for r in responses
-                ],
-            )
-        )
-    return EquipmentInspectionListResponse(items=items)
+    next_cursor = None
+    if len(inspections) > limit:
+        inspections = inspections[:limit]
+        last = inspections[-1]
+        next_cursor = encode_cursor(_as_utc(last.inspected_at).isoformat(), last.id)
+
+    inspection_ids = [i.id for i in inspections if i.id is not None]
+    responses_by_inspection: dict[int, list[EquipmentInspectionResponseRead]] = {}
+    for response in session.exec(
+        select(EquipmentInspectionResponse)
+        .where(EquipmentInspectionResponse.inspection_id.in_(inspection_ids))  # type: ignore[attr-defined]
+        .order_by(EquipmentInspectionResponse.id)  # type: ignore[arg-type]
+    ).all():
+        responses_by_inspection.setdefault(response.inspection_id, []).append(
+            EquipmentInspectionResponseRead.model_validate(response, from_attributes=True)
+        )
+    items = [
+        EquipmentInspectionRead(
+            **inspection.model_dump(),
+            responses=responses_by_inspection.get(inspection.id or -1, []),
+        )
+        for inspection in inspections
+    ]
+    return EquipmentInspectionListResponse(items=items, next_cursor=next_cursor)
 
 
 @router.get(
@@ -489,6 +514,7 @@ def update_equipment_inspection(
     payload: EquipmentInspectionUpdate,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentInspectionRead:
     """
     Actualiza una inspección existente por ID.
@@ -519,19 +545,7 @@ def update_equipment_inspection(
         )
     equipment_db_id = _require_id(equipment.id, "Equipment")
 
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(
-                UserTerminal.user_id == current_user.id
-            )
-        ).all()
-        if allowed_terminal_ids and equipment.terminal_id not in set(
-            allowed_terminal_ids
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this terminal",
-            )
+    terminal_scope.check(equipment.terminal_id)
 
     items = session.exec(
         select(EquipmentTypeInspectionItem).where(
@@ -600,6 +614,7 @@ def update_equipment_inspection(
                 is_ok=is_ok,
             )
         )
+    refresh_equipment_compliance(session, equipment)
     session.commit()
     session.refresh(inspection)
 
@@ -654,6 +669,7 @@ def delete_equipment_inspection(
     inspection_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> None:
     inspection = session.get(EquipmentInspection, inspection_id)
     if not inspection:
@@ -667,21 +683,16 @@ def delete_equipment_inspection(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(
-                UserTerminal.user_id == current_user.id
-            )
-        ).all()
-        if allowed_terminal_ids and equipment.terminal_id not in set(allowed_terminal_ids):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este equipo",
-            )
+    if not terminal_scope.has_access(equipment.terminal_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este equipo",
+        )
     session.exec(
         delete(EquipmentInspectionResponse).where(
             EquipmentInspectionResponse.inspection_id == inspection_id  # type: ignore[arg-type]
         )
     )
     session.delete(inspection)
+    refresh_equipment_compliance(session, equipment)
     session.commit()
@@ -7,6 +7,7 @@ from sqlalchemy import desc
 from sqlmodel import Session, select
 
 from app.core.security.authorization import require_role
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope
 from app.db.session import get_session
 from app.models.enums import EquipmentMeasureType, EquipmentStatus, UserType
 from app.models.equipment import Equipment
@@ -20,7 +21,6 @@ from app.models.equipment_reading import (
 )
 from app.models.equipment_type import EquipmentType
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
 from app.utils.measurements.temperature import Temperature
 
 router = APIRouter(
@@ -29,23 +29,6 @@ router = APIRouter(
 )
 
 
-def _check_terminal_access(
-    session: Session,
-    user: User,
-    equipment: Equipment,
-) -> None:
-    if user.user_type == UserType.superadmin:
-        return
-    allowed_ids = session.exec(
-        select(UserTerminal.terminal_id).where(UserTerminal.user_id == user.id)
-    ).all()
-    if allowed_ids and equipment.terminal_id not in set(allowed_ids):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
-        )
-
-
 def _require_id(value: int | None, label: str) -> int:
     if value is None:
         raise HTTPException(
@@ -163,6 +146,7 @@ def create_equipment_reading(
     payload: EquipmentReadingCreate,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentReadingRead:
     """
     Registra una lectura de equipo (temperatura) para un equipo.
@@ -185,7 +169,7 @@ def create_equipment_reading(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    _check_terminal_access(session, current_user, equipment)
+    terminal_scope.check(equipment.terminal_id)
     if equipment.status == EquipmentStatus.needs_review:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,6 +35,7 @@ from app.models.equipment_type_verification import (
 from app.models.equipment_type_verification_item import EquipmentTypeVerificationItem
 from app.models.refs import UserRef
 from app.models.user import User
+from app.utils.equipment_compliance import refresh_equipment_type_compliance
 from app.utils.measurements.length import Length
 from app.utils.measurements.temperature import Temperature
 from app.utils.measurements.weight import Weight
@@ -825,6 +826,11 @@ def update_equipment_type(
         setattr(equipment_type, field, value)
 
     session.add(equipment_type)
+    if {"calibration_days", "inspection_days"} & update_data.keys():
+        refresh_equipment_type_compliance(
+            session,
+            _require_id(equipment_type.id, "EquipmentType"),
+        )
     session.commit()
     session.refresh(equipment_type)
 
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
+from sqlmodel import Session, delete, select
 
 from app.core.security.authorization import require_role
 from app.db.session import get_session
 from app.models.enums import UserType
+from app.models.equipment_compliance import EquipmentCompliance
 from app.models.equipment_type import EquipmentType
 from app.models.equipment_type_verification import (
     EquipmentTypeVerification,
@@ -14,6 +15,7 @@ from app.models.equipment_type_verification import (
 )
 from app.models.equipment_verification import EquipmentVerification
 from app.models.user import User
+from app.utils.equipment_compliance import refresh_equipment_type_compliance
 
 router = APIRouter(
     prefix="/equipment-type-verifications",
@@ -55,6 +57,8 @@ def create_verification_type(
         **payload.model_dump(),
     )
     session.add(verification_type)
+    session.flush()
+    refresh_equipment_type_compliance(session, equipment_type_id)
     session.commit()
     session.refresh(verification_type)
     return EquipmentTypeVerificationRead(**verification_type.model_dump())
@@ -144,6 +148,8 @@ def update_verification_type(
     for field, value in update_data.items():
         setattr(verification_type, field, value)
     session.add(verification_type)
+    session.flush()
+    refresh_equipment_type_compliance(session, equipment_type_id)
     session.commit()
     session.refresh(verification_type)
     return EquipmentTypeVerificationRead(**verification_type.model_dump())
@@ -222,6 +228,13 @@ def delete_verification_type(
     verification_type_data = EquipmentTypeVerificationRead(
         **verification_type.model_dump()
     )
+    session.exec(
+        delete(EquipmentCompliance).where(
+            EquipmentCompliance.verification_type_id == verification_type_id  # type: ignore[arg-type]
+        )
+    )
     session.delete(verification_type)
+    session.flush()
+    refresh_equipment_type_compliance(session, equipment_type_id)
     session.commit()
     return verification_type_data
@@ -36,6 +36,7 @@ from app.api.v1.equipment_verifications_shared import (
     _weight_to_grams,
 )
 from app.core.security.authorization import require_role
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope
 from app.db.session import get_session
 from app.models.enums import EquipmentMeasureType, EquipmentRole, EquipmentStatus, UserType
 from app.models.equipment import Equipment
@@ -52,8 +53,8 @@ from app.models.equipment_verification import (
     EquipmentVerificationUpdate,
 )
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
 from app.utils.emp_weights import get_emp
+from app.utils.equipment_compliance import refresh_equipment_compliance
 from app.utils.hydrometer import api_60f_crude
 
 router = APIRouter()
@@ -81,6 +82,7 @@ def create_equipment_verification(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentVerificationRead:
     """
     Crea una verificaciÃ³n para un equipo.
@@ -136,19 +138,7 @@ def create_equipment_verification(
                 detail="Invalid verification_type_id for this equipment type",
             )
 
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(
-                UserTerminal.user_id == current_user.id
-            )
-        ).all()
-        if allowed_terminal_ids and equipment.terminal_id not in set(
-            allowed_terminal_ids
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this terminal",
-            )
+    terminal_scope.check(equipment.terminal_id)
 
     _require_valid_calibration(session, equipment)
 
@@ -907,6 +897,7 @@ def create_equipment_verification(
         verification_ok=verification_ok,
         comparison_message=comparison_message,
     )
+    refresh_equipment_compliance(session, equipment)
     session.commit()
     session.refresh(verification)
     return _build_verification_read(
@@ -932,6 +923,7 @@ def update_equipment_verification(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> EquipmentVerificationRead:
     """
     Actualiza una verificaciÃ³n existente por ID.
@@ -976,19 +968,7 @@ def update_equipment_verification(
             detail="Invalid verification_type_id for this equipment type",
         )
 
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(
-                UserTerminal.user_id == current_user.id
-            )
-        ).all()
-        if allowed_terminal_ids and equipment.terminal_id not in set(
-            allowed_terminal_ids
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this terminal",
-            )
+    terminal_scope.check(equipment.terminal_id)
 
     _require_valid_calibration(session, equipment)
 
@@ -1734,6 +1714,7 @@ def update_equipment_verification(
         verification_ok=verification_ok,
         comparison_message=comparison_message,
     )
+    refresh_equipment_compliance(session, equipment)
     session.commit()
     session.refresh(verification)
     return _build_verification_read(
@@ -1755,6 +1736,7 @@ def delete_equipment_verification(
     verification_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> None:
     """
     Elimina una verificación por ID (incluyendo sus respuestas).
@@ -1776,12 +1758,7 @@ def delete_equipment_verification(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Equipment not found",
         )
-    terminal_ids = {
-        row.terminal_id
-        for row in session.exec(
-            select(UserTerminal).where(UserTerminal.user_id == current_user.id)
-        ).all()
-    }
+    terminal_ids = terminal_scope.terminal_ids
     if (
         current_user.user_type not in {UserType.superadmin, UserType.admin}
         or (
@@ -1800,5 +1777,6 @@ def delete_equipment_verification(
         )
     )
     session.delete(verification)
+    refresh_equipment_compliance(session, equipment)
     session.commit()
 
@@ -1,7 +1,11 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, status
+﻿from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import desc, tuple_
 from sqlmodel import Session, select
 
 from app.core.security.authorization import require_role
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope
 from app.db.session import get_session
 from app.models.enums import UserType
 from app.models.equipment import Equipment
@@ -13,9 +17,17 @@ from app.models.equipment_verification import (
     EquipmentVerificationResponseRead,
 )
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
 
 router = APIRouter()
+
+
+def _as_utc(dt_value: datetime) -> datetime:
+    if dt_value.tzinfo is None:
+        return dt_value.replace(tzinfo=UTC)
+    return dt_value.astimezone(UTC)
+
+
 @router.get(
     "/equipment/{equipment_id}",
     response_model=EquipmentVerificationListResponse,
@@ -31,12 +43,24 @@ def list_equipment_verifications(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
+    verified_from: datetime | None = Query(default=None),
+    verified_to: datetime | None = Query(default=None),
+    before: str | None = Query(
+        default=None,
+        description="Cursor `next_cursor` de la página anterior.",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ) -> EquipmentVerificationListResponse:
     """
-    Lista verificaciones de un equipo.
+    Lista verificaciones de un equipo, las más recientes primero.
 
     Permisos: `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `verified_from`, `verified_to`: rango (inclusivo) sobre `verified_at`.
+    - `before`, `limit`: paginación; `next_cursor` es nulo en la última página.
     Respuestas:
+    - 400: cursor inválido.
     - 403: permisos insuficientes.
     - 404: equipo no encontrado.
     """
@@ -53,46 +77,57 @@ def list_equipment_verifications(
             detail="Equipment not found",
         )
 
-    if current_user.user_type != UserType.superadmin:
-        allowed_terminal_ids = session.exec(
-            select(UserTerminal.terminal_id).where(
-                UserTerminal.user_id == current_user.id
-            )
-        ).all()
-        if allowed_terminal_ids and equipment.terminal_id not in set(
-            allowed_terminal_ids
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this terminal",
-            )
+    terminal_scope.check(equipment.terminal_id)
 
-    verifications = session.exec(
-        select(EquipmentVerification).where(
-            EquipmentVerification.equipment_id == equipment.id
+    statement = select(EquipmentVerification).where(
+        EquipmentVerification.equipment_id == equipment.id
+    )
+    if verified_from is not None:
+        statement = statement.where(EquipmentVerification.verified_at >= _as_utc(verified_from))
+    if verified_to is not None:
+        statement = statement.where(EquipmentVerification.verified_at <= _as_utc(verified_to))
+    if before:
+        try:
+            before_verified_at, before_id = decode_cursor(before, 2)
+            before_key = tuple_(datetime.fromisoformat(before_verified_at), int(before_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(
+            tuple_(EquipmentVerification.verified_at, EquipmentVerification.id) < before_key
         )
-    ).all()
+    statement = statement.order_by(
+        desc(EquipmentVerification.verified_at), desc(EquipmentVerification.id)
+    ).limit(limit + 1)
+    verifications = list(session.exec(statement).all())
     if not verifications:
         return EquipmentVerificationListResponse(message="No records found")
-    items = []
-    for verification in verifications:
-        responses = session.exec(
-            select(EquipmentVerificationResponse).where(
-                EquipmentVerificationResponse.verification_id == verification.id
-            )
-        ).all()
-        items.append(
-            EquipmentVerificationRead(
-                **verification.model_dump(),
-                responses=[
-                    EquipmentVerificationResponseRead.model_validate(
-                        r, from_attributes=True
-                    )
-                    for r in responses
-                ],
-            )
+    next_cursor = None
+    if len(verifications) > limit:
+        verifications = verifications[:limit]
+        last = verifications[-1]
+        next_cursor = encode_cursor(_as_utc(last.verified_at).isoformat(), last.id)
+
+    verification_ids = [v.id for v in verifications if v.id is not None]
+    responses_by_verification: dict[int, list[EquipmentVerificationResponseRead]] = {}
+    for response in session.exec(
+        select(EquipmentVerificationResponse)
+        .where(EquipmentVerificationResponse.verification_id.in_(verification_ids))  # type: ignore[attr-defined]
+        .order_by(EquipmentVerificationResponse.id)  # type: ignore[arg-type]
+    ).all():
+        responses_by_verification.setdefault(response.verification_id, []).append(
+            EquipmentVerificationResponseRead.model_validate(response, from_attributes=True)
+        )
+    items = [
+        EquipmentVerificationRead(
+            **verification.model_dump(),
+            responses=responses_by_verification.get(verification.id or -1, []),
         )
-    return EquipmentVerificationListResponse(items=items)
+        for verification in verifications
+    ]
+    return EquipmentVerificationListResponse(items=items, next_cursor=next_cursor)
 
 
 @router.get(
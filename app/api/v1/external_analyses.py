@@ -1,14 +1,16 @@
 from datetime import UTC, datetime, timedelta
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
-from sqlalchemy import desc
+from sqlalchemy import Select, desc, func, tuple_
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security.authorization import require_role
-from app.db.session import get_session
+from app.core.security.authorization import require_role, require_role_async
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope, get_terminal_scope_async
+from app.db.session import get_async_session, get_session
 from app.models.company import Company
 from app.models.company_terminal import CompanyTerminal
-from app.models.enums import UserType
+from app.models.enums import UploadJobKind, UserType
 from app.models.external_analysis_record import (
     ExternalAnalysisRecord,
     ExternalAnalysisRecordCreate,
@@ -17,6 +19,8 @@ from app.models.external_analysis_record import (
     ExternalAnalysisRecordUpdate,
 )
 from app.models.external_analysis_terminal import (
+    ExternalAnalysisDueListResponse,
+    ExternalAnalysisDueRead,
     ExternalAnalysisTerminal,
     ExternalAnalysisTerminalCreate,
     ExternalAnalysisTerminalListResponse,
@@ -29,9 +33,16 @@ from app.models.external_analysis_type import (
     ExternalAnalysisTypeRead,
     ExternalAnalysisTypeUpdate,
 )
+from app.models.upload_job import UploadJobRead
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
-from app.services.supabase_storage import upload_external_analysis_report
+from app.services.storage import external_analysis_report_path
+from app.services.upload_queue import enqueue_pdf_upload
+from app.utils.external_analysis_catalog import (
+    get_analysis_type_catalog,
+    invalidate_analysis_type_catalog,
+)
+from app.utils.external_analysis_due import external_analysis_due_statement
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
 
 router = APIRouter(
     prefix="/external-analyses",
@@ -54,17 +65,79 @@ def _as_utc(dt_value: datetime) -> datetime:
     return dt_value.astimezone(UTC)
 
 
-def _check_terminal_access(session: Session, user: User, terminal_id: int) -> None:
-    if user.user_type == UserType.superadmin:
-        return
-    allowed_terminal_ids = session.exec(
-        select(UserTerminal.terminal_id).where(UserTerminal.user_id == user.id)
-    ).all()
-    if allowed_terminal_ids and terminal_id not in set(allowed_terminal_ids):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
+def _load_company_names(session: Session, company_ids: set[int]) -> dict[int, str]:
+    if not company_ids:
+        return {}
+    return dict(
+        session.exec(
+            select(Company.id, Company.name).where(
+                Company.id.in_(company_ids)  # type: ignore[union-attr]
+            )
+        ).all()
+    )
+
+
+def _load_record_names(
+    session: Session, records: list[ExternalAnalysisRecord]
+) -> tuple[dict[int, str], dict[int, str]]:
+    """
+    Nombres de tipo (catálogo en memoria) y de empresa (una consulta IN)
+    para serializar `records` con `_to_record_read`.
+    """
+    type_names = get_analysis_type_catalog(
+        session, {record.analysis_type_id for record in records}
+    ).names()
+    company_names = _load_company_names(
+        session,
+        {
+            record.analysis_company_id
+            for record in records
+            if record.analysis_company_id is not None
+        },
+    )
+    return type_names, company_names
+
+
+def _to_record_read(
+    record: ExternalAnalysisRecord,
+    type_names: dict[int, str],
+    company_names: dict[int, str],
+) -> ExternalAnalysisRecordRead:
+    return ExternalAnalysisRecordRead(
+        **record.model_dump(),
+        analysis_type_name=type_names.get(record.analysis_type_id, ""),
+        analysis_company_name=(
+            company_names.get(record.analysis_company_id)
+            if record.analysis_company_id is not None
+            else None
+        ),
+    )
+
+
+def _last_performed_statement(
+    terminal_id: int, analysis_type_id: int | None = None
+) -> Select:
+    """
+    Último `performed_at` por tipo de análisis en la terminal, en una sola
+    consulta agrupada (índice `ix_external_analysis_record_terminal_type_performed`).
+    """
+    statement = select(
+        ExternalAnalysisRecord.analysis_type_id,
+        func.max(ExternalAnalysisRecord.performed_at),
+    ).where(ExternalAnalysisRecord.terminal_id == terminal_id)
+    if analysis_type_id is not None:
+        statement = statement.where(
+            ExternalAnalysisRecord.analysis_type_id == analysis_type_id
         )
+    return statement.group_by(ExternalAnalysisRecord.analysis_type_id)  # type: ignore[arg-type]
+
+
+def _next_due_at(
+    last_performed_at: datetime | None, frequency_days: int
+) -> datetime | None:
+    if last_performed_at is None or frequency_days <= 0:
+        return None
+    return last_performed_at + timedelta(days=frequency_days)
 
 
 @router.get(
@@ -127,6 +200,7 @@ def create_external_analysis_type(
     session.add(row)
     session.commit()
     session.refresh(row)
+    invalidate_analysis_type_catalog()
     return ExternalAnalysisTypeRead(**row.model_dump())
 
 
@@ -161,6 +235,7 @@ def update_external_analysis_type(
     session.add(row)
     session.commit()
     session.refresh(row)
+    invalidate_analysis_type_catalog()
     return ExternalAnalysisTypeRead(**row.model_dump())
 
 
@@ -201,9 +276,112 @@ def delete_external_analysis_type(
         )
     session.delete(row)
     session.commit()
+    invalidate_analysis_type_catalog()
     return {"message": "External analysis type deleted"}
 
 
+@router.get(
+    "/due",
+    response_model=ExternalAnalysisDueListResponse,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Solicitud inválida"},
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+    },
+)
+def list_external_analyses_due(
+    before: datetime | None = Query(
+        default=None,
+        description="Solo pares que vencen antes de esta fecha (incluye los nunca realizados).",
+    ),
+    company_id: int | None = Query(
+        default=None, description="Filtrar por empresa propietaria de la terminal."
+    ),
+    block_id: int | None = Query(default=None, description="Filtrar por bloque."),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(
+        require_role(
+            UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
+        )
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
+) -> ExternalAnalysisDueListResponse:
+    """
+    Lista los vencimientos de análisis externos de todas las terminales
+    visibles, los más urgentes primero.
+
+    Cada par (terminal activa, tipo activo) con frecuencia > 0 trae su
+    `last_performed_at` y `next_due_at`; la frecuencia de la terminal
+    reemplaza a la del tipo. Los pares nunca realizados van primero.
+
+    Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `before`: vencidos antes de esta fecha.
+    - `company_id`, `block_id`: filtros de terminal.
+    - `cursor`, `limit`: paginación; `next_cursor` es nulo en la última página.
+    Respuestas:
+    - 400: cursor inválido.
+    - 403: permisos insuficientes.
+    """
+    terminal_ids = None
+    if company_id is not None or block_id is not None or terminal_scope.is_restricted:
+        terminal_ids = select(CompanyTerminal.id)
+        if company_id is not None:
+            terminal_ids = terminal_ids.where(CompanyTerminal.owner_company_id == company_id)
+        if block_id is not None:
+            terminal_ids = terminal_ids.where(CompanyTerminal.block_id == block_id)
+        terminal_ids = terminal_scope.apply(terminal_ids, CompanyTerminal.id)
+    statement, due_key = external_analysis_due_statement(
+        terminal_ids=terminal_ids,
+        due_before=_as_utc(before) if before is not None else None,
+    )
+    if cursor:
+        try:
+            cursor_due_key, cursor_terminal_id, cursor_type_id = decode_cursor(cursor, 3)
+            cursor_key = tuple_(
+                datetime.fromisoformat(cursor_due_key),
+                int(cursor_terminal_id),
+                int(cursor_type_id),
+            )
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(
+            tuple_(due_key, CompanyTerminal.id, ExternalAnalysisType.id) > cursor_key
+        )
+    rows = session.exec(
+        statement.order_by(due_key, CompanyTerminal.id, ExternalAnalysisType.id).limit(
+            limit + 1
+        )
+    ).all()
+    if not rows:
+        return ExternalAnalysisDueListResponse(message="No records found")
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.due_key.isoformat(), last[0], last[2])
+
+    now = datetime.now(UTC)
+    items = [
+        ExternalAnalysisDueRead(
+            terminal_id=row[0],
+            terminal_name=row[1],
+            analysis_type_id=row[2],
+            analysis_type_name=row[3],
+            frequency_days=row.frequency_days,
+            last_performed_at=row.last_performed_at,
+            next_due_at=row.next_due_at,
+            is_overdue=row.next_due_at is None or _as_utc(row.next_due_at) <= now,
+        )
+        for row in rows
+    ]
+    return ExternalAnalysisDueListResponse(items=items, next_cursor=next_cursor)
+
+
 @router.get(
     "/terminal/{terminal_id}",
     response_model=ExternalAnalysisTerminalListResponse,
@@ -212,14 +390,15 @@ def delete_external_analysis_type(
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def list_terminal_external_analyses(
+async def list_terminal_external_analyses(
     terminal_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(
-        require_role(
+        require_role_async(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
 ) -> ExternalAnalysisTerminalListResponse:
     """
     Lista configuraciones de análisis externos por terminal.
@@ -229,15 +408,17 @@ def list_terminal_external_analyses(
     - 403: permisos insuficientes o sin acceso a la terminal.
     - 404: terminal no encontrada.
     """
-    terminal = session.get(CompanyTerminal, terminal_id)
+    terminal = await session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal not found")
-    _check_terminal_access(session, current_user, terminal_id)
+    terminal_scope.check(terminal_id)
 
-    types = session.exec(select(ExternalAnalysisType)).all()
-    configs = session.exec(
-        select(ExternalAnalysisTerminal).where(
-            ExternalAnalysisTerminal.terminal_id == terminal_id
+    types = (await session.exec(select(ExternalAnalysisType))).all()
+    configs = (
+        await session.exec(
+            select(ExternalAnalysisTerminal).where(
+                ExternalAnalysisTerminal.terminal_id == terminal_id
+            )
         )
     ).all()
     config_by_type = {
@@ -245,6 +426,9 @@ def list_terminal_external_analyses(
         for row in configs
         if row.analysis_type_id is not None
     }
+    last_performed_by_type: dict[int, datetime] = dict(
+        (await session.exec(_last_performed_statement(terminal_id))).all()
+    )
 
     items: list[ExternalAnalysisTerminalRead] = []
     for analysis_type in types:
@@ -259,20 +443,7 @@ def list_terminal_external_analyses(
             else analysis_type.default_frequency_days
         )
         is_active = cfg.is_active if cfg is not None else analysis_type.is_active
-        last_record = session.exec(
-            select(ExternalAnalysisRecord)
-            .where(
-                ExternalAnalysisRecord.terminal_id == terminal_id,
-                ExternalAnalysisRecord.analysis_type_id == analysis_type.id,
-            )
-            .order_by(desc(ExternalAnalysisRecord.performed_at))  # type: ignore[arg-type]
-        ).first()
-        last_performed_at = last_record.performed_at if last_record else None
-        next_due_at = (
-            (last_performed_at + timedelta(days=frequency_days))
-            if last_performed_at and frequency_days > 0
-            else None
-        )
+        last_performed_at = last_performed_by_type.get(analysis_type.id)
         items.append(
             ExternalAnalysisTerminalRead(
                 terminal_id=terminal_id,
@@ -281,7 +452,7 @@ def list_terminal_external_analyses(
                 frequency_days=frequency_days,
                 is_active=is_active,
                 last_performed_at=last_performed_at,
-                next_due_at=next_due_at,
+                next_due_at=_next_due_at(last_performed_at, frequency_days),
             )
         )
     if not items:
@@ -342,20 +513,10 @@ def upsert_terminal_external_analysis(
     session.commit()
     session.refresh(row)
 
-    last_record = session.exec(
-        select(ExternalAnalysisRecord)
-        .where(
-            ExternalAnalysisRecord.terminal_id == terminal_id,
-            ExternalAnalysisRecord.analysis_type_id == analysis_type_id,
-        )
-        .order_by(desc(ExternalAnalysisRecord.performed_at))  # type: ignore[arg-type]
+    last_performed = session.exec(
+        _last_performed_statement(terminal_id, analysis_type_id)
     ).first()
-    last_performed_at = last_record.performed_at if last_record else None
-    next_due_at = (
-        (last_performed_at + timedelta(days=row.frequency_days))
-        if last_performed_at and row.frequency_days > 0
-        else None
-    )
+    last_performed_at = last_performed[1] if last_performed else None
     return ExternalAnalysisTerminalRead(
         terminal_id=terminal_id,
         analysis_type_id=analysis_type_id,
@@ -363,7 +524,7 @@ def upsert_terminal_external_analysis(
         frequency_days=row.frequency_days,
         is_active=row.is_active,
         last_performed_at=last_performed_at,
-        next_due_at=next_due_at,
+        next_due_at=_next_due_at(last_performed_at, row.frequency_days),
     )
 
 
@@ -380,87 +541,76 @@ def list_external_analysis_records(
     analysis_type_id: int | None = Query(
         default=None, description="Filtrar por tipo de análisis."
     ),
+    performed_from: datetime | None = Query(default=None),
+    performed_to: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     session: Session = Depends(get_session),
     current_user: User = Depends(
         require_role(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> ExternalAnalysisRecordListResponse:
     """
-    Lista los registros de análisis externo de un terminal.
+    Lista los registros de análisis externo de un terminal, los más
+    recientes primero.
 
     Permisos: `visitor`, `user`, `admin`, `superadmin`.
     Parámetros:
     - `analysis_type_id`: filtra por tipo de análisis.
+    - `performed_from`, `performed_to`: rango (inclusivo) sobre `performed_at`.
+    - `cursor`, `limit`: paginación; `next_cursor` es nulo en la última página.
     Respuestas:
+    - 400: cursor inválido.
     - 403: permisos insuficientes.
     - 404: terminal no encontrada.
     """
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal not found")
-    _check_terminal_access(session, current_user, terminal_id)
+    terminal_scope.check(terminal_id)
 
     stmt = select(ExternalAnalysisRecord).where(
         ExternalAnalysisRecord.terminal_id == terminal_id
     )
     if analysis_type_id is not None:
         stmt = stmt.where(ExternalAnalysisRecord.analysis_type_id == analysis_type_id)
-    rows = session.exec(
-        stmt.order_by(desc(ExternalAnalysisRecord.performed_at))  # type: ignore[arg-type]
-    ).all()
-    if not rows:
-        return ExternalAnalysisRecordListResponse(message="No records found")
-    type_ids = {
-        row.analysis_type_id for row in rows if row.analysis_type_id is not None
-    }
-    company_ids = {
-        row.analysis_company_id for row in rows if row.analysis_company_id is not None
-    }
-    types = session.exec(
-        select(ExternalAnalysisType).where(
-            ExternalAnalysisType.id.in_(type_ids)  # type: ignore[union-attr]
+    if performed_from is not None:
+        stmt = stmt.where(ExternalAnalysisRecord.performed_at >= _as_utc(performed_from))
+    if performed_to is not None:
+        stmt = stmt.where(ExternalAnalysisRecord.performed_at <= _as_utc(performed_to))
+    if cursor:
+        try:
+            cursor_performed_at, cursor_id = decode_cursor(cursor, 2)
+            cursor_key = tuple_(datetime.fromisoformat(cursor_performed_at), int(cursor_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        stmt = stmt.where(
+            tuple_(ExternalAnalysisRecord.performed_at, ExternalAnalysisRecord.id) < cursor_key
         )
-    ).all()
-    type_by_id = {t.id: t for t in types}
-    companies = (
+    rows = list(
         session.exec(
-            select(Company).where(Company.id.in_(company_ids))  # type: ignore[union-attr]
+            stmt.order_by(
+                desc(ExternalAnalysisRecord.performed_at), desc(ExternalAnalysisRecord.id)
+            ).limit(limit + 1)
         ).all()
-        if company_ids
-        else []
     )
-    company_by_id = {c.id: c for c in companies}
+    if not rows:
+        return ExternalAnalysisRecordListResponse(message="No records found")
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.performed_at.isoformat(), last.id)
+    type_names, company_names = _load_record_names(session, rows)
     return ExternalAnalysisRecordListResponse(
-        items=[
-            ExternalAnalysisRecordRead(
-                id=_require_id(row.id, "ExternalAnalysisRecord"),
-                terminal_id=row.terminal_id,
-                analysis_type_id=row.analysis_type_id,
-                analysis_type_name=(
-                    type_by_id[row.analysis_type_id].name
-                    if row.analysis_type_id in type_by_id
-                    else ""
-                ),
-                analysis_company_id=row.analysis_company_id,
-                analysis_company_name=(
-                    company_by_id[row.analysis_company_id].name
-                    if row.analysis_company_id in company_by_id
-                    else None
-                ),
-                performed_at=row.performed_at,
-                report_number=row.report_number,
-                report_pdf_url=row.report_pdf_url,
-                result_value=row.result_value,
-                result_unit=row.result_unit,
-                result_uncertainty=row.result_uncertainty,
-                method=row.method,
-                notes=row.notes,
-                created_by_user_id=row.created_by_user_id,
-            )
-            for row in rows
-        ]
+        items=[_to_record_read(row, type_names, company_names) for row in rows],
+        next_cursor=next_cursor,
     )
 
 
@@ -482,6 +632,7 @@ def create_external_analysis_record(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> ExternalAnalysisRecordRead:
     """
     Crea un registro de análisis externo para un terminal.
@@ -496,11 +647,12 @@ def create_external_analysis_record(
     terminal = session.get(CompanyTerminal, terminal_id)
     if not terminal:
         raise HTTPException(status_code=404, detail="Terminal not found")
-    _check_terminal_access(session, current_user, terminal_id)
+    terminal_scope.check(terminal_id)
 
     analysis_type = session.get(ExternalAnalysisType, payload.analysis_type_id)
     if not analysis_type:
         raise HTTPException(status_code=404, detail="External analysis type not found")
+    analysis_type_id = _require_id(analysis_type.id, "ExternalAnalysisType")
 
     analysis_company = None
     if payload.analysis_company_id is not None:
@@ -527,89 +679,68 @@ def create_external_analysis_record(
     session.add(record)
     session.commit()
     session.refresh(record)
-    record_id = _require_id(record.id, "ExternalAnalysisRecord")
-    return ExternalAnalysisRecordRead(
-        id=record_id,
-        terminal_id=record.terminal_id,
-        analysis_type_id=record.analysis_type_id,
-        analysis_type_name=analysis_type.name,
-        analysis_company_id=record.analysis_company_id,
-        analysis_company_name=analysis_company.name if analysis_company else None,
-        performed_at=record.performed_at,
-        report_number=record.report_number,
-        report_pdf_url=record.report_pdf_url,
-        result_value=record.result_value,
-        result_unit=record.result_unit,
-        result_uncertainty=record.result_uncertainty,
-        method=record.method,
-        notes=record.notes,
-        created_by_user_id=record.created_by_user_id,
+    _require_id(record.id, "ExternalAnalysisRecord")
+    return _to_record_read(
+        record,
+        {analysis_type_id: analysis_type.name},
+        {analysis_company.id: analysis_company.name}
+        if analysis_company is not None and analysis_company.id is not None
+        else {},
     )
 
 
 @router.post(
     "/records/{record_id}/report",
-    response_model=ExternalAnalysisRecordRead,
+    response_model=UploadJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Recurso no encontrado"},
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def upload_external_analysis_report_file(
+async def upload_external_analysis_report_file(
     record_id: int,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(
-        require_role(
+        require_role_async(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
-) -> ExternalAnalysisRecordRead:
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
+) -> UploadJobRead:
     """
-    Sube el PDF del reporte para un registro de análisis externo.
+    Encola el PDF del reporte para un registro de análisis externo.
+
+    El archivo queda en el spool y un worker lo sube al almacenamiento; el
+    estado y la URL final se consultan en `GET /upload-jobs/{job_id}`.
 
     Permisos: `visitor`, `user`, `admin`, `superadmin`.
     Respuestas:
+    - 400: el archivo no es un PDF.
     - 403: permisos insuficientes.
     - 404: registro no encontrado.
+    - 413: el PDF supera el tamaño máximo.
     """
-    record = session.get(ExternalAnalysisRecord, record_id)
+    record = await session.get(ExternalAnalysisRecord, record_id)
     if not record:
         raise HTTPException(
             status_code=404, detail="External analysis record not found"
         )
-    _check_terminal_access(session, current_user, record.terminal_id)
-
-    report_url = upload_external_analysis_report(file, record_id)
-    record.report_pdf_url = report_url
-    session.add(record)
-    session.commit()
-    session.refresh(record)
-    record_id = _require_id(record.id, "ExternalAnalysisRecord")
-
-    analysis_type = session.get(ExternalAnalysisType, record.analysis_type_id)
-    analysis_type_name = analysis_type.name if analysis_type else ""
-    analysis_company_name = None
-    if record.analysis_company_id is not None:
-        analysis_company = session.get(Company, record.analysis_company_id)
-        analysis_company_name = analysis_company.name if analysis_company else None
-    return ExternalAnalysisRecordRead(
-        id=record_id,
+    terminal_scope.check(record.terminal_id)
+    # Cierra la transacción de lectura mientras se escribe el spool.
+    await session.commit()
+
+    job = await enqueue_pdf_upload(
+        session,
+        file,
+        kind=UploadJobKind.external_analysis_report,
+        target_id=record_id,
         terminal_id=record.terminal_id,
-        analysis_type_id=record.analysis_type_id,
-        analysis_type_name=analysis_type_name,
-        analysis_company_id=record.analysis_company_id,
-        analysis_company_name=analysis_company_name,
-        performed_at=record.performed_at,
-        report_number=record.report_number,
-        report_pdf_url=record.report_pdf_url,
-        result_value=record.result_value,
-        result_unit=record.result_unit,
-        result_uncertainty=record.result_uncertainty,
-        method=record.method,
-        notes=record.notes,
-        created_by_user_id=record.created_by_user_id,
+        storage_path=external_analysis_report_path(record_id),
+        user_id=_require_id(current_user.id, "User"),
     )
+    return UploadJobRead.model_validate(job)
 
 
 @router.patch(
@@ -629,6 +760,7 @@ def update_external_analysis_record(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> ExternalAnalysisRecordRead:
     """
     Actualiza un registro de análisis externo.
@@ -643,7 +775,7 @@ def update_external_analysis_record(
         raise HTTPException(
             status_code=404, detail="External analysis record not found"
         )
-    _check_terminal_access(session, current_user, record.terminal_id)
+    terminal_scope.check(record.terminal_id)
 
     update_data = payload.model_dump(exclude_unset=True)
     if "analysis_type_id" in update_data:
@@ -654,15 +786,9 @@ def update_external_analysis_record(
             raise HTTPException(
                 status_code=404, detail="External analysis type not found"
             )
-    if "analysis_company_id" in update_data:
-        if update_data["analysis_company_id"] is not None:
-            analysis_company = session.get(Company, update_data["analysis_company_id"])
-            if not analysis_company:
-                raise HTTPException(status_code=404, detail="Company not found")
-        else:
-            analysis_company = None
-    else:
-        analysis_company = None
+    if update_data.get("analysis_company_id") is not None:
+        if not session.get(Company, update_data["analysis_company_id"]):
+            raise HTTPException(status_code=404, detail="Company not found")
     if "performed_at" in update_data and update_data["performed_at"] is not None:
         update_data["performed_at"] = _as_utc(update_data["performed_at"])
 
@@ -672,31 +798,8 @@ def update_external_analysis_record(
     session.add(record)
     session.commit()
     session.refresh(record)
-    record_id = _require_id(record.id, "ExternalAnalysisRecord")
-
-    analysis_type = session.get(ExternalAnalysisType, record.analysis_type_id)
-    analysis_type_name = analysis_type.name if analysis_type else ""
-    analysis_company_name = None
-    if record.analysis_company_id is not None:
-        analysis_company = session.get(Company, record.analysis_company_id)
-        analysis_company_name = analysis_company.name if analysis_company else None
-    return ExternalAnalysisRecordRead(
-        id=record_id,
-        terminal_id=record.terminal_id,
-        analysis_type_id=record.analysis_type_id,
-        analysis_type_name=analysis_type_name,
-        analysis_company_id=record.analysis_company_id,
-        analysis_company_name=analysis_company_name,
-        performed_at=record.performed_at,
-        report_number=record.report_number,
-        report_pdf_url=record.report_pdf_url,
-        result_value=record.result_value,
-        result_unit=record.result_unit,
-        result_uncertainty=record.result_uncertainty,
-        method=record.method,
-        notes=record.notes,
-        created_by_user_id=record.created_by_user_id,
-    )
+    _require_id(record.id, "ExternalAnalysisRecord")
+    return _to_record_read(record, *_load_record_names(session, [record]))
 
 
 @router.delete(
@@ -715,6 +818,7 @@ def delete_external_analysis_record(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> dict:
     """
     Elimina un registro de análisis externo.
@@ -729,7 +833,7 @@ def delete_external_analysis_record(
         raise HTTPException(
             status_code=404, detail="External analysis record not found"
         )
-    _check_terminal_access(session, current_user, record.terminal_id)
+    terminal_scope.check(record.terminal_id)
     session.delete(record)
     session.commit()
     return {"message": "External analysis record deleted"}
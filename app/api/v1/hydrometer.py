@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
 from app.core.security.authorization import require_role
 from app.models.enums import UserType
 from app.utils.hydrometer import api_60f_crude
+from app.utils.hydrometer_table import api_60f_batch
 
 
 class Api60fRequest(SQLModel):
@@ -16,6 +17,20 @@ class Api60fResponse(SQLModel):
     message: str
 
 
+class Api60fBatchRequest(SQLModel):
+    items: list[Api60fRequest] = Field(min_length=1, max_length=10000)
+
+
+class Api60fBatchItem(SQLModel):
+    api_60f: float | None = None
+    error: str | None = None
+
+
+class Api60fBatchResponse(SQLModel):
+    items: list[Api60fBatchItem]
+    message: str
+
+
 router = APIRouter(prefix="/hydrometer", tags=["Hydrometer"])
 
 
@@ -52,3 +67,41 @@ def calculate_api_60f(
             detail=str(exc),
         ) from exc
     return Api60fResponse(api_60f=api_60f, message="OK")
+
+
+@router.post(
+    "/api60f/batch",
+    response_model=Api60fBatchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+    },
+)
+def calculate_api_60f_batch(
+    payload: Api60fBatchRequest,
+    _: object = Depends(
+        require_role(
+            UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
+        )
+    ),
+) -> Api60fBatchResponse:
+    """
+    Calcula el API corregido a 60°F para varias lecturas en una sola pasada.
+
+    Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Respuestas:
+    - 200: un ítem por lectura, en el mismo orden; las lecturas fuera de
+      rango traen `api_60f` nulo y el motivo en `error`.
+    - 403: permisos insuficientes.
+    """
+    batch = api_60f_batch(
+        [item.temp_obs_f for item in payload.items],
+        [item.lectura_api for item in payload.items],
+    )
+    return Api60fBatchResponse(
+        items=[
+            Api60fBatchItem(api_60f=value, error=batch.error(index) if value is None else None)
+            for index, value in enumerate(batch.values())
+        ],
+        message="OK",
+    )
@@ -1,10 +1,15 @@
 from datetime import UTC, datetime, timedelta
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import desc, tuple_
 from sqlmodel import Session, delete, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security.authorization import require_role
-from app.db.session import get_session
+from app.core.security.authorization import require_role, require_role_async
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope, get_terminal_scope_async
+from app.db.session import get_async_session, get_session
 from app.models.company_terminal import CompanyTerminal
 from app.models.enums import SampleAnalysisType, UserType
 from app.models.sample import (
@@ -13,14 +18,20 @@ from app.models.sample import (
     SampleAnalysisCreate,
     SampleAnalysisHistory,
     SampleAnalysisRead,
+    SampleBatchCreate,
+    SampleBatchResponse,
     SampleCreate,
     SampleListResponse,
     SampleRead,
     SampleUpdate,
 )
 from app.models.user import User
-from app.models.user_terminal import UserTerminal
 from app.utils.hydrometer import api_60f_crude
+from app.utils.hydrometer_table import api_60f_batch
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.utils.sample_export import sample_export_statement, stream_sample_export
+from app.utils.sample_retention import disposal_due_at, due_for_disposal_statement
+from app.utils.sample_sequence import allocate_sample_sequences, release_sample_sequence
 
 router = APIRouter(prefix="/samples", tags=["Samples"])
 
@@ -46,23 +57,6 @@ def _terminal_code(name: str, terminal_code: str | None = None) -> str:
     return token[:3]
 
 
-def _check_terminal_access(
-    session: Session,
-    user: User,
-    terminal_id: int,
-) -> None:
-    if user.user_type == UserType.superadmin:
-        return
-    allowed_terminal_ids = session.exec(
-        select(UserTerminal.terminal_id).where(UserTerminal.user_id == user.id)
-    ).all()
-    if allowed_terminal_ids and terminal_id not in set(allowed_terminal_ids):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this terminal",
-        )
-
-
 def _validate_regular_user_analyzed_at(
     user: User,
     analyzed_at: datetime | None,
@@ -88,10 +82,39 @@ def _validate_regular_user_analyzed_at(
         )
 
 
-def _build_analysis(
-    analysis: SampleAnalysisCreate,
-    sample_id: int,
-) -> SampleAnalysis:
+def _to_sample_read(sample: Sample, analyses: list[SampleAnalysis]) -> SampleRead:
+    if sample.id is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Sample has no ID",
+        )
+    return SampleRead(
+        id=sample.id,
+        terminal_id=sample.terminal_id,
+        code=sample.code,
+        sequence=sample.sequence,
+        created_by_user_id=sample.created_by_user_id,
+        created_at=_as_utc(sample.created_at),
+        identifier=sample.identifier,
+        product_name=sample.product_name,
+        analyzed_at=_as_utc(sample.analyzed_at) if sample.analyzed_at else None,
+        thermohygrometer_id=sample.thermohygrometer_id,
+        lab_humidity=sample.lab_humidity,
+        lab_temperature=sample.lab_temperature,
+        last_update_reason=sample.last_update_reason,
+        volume=sample.volume,
+        retention_days=sample.retention_days,
+        disposed_at=_as_utc(sample.disposed_at) if sample.disposed_at else None,
+        disposed_by_user_id=sample.disposed_by_user_id,
+        disposal_due_at=_as_utc(sample.disposal_due_at) if sample.disposal_due_at else None,
+        analyses=[
+            SampleAnalysisRead.model_validate(r, from_attributes=True)
+            for r in analyses
+        ],
+    )
+
+
+def _validate_analysis_type(analysis: SampleAnalysisCreate) -> None:
     if analysis.analysis_type not in {
         SampleAnalysisType.api_astm_1298,
         SampleAnalysisType.water_astm_4377,
@@ -100,14 +123,29 @@ def _build_analysis(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unsupported analysis type",
         )
-    api_60f = None
-    if analysis.analysis_type == SampleAnalysisType.api_astm_1298:
-        if analysis.temp_obs_f is None or analysis.lectura_api is None:
-            api_60f = None
-        else:
-            api_60f = api_60f_crude(analysis.temp_obs_f, analysis.lectura_api)
+
+
+def _needs_api_60f(analysis: SampleAnalysisCreate) -> bool:
+    return (
+        analysis.analysis_type == SampleAnalysisType.api_astm_1298
+        and analysis.temp_obs_f is not None
+        and analysis.lectura_api is not None
+    )
+
+
+def _build_analysis(
+    analysis: SampleAnalysisCreate,
+    api_60f: float | None = None,
+) -> SampleAnalysis:
+    """
+    Construye el análisis sin `sample_id`; se asigna al insertar la muestra.
+
+    Si no se pasa `api_60f`, se calcula aquí.
+    """
+    _validate_analysis_type(analysis)
+    if api_60f is None and _needs_api_60f(analysis):
+        api_60f = api_60f_crude(analysis.temp_obs_f, analysis.lectura_api)  # type: ignore[arg-type]
     return SampleAnalysis(
-        sample_id=sample_id,
         analysis_type=analysis.analysis_type,
         product_name=analysis.product_name or "Crudo",
         temp_obs_f=analysis.temp_obs_f,
@@ -142,6 +180,7 @@ def create_sample(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> SampleRead:
     """
     Crea una muestra con sus análisis asociados.
@@ -153,7 +192,8 @@ def create_sample(
     - 404: terminal no encontrada.
 
     Nota: el código de muestra se genera automáticamente con el
-    consecutivo de la terminal.
+    consecutivo de la terminal, que se reserva al final para no serializar
+    las altas concurrentes de la misma terminal.
     """
     if current_user.id is None:
         raise HTTPException(
@@ -161,7 +201,6 @@ def create_sample(
             detail="User has no ID",
         )
 
-    # Validate identifier before acquiring the row lock
     identifier = str(payload.identifier or "").strip()
     if not identifier:
         raise HTTPException(
@@ -169,23 +208,19 @@ def create_sample(
             detail="Identifier is required",
         )
 
-    terminal = session.exec(
-        select(CompanyTerminal)
-        .where(CompanyTerminal.id == payload.terminal_id)
-        .with_for_update()
-    ).first()
+    terminal = session.get(CompanyTerminal, payload.terminal_id)
     if not terminal or terminal.id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Terminal not found",
         )
-    _check_terminal_access(session, current_user, terminal.id)
+    terminal_scope.check(terminal.id)
     _validate_regular_user_analyzed_at(current_user, payload.analyzed_at)
 
-    seq = terminal.next_sample_sequence or 1
-    terminal.next_sample_sequence = seq + 1
-    session.add(terminal)
+    analysis_rows = [_build_analysis(analysis) for analysis in payload.analyses]
 
+    # El contador queda bloqueado solo desde aquí hasta el commit.
+    seq = allocate_sample_sequences(session, terminal.id)
     code = f"{_terminal_code(terminal.name, terminal.terminal_code)}-{seq:04d}"
 
     sample = Sample(
@@ -199,6 +234,7 @@ def create_sample(
         volume=payload.volume,
         retention_days=payload.retention_days,
     )
+    sample.disposal_due_at = disposal_due_at(sample.created_at, sample.retention_days)
     session.add(sample)
     session.flush()  # get sample.id without committing
     sample_id = sample.id
@@ -208,38 +244,246 @@ def create_sample(
             detail="Sample has no ID",
         )
 
-    analysis_rows: list[SampleAnalysis] = []
-    for analysis in payload.analyses:
-        row = _build_analysis(analysis, sample_id)
-        analysis_rows.append(row)
+    for row in analysis_rows:
+        row.sample_id = sample_id
         session.add(row)
-    session.commit()  # single commit: terminal seq + sample + analyses
+    session.commit()  # single commit: counter + sample + analyses
 
-    return SampleRead(
-        id=sample_id,
-        terminal_id=sample.terminal_id,
-        code=sample.code,
-        sequence=sample.sequence,
-        created_by_user_id=sample.created_by_user_id,
-        created_at=sample.created_at,
-        identifier=sample.identifier,
-        product_name=sample.product_name,
-        analyzed_at=_as_utc(sample.analyzed_at) if sample.analyzed_at else None,
-        thermohygrometer_id=sample.thermohygrometer_id,
-        lab_humidity=sample.lab_humidity,
-        lab_temperature=sample.lab_temperature,
-        last_update_reason=sample.last_update_reason,
-        volume=sample.volume,
-        retention_days=sample.retention_days,
-        disposed_at=_as_utc(sample.disposed_at) if sample.disposed_at else None,
-        disposed_by_user_id=sample.disposed_by_user_id,
-        analyses=[
-            SampleAnalysisRead.model_validate(r, from_attributes=True)
-            for r in analysis_rows
-        ],
+    return _to_sample_read(sample, analysis_rows)
+
+
+@router.post(
+    "/batch",
+    response_model=SampleBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Solicitud inválida"},
+    },
+)
+def create_samples_batch(
+    payload: SampleBatchCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(
+        require_role(UserType.user, UserType.admin, UserType.superadmin)
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
+) -> SampleBatchResponse:
+    """
+    Crea varias muestras con sus análisis en una sola transacción.
+
+    Permisos: `user`, `admin`, `superadmin`.
+    Respuestas:
+    - 400: algún ítem es inválido; `detail` lista `{index, detail}` por
+      ítem y no se crea ninguna muestra.
+    - 403: permisos insuficientes.
+
+    Nota: los consecutivos de cada terminal se reservan en bloque y las
+    muestras se devuelven en el orden recibido.
+    """
+    if current_user.id is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="User has no ID",
+        )
+
+    errors: dict[int, str] = {}
+    identifiers: list[str] = []
+    for index, item in enumerate(payload.items):
+        identifier = str(item.identifier or "").strip()
+        identifiers.append(identifier)
+        if not identifier:
+            errors[index] = "Identifier is required"
+            continue
+        try:
+            _validate_regular_user_analyzed_at(current_user, item.analyzed_at)
+            for analysis in item.analyses:
+                _validate_analysis_type(analysis)
+        except HTTPException as exc:
+            errors[index] = str(exc.detail)
+
+    terminal_ids = sorted({item.terminal_id for item in payload.items})
+    terminals = {
+        terminal.id: terminal
+        for terminal in session.exec(
+            select(CompanyTerminal).where(CompanyTerminal.id.in_(terminal_ids))  # type: ignore[union-attr]
+        ).all()
+    }
+    for index, item in enumerate(payload.items):
+        if item.terminal_id not in terminals:
+            errors.setdefault(index, "Terminal not found")
+        elif not terminal_scope.has_access(item.terminal_id):
+            errors.setdefault(index, "You do not have access to this terminal")
+
+    # API-60 de todos los análisis en una sola pasada.
+    api_inputs: list[tuple[int, SampleAnalysisCreate]] = [
+        (index, analysis)
+        for index, item in enumerate(payload.items)
+        if index not in errors
+        for analysis in item.analyses
+        if _needs_api_60f(analysis)
+    ]
+    api_60f_values: dict[int, float] = {}
+    if api_inputs:
+        batch = api_60f_batch(
+            [analysis.temp_obs_f for _, analysis in api_inputs],
+            [analysis.lectura_api for _, analysis in api_inputs],
+        )
+        for position, ((index, analysis), value) in enumerate(zip(api_inputs, batch.values(), strict=True)):
+            if value is None:
+                errors.setdefault(index, batch.error(position) or "Invalid API-60 input")
+            else:
+                api_60f_values[id(analysis)] = value
+
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[
+                {"index": index, "detail": message}
+                for index, message in sorted(errors.items())
+            ],
+        )
+
+    # Reserva por terminal en orden de ID para no cruzar bloqueos entre lotes.
+    counts_by_terminal: dict[int, int] = {}
+    for item in payload.items:
+        counts_by_terminal[item.terminal_id] = counts_by_terminal.get(item.terminal_id, 0) + 1
+    next_by_terminal = {
+        terminal_id: allocate_sample_sequences(session, terminal_id, count)
+        for terminal_id, count in sorted(counts_by_terminal.items())
+    }
+
+    samples: list[Sample] = []
+    for item, identifier in zip(payload.items, identifiers, strict=True):
+        terminal = terminals[item.terminal_id]
+        seq = next_by_terminal[item.terminal_id]
+        next_by_terminal[item.terminal_id] = seq + 1
+        samples.append(
+            Sample(
+                terminal_id=item.terminal_id,
+                code=f"{_terminal_code(terminal.name, terminal.terminal_code)}-{seq:04d}",
+                sequence=seq,
+                created_by_user_id=current_user.id,
+                product_name="Crudo",
+                identifier=identifier,
+                analyzed_at=_as_utc(item.analyzed_at) if item.analyzed_at else None,
+                volume=item.volume,
+                retention_days=item.retention_days,
+            )
+        )
+        samples[-1].disposal_due_at = disposal_due_at(samples[-1].created_at, item.retention_days)
+    session.add_all(samples)
+    session.flush()  # un INSERT multi-fila para todas las muestras
+
+    analyses_by_sample: list[list[SampleAnalysis]] = []
+    for item, sample in zip(payload.items, samples, strict=True):
+        if sample.id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Sample has no ID",
+            )
+        rows = [
+            _build_analysis(analysis, api_60f_values.get(id(analysis)))
+            for analysis in item.analyses
+        ]
+        for row in rows:
+            row.sample_id = sample.id
+        analyses_by_sample.append(rows)
+    session.add_all([row for rows in analyses_by_sample for row in rows])
+    session.commit()
+
+    return SampleBatchResponse(
+        items=[
+            _to_sample_read(sample, rows)
+            for sample, rows in zip(samples, analyses_by_sample, strict=True)
+        ]
     )
 
 
+@router.get(
+    "/due-for-disposal",
+    response_model=SampleListResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Solicitud inválida"},
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+    },
+)
+async def list_samples_due_for_disposal(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(
+        require_role_async(
+            UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
+        )
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
+    terminal_id: int | None = Query(default=None),
+    as_of: datetime | None = Query(default=None),
+    cursor: str | None = Query(
+        default=None,
+        description="Cursor `next_cursor` de la página anterior.",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> SampleListResponse:
+    """
+    Lista muestras no dispuestas cuya retención ya venció, las más antiguas primero.
+
+    Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `terminal_id`: filtra por terminal.
+    - `as_of`: fecha de corte (por defecto, ahora).
+    - `cursor`, `limit`: paginación; `next_cursor` es nulo en la última página.
+    Respuestas:
+    - 400: cursor inválido.
+    - 403: permisos insuficientes o sin acceso a la terminal.
+
+    Nota: usuarios que no son `superadmin` solo ven muestras de las
+    terminales que tienen asignadas.
+    """
+    if terminal_id is not None:
+        terminal_scope.check(terminal_id)
+    statement = due_for_disposal_statement(_as_utc(as_of) if as_of else datetime.now(UTC))
+    statement = terminal_scope.apply(statement, Sample.terminal_id)
+    if terminal_id is not None:
+        statement = statement.where(Sample.terminal_id == terminal_id)
+    if cursor:
+        try:
+            after_due_at, after_id = decode_cursor(cursor, 2)
+            after_key = tuple_(datetime.fromisoformat(after_due_at), int(after_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(tuple_(Sample.disposal_due_at, Sample.id) > after_key)
+    samples = list((await session.exec(statement.limit(limit + 1))).all())
+    if not samples:
+        return SampleListResponse(message="No records found")
+    next_cursor = None
+    if len(samples) > limit:
+        samples = samples[:limit]
+        last = samples[-1]
+        if last.disposal_due_at is not None:
+            next_cursor = encode_cursor(_as_utc(last.disposal_due_at).isoformat(), last.id)
+
+    sample_ids = [s.id for s in samples if s.id is not None]
+    all_analyses = (
+        await session.exec(
+            select(SampleAnalysis).where(SampleAnalysis.sample_id.in_(sample_ids))  # type: ignore[union-attr]
+        )
+    ).all()
+    analyses_by_sample: dict[int, list[SampleAnalysis]] = {}
+    for a in all_analyses:
+        analyses_by_sample.setdefault(a.sample_id, []).append(a)
+
+    items = [
+        _to_sample_read(sample, analyses_by_sample.get(sample.id, []))
+        for sample in samples
+        if sample.id is not None
+    ]
+    return SampleListResponse(items=items, next_cursor=next_cursor)
+
+
 @router.get(
     "/terminal/{terminal_id}",
     response_model=SampleListResponse,
@@ -249,71 +493,153 @@ def create_sample(
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def list_samples(
+async def list_samples(
     terminal_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(
-        require_role(
+        require_role_async(
             UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    analyzed_from: datetime | None = Query(default=None),
+    analyzed_to: datetime | None = Query(default=None),
+    disposed: bool | None = Query(default=None),
+    identifier_prefix: str | None = Query(default=None, min_length=1),
+    code_prefix: str | None = Query(default=None, min_length=1),
+    order: Literal["asc", "desc"] = Query(default="desc"),
+    cursor: str | None = Query(
+        default=None,
+        description="Cursor `next_cursor` de la página anterior.",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ) -> SampleListResponse:
     """
-    Lista muestras de una terminal, ordenadas por fecha de creación.
+    Lista muestras de una terminal, paginadas por fecha de creación.
 
     Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `created_from`, `created_to`: rango (inclusivo) sobre `created_at`.
+    - `analyzed_from`, `analyzed_to`: rango (inclusivo) sobre `analyzed_at`.
+    - `disposed`: `true` solo dispuestas, `false` solo pendientes.
+    - `identifier_prefix`, `code_prefix`: filtran por prefijo.
+    - `order`: `desc` (por defecto, más recientes primero) o `asc`.
+    - `cursor`, `limit`: paginación; `next_cursor` es nulo en la última página.
     Respuestas:
+    - 400: cursor inválido.
     - 403: permisos insuficientes o sin acceso a la terminal.
-    - 404: terminal no encontrada.
     """
-    _check_terminal_access(session, current_user, terminal_id)
-    samples = session.exec(
-        select(Sample)
-        .where(Sample.terminal_id == terminal_id)
-        .order_by(Sample.created_at)  # type: ignore[arg-type]
-    ).all()
+    terminal_scope.check(terminal_id)
+    statement = select(Sample).where(Sample.terminal_id == terminal_id)
+    if created_from is not None:
+        statement = statement.where(Sample.created_at >= _as_utc(created_from))
+    if created_to is not None:
+        statement = statement.where(Sample.created_at <= _as_utc(created_to))
+    if analyzed_from is not None:
+        statement = statement.where(Sample.analyzed_at >= _as_utc(analyzed_from))  # type: ignore[operator]
+    if analyzed_to is not None:
+        statement = statement.where(Sample.analyzed_at <= _as_utc(analyzed_to))  # type: ignore[operator]
+    if disposed is not None:
+        statement = statement.where(
+            Sample.disposed_at.is_not(None) if disposed else Sample.disposed_at.is_(None)  # type: ignore[union-attr]
+        )
+    if identifier_prefix:
+        statement = statement.where(
+            Sample.identifier.startswith(identifier_prefix, autoescape=True)  # type: ignore[union-attr]
+        )
+    if code_prefix:
+        statement = statement.where(
+            Sample.code.startswith(code_prefix, autoescape=True)  # type: ignore[attr-defined]
+        )
+
+    sort_key = tuple_(Sample.created_at, Sample.id)
+    if cursor:
+        try:
+            after_created_at, after_id = decode_cursor(cursor, 2)
+            after_key = tuple_(datetime.fromisoformat(after_created_at), int(after_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+        statement = statement.where(sort_key < after_key if order == "desc" else sort_key > after_key)
+    if order == "desc":
+        statement = statement.order_by(desc(Sample.created_at), desc(Sample.id))
+    else:
+        statement = statement.order_by(Sample.created_at, Sample.id)  # type: ignore[arg-type]
+    samples = list((await session.exec(statement.limit(limit + 1))).all())
     if not samples:
         return SampleListResponse(message="No records found")
+    next_cursor = None
+    if len(samples) > limit:
+        samples = samples[:limit]
+        last = samples[-1]
+        next_cursor = encode_cursor(_as_utc(last.created_at).isoformat(), last.id)
 
     sample_ids = [s.id for s in samples if s.id is not None]
-    all_analyses = session.exec(
-        select(SampleAnalysis).where(SampleAnalysis.sample_id.in_(sample_ids))  # type: ignore[union-attr]
+    all_analyses = (
+        await session.exec(
+            select(SampleAnalysis).where(SampleAnalysis.sample_id.in_(sample_ids))  # type: ignore[union-attr]
+        )
     ).all()
     analyses_by_sample: dict[int, list[SampleAnalysis]] = {}
     for a in all_analyses:
         analyses_by_sample.setdefault(a.sample_id, []).append(a)
 
-    items: list[SampleRead] = []
-    for sample in samples:
-        if sample.id is None:
-            continue
-        analyses = analyses_by_sample.get(sample.id, [])
-        items.append(
-            SampleRead(
-                id=sample.id,
-                terminal_id=sample.terminal_id,
-                code=sample.code,
-                sequence=sample.sequence,
-                created_by_user_id=sample.created_by_user_id,
-                created_at=_as_utc(sample.created_at),
-                identifier=sample.identifier,
-                product_name=sample.product_name,
-                analyzed_at=_as_utc(sample.analyzed_at) if sample.analyzed_at else None,
-                thermohygrometer_id=sample.thermohygrometer_id,
-                lab_humidity=sample.lab_humidity,
-                lab_temperature=sample.lab_temperature,
-                last_update_reason=sample.last_update_reason,
-                volume=sample.volume,
-                retention_days=sample.retention_days,
-                disposed_at=_as_utc(sample.disposed_at) if sample.disposed_at else None,
-                disposed_by_user_id=sample.disposed_by_user_id,
-                analyses=[
-                    SampleAnalysisRead.model_validate(r, from_attributes=True)
-                    for r in analyses
-                ],
-            )
+    items = [
+        _to_sample_read(sample, analyses_by_sample.get(sample.id, []))
+        for sample in samples
+        if sample.id is not None
+    ]
+    return SampleListResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/terminal/{terminal_id}/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+            "description": "Una fila por análisis (o por muestra sin análisis).",
+        },
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+    },
+)
+async def export_samples(
+    terminal_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(
+        require_role_async(
+            UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
         )
-    return SampleListResponse(items=items)
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    created_from: datetime | None = Query(default=None, alias="from"),
+    created_to: datetime | None = Query(default=None, alias="to"),
+) -> StreamingResponse:
+    """
+    Exporta las muestras de una terminal con sus análisis, en streaming.
+
+    Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Parámetros:
+    - `format`: `csv` (por defecto) o `ndjson`.
+    - `from`, `to`: rango (inclusivo) sobre `created_at`.
+    Respuestas:
+    - 403: permisos insuficientes o sin acceso a la terminal.
+    """
+    terminal_scope.check(terminal_id)
+    statement = sample_export_statement(terminal_id, created_from, created_to)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    filename = f"samples-terminal-{terminal_id}.{export_format}"
+    return StreamingResponse(
+        stream_sample_export(session, statement, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.patch(
@@ -332,6 +658,7 @@ def update_sample(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> SampleRead:
     """
     Actualiza una muestra y sus análisis por ID.
@@ -353,7 +680,7 @@ def update_sample(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Sample has no ID",
         )
-    _check_terminal_access(session, current_user, sample.terminal_id)
+    terminal_scope.check(sample.terminal_id)
 
     update_data = payload.model_dump(exclude_unset=True)
     is_disposal_only = list(update_data.keys()) == ["disposed_at"]
@@ -390,6 +717,7 @@ def update_sample(
         sample.volume = payload.volume
     if payload.retention_days is not None:
         sample.retention_days = payload.retention_days
+        sample.disposal_due_at = disposal_due_at(sample.created_at, payload.retention_days)
     if payload.disposed_at is not None:
         sample.disposed_at = _as_utc(payload.disposed_at)
         if current_user.id is not None:
@@ -566,6 +894,7 @@ def update_sample(
         retention_days=sample.retention_days,
         disposed_at=_as_utc(sample.disposed_at) if sample.disposed_at else None,
         disposed_by_user_id=sample.disposed_by_user_id,
+        disposal_due_at=_as_utc(sample.disposal_due_at) if sample.disposal_due_at else None,
         analyses=[
             SampleAnalysisRead.model_validate(r, from_attributes=True) for r in analyses
         ],
@@ -586,6 +915,7 @@ def delete_sample(
     current_user: User = Depends(
         require_role(UserType.user, UserType.admin, UserType.superadmin)
     ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope),
 ) -> None:
     """
     Elimina una muestra por ID.
@@ -610,7 +940,7 @@ def delete_sample(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Sample has no ID",
         )
-    _check_terminal_access(session, current_user, sample.terminal_id)
+    terminal_scope.check(sample.terminal_id)
 
     max_sequence = session.exec(
         select(func.max(Sample.sequence)).where(
@@ -623,8 +953,6 @@ def delete_sample(
             detail="Only the latest sample can be deleted",
         )
 
-    terminal = session.get(CompanyTerminal, sample.terminal_id)
-
     analyses = session.exec(
         select(SampleAnalysis).where(SampleAnalysis.sample_id == sample_db_id)
     ).all()
@@ -659,8 +987,6 @@ def delete_sample(
 
     session.flush()
     session.delete(sample)
-    if terminal and terminal.next_sample_sequence == sample.sequence + 1:
-        terminal.next_sample_sequence = sample.sequence
-        session.add(terminal)
+    release_sample_sequence(session, sample.terminal_id, sample.sequence)
 
     session.commit()
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security.authorization import require_role_async
+from app.core.security.terminal_scope import TerminalScope, get_terminal_scope_async
+from app.db.session import get_async_session
+from app.models.enums import UserType
+from app.models.upload_job import UploadJob, UploadJobRead
+from app.models.user import User
+
+router = APIRouter(
+    prefix="/upload-jobs",
+    tags=["Upload Jobs"],
+)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=UploadJobRead,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Recurso no encontrado"},
+        status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
+    },
+)
+async def get_upload_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(
+        require_role_async(
+            UserType.visitor, UserType.user, UserType.admin, UserType.superadmin
+        )
+    ),
+    terminal_scope: TerminalScope = Depends(get_terminal_scope_async),
+) -> UploadJobRead:
+    """
+    Estado de una subida encolada (certificado o reporte PDF).
+
+    `status` pasa de `pending` a `processing` y termina en `done`, con la
+    URL en `result_url`, o en `failed`, con el motivo en `last_error`.
+
+    Permisos: `visitor`, `user`, `admin`, `superadmin`.
+    Respuestas:
+    - 403: permisos insuficientes.
+    - 404: trabajo no encontrado.
+    """
+    job = await session.get(UploadJob, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload job not found",
+        )
+    terminal_scope.check(job.terminal_id)
+    return UploadJobRead.model_validate(job)
@@ -1,13 +1,16 @@
 from typing import Any
 
+import anyio
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security.authorization import require_role
-from app.core.security.dependencies import get_current_active_user
+from app.core.security.authorization import require_role, require_role_async
+from app.core.security.dependencies import get_current_active_user, get_current_active_user_async
 from app.core.security.password import hash_password, verify_password
-from app.db.session import get_session
+from app.core.security.user_cache import invalidate_user, revoke_user_tokens
+from app.db.session import get_async_session, get_session
 from app.models.company import Company
 from app.models.company_block import CompanyBlock
 from app.models.company_terminal import CompanyTerminal
@@ -30,7 +33,7 @@ from app.models.user import (
     UserUpdateMe,
 )
 from app.models.user_terminal import UserTerminal
-from app.services.supabase_storage import delete_user_photo, upload_user_photo
+from app.services.storage import delete_user_photo, upload_user_photo
 
 router = APIRouter(
     prefix="/users",
@@ -47,53 +50,101 @@ def _require_id(value: int | None, label: str) -> int:
     return value
 
 
-def _to_user_read_with_company(
+def _load_user_prefetch_data(session: Session, users: list[User]) -> dict[str, Any]:
+    """
+    Compañías y terminales de varios usuarios en consultas constantes.
+    """
+    companies_by_id: dict[int, Company] = {}
+    terminals_by_user_id: dict[int, list[CompanyTerminal]] = {}
+    all_terminals: list[CompanyTerminal] = []
+
+    company_ids = {user.company_id for user in users if user.company_id is not None}
+    if company_ids:
+        companies_by_id = {
+            company.id: company
+            for company in session.exec(
+                select(Company).where(Company.id.in_(company_ids))  # type: ignore[union-attr]
+            ).all()
+            if company.id is not None
+        }
+
+    # Los superadmin ven todas las terminales: se cargan una sola vez.
+    if any(_user_type_value(user.user_type) == UserType.superadmin.value for user in users):
+        all_terminals = [
+            terminal
+            for terminal in session.exec(select(CompanyTerminal)).all()
+            if terminal.id is not None
+        ]
+
+    linked_user_ids = [
+        user.id
+        for user in users
+        if user.id is not None and _user_type_value(user.user_type) != UserType.superadmin.value
+    ]
+    if linked_user_ids:
+        links = session.exec(
+            select(UserTerminal).where(UserTerminal.user_id.in_(linked_user_ids))  # type: ignore[attr-defined]
+        ).all()
+        terminals_by_id = {terminal.id: terminal for terminal in all_terminals}
+        missing_ids = {link.terminal_id for link in links} - terminals_by_id.keys()
+        if missing_ids:
+            terminals_by_id.update(
+                {
+                    terminal.id: terminal
+                    for terminal in session.exec(
+                        select(CompanyTerminal).where(
+                            CompanyTerminal.id.in_(missing_ids)  # type: ignore[union-attr]
+                        )
+                    ).all()
+                }
+            )
+        for link in links:
+            linked_terminal = terminals_by_id.get(link.terminal_id)
+            if linked_terminal is not None and linked_terminal.id is not None:
+                terminals_by_user_id.setdefault(link.user_id, []).append(linked_terminal)
+
+    return {
+        "companies_by_id": companies_by_id,
+        "terminals_by_user_id": terminals_by_user_id,
+        "all_terminals": all_terminals,
+    }
+
+
+def _build_user_read_with_company(
     user: User,
-    session: Session,
+    prefetch_data: dict[str, Any],
 ) -> UserReadWithCompany:
     company_ref = None
     if user.company_id is not None:
-        company = session.get(Company, user.company_id)
+        company = prefetch_data["companies_by_id"].get(user.company_id)
         if company:
             company_ref = CompanyRef(
                 **company.model_dump(
                     include={"id", "name", "company_type", "is_active"}
                 )
             )
-    terminal_refs: list[CompanyTerminalRef] = []
-    terminal_ids: list[int] = []
     if _user_type_value(user.user_type) == UserType.superadmin.value:
-        all_terminals = session.exec(select(CompanyTerminal)).all()
-        for terminal in all_terminals:
-            if terminal.id is None:
-                continue
-            terminal_ids.append(terminal.id)
-            terminal_refs.append(
-                CompanyTerminalRef(
-                    **terminal.model_dump(include={"id", "name", "is_active"})
-                )
-            )
+        terminals = prefetch_data["all_terminals"]
     else:
-        terminal_links = session.exec(
-            select(UserTerminal).where(UserTerminal.user_id == user.id)
-        ).all()
-        for link in terminal_links:
-            linked_terminal = session.get(CompanyTerminal, link.terminal_id)
-            if linked_terminal and linked_terminal.id is not None:
-                terminal_ids.append(linked_terminal.id)
-                terminal_refs.append(
-                    CompanyTerminalRef(
-                        **linked_terminal.model_dump(include={"id", "name", "is_active"})
-                    )
-                )
+        terminals = prefetch_data["terminals_by_user_id"].get(user.id, [])
     return UserReadWithCompany(
         **user.model_dump(),
         company=company_ref,
-        terminals=terminal_refs,
-        terminal_ids=terminal_ids,
+        terminals=[
+            CompanyTerminalRef(**terminal.model_dump(include={"id", "name", "is_active"}))
+            for terminal in terminals
+        ],
+        terminal_ids=[terminal.id for terminal in terminals],
     )
 
 
+def _to_user_read_with_company(
+    user: User,
+    session: Session,
+) -> UserReadWithCompany:
+    return _build_user_read_with_company(user, _load_user_prefetch_data(session, [user]))
+
+
 def _load_terminals(
     session: Session,
     terminal_ids: list[int],
@@ -238,13 +289,12 @@ def list_users(
     if not users:
         return UserListResponse(message="No records found")
     include_set = {item.strip() for item in (include or "").split(",") if item.strip()}
-    items = []
-    for u in users:
-        if include_set:
-            items.append(_to_user_read_with_company(u, session))
-        else:
-            items.append(UserReadWithCompany(**u.model_dump()))
-    return UserListResponse(items=items)
+    if not include_set:
+        return UserListResponse(items=[UserReadWithCompany(**u.model_dump()) for u in users])
+    prefetch_data = _load_user_prefetch_data(session, list(users))
+    return UserListResponse(
+        items=[_build_user_read_with_company(u, prefetch_data) for u in users]
+    )
 
 
 @router.get(
@@ -290,6 +340,7 @@ def update_me(
 
     session.add(current_user)
     session.commit()
+    invalidate_user(current_user.id)
     session.refresh(current_user)
 
     return UserReadWithCompany(**current_user.model_dump())
@@ -327,6 +378,7 @@ def update_my_password(
         )
 
     current_user.password_hash = hash_password(data.new_password)
+    revoke_user_tokens(current_user)
     session.add(current_user)
     session.commit()
 
@@ -417,11 +469,15 @@ def update_user(
                 )
     terminal_ids = update_data.pop("terminal_ids", None)
 
+    if update_data.get("is_active") is False and user.is_active:
+        revoke_user_tokens(user)
+
     for field, value in update_data.items():
         setattr(user, field, value)
 
     session.add(user)
     session.commit()
+    invalidate_user(user.id)
     session.refresh(user)
 
     if terminal_ids is not None:
@@ -437,39 +493,55 @@ def update_user(
                 terminal_id = _require_id(terminal.id, "Terminal")
                 session.add(UserTerminal(user_id=user_id, terminal_id=terminal_id))
         session.commit()
+        invalidate_user(user_id)
 
     return _to_user_read_with_company(user, session)
 
 
+async def _save_user_photo_url(
+    session: AsyncSession, user_id: int, photo_url: str
+) -> UserReadWithCompany:
+    user = await session.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    user.photo_url = photo_url
+    session.add(user)
+    await session.commit()
+    invalidate_user(user_id)
+    await session.refresh(user)
+    return UserReadWithCompany(**user.model_dump())
+
+
 @router.post(
     "/me/photo",
     response_model=UserReadWithCompany,
     status_code=status.HTTP_200_OK,
 )
-def upload_my_photo(
+async def upload_my_photo(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user_async),
 ) -> UserReadWithCompany:
     """
     Sube la foto del usuario autenticado.
 
     Permisos: autenticado.
+    Respuestas:
+    - 400: el archivo no es una imagen.
+    - 413: la imagen supera el tamaño máximo.
     """
     if current_user.id is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="User has no ID",
         )
+    user_id = current_user.id
 
-    photo_url = upload_user_photo(file, current_user.id)
-    current_user.photo_url = photo_url
-
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
-
-    return UserReadWithCompany(**current_user.model_dump())
+    photo_url = await upload_user_photo(file, user_id)
+    return await _save_user_photo_url(session, user_id, photo_url)
 
 
 @router.post(
@@ -481,36 +553,34 @@ def upload_my_photo(
         status.HTTP_403_FORBIDDEN: {"description": "Permisos insuficientes"},
     },
 )
-def upload_photo(
+async def upload_photo(
     user_id: int,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    _: User = Depends(require_role(UserType.admin, UserType.superadmin)),
+    session: AsyncSession = Depends(get_async_session),
+    _: User = Depends(require_role_async(UserType.admin, UserType.superadmin)),
 ) -> UserReadWithCompany:
     """
     Sube la foto de un usuario por ID.
 
     Permisos: `admin` o `superadmin`.
     Respuestas:
+    - 400: el archivo no es una imagen.
     - 403: permisos insuficientes.
     - 404: recurso no encontrado.
+    - 413: la imagen supera el tamaño máximo.
     """
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    # Cierra la transacción de lectura: la subida no retiene la conexión.
+    await session.commit()
 
-    photo_url = upload_user_photo(file, user_id)
-    user.photo_url = photo_url
-
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    return UserReadWithCompany(**user.model_dump())
+    photo_url = await upload_user_photo(file, user_id)
+    return await _save_user_photo_url(session, user_id, photo_url)
 
 
 @router.delete(
@@ -561,6 +631,7 @@ def delete_user(
 
     if _user_has_activity(session, user_id):
         user.is_active = False
+        revoke_user_tokens(user)
         session.add(user)
         session.commit()
         session.refresh(user)
@@ -571,10 +642,12 @@ def delete_user(
         )
 
     if user.photo_url:
-        delete_user_photo(user.photo_url)
+        # Handler síncrono: corre en el threadpool de anyio.
+        anyio.from_thread.run(delete_user_photo, user.photo_url)
 
     session.delete(user)
     session.commit()
+    invalidate_user(user_id)
     return UserDeleteResponse(
         action="deleted",
         message="User deleted successfully.",
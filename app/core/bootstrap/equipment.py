@@ -15,6 +15,7 @@ from app.models.equipment_type import EquipmentType
 from app.models.equipment_type_history import EquipmentTypeHistory
 from app.models.user import User
 from app.utils.emp_weights import get_emp
+from app.utils.equipment_compliance import refresh_equipment_compliance
 from app.utils.measurements.length import Length
 from app.utils.measurements.temperature import Temperature
 from app.utils.measurements.weight import Weight
@@ -186,6 +187,7 @@ def ensure_default_equipment(session: Session) -> None:
                 changed_by_user_id=superadmin.id,
             )
         )
+        refresh_equipment_compliance(session, equipment)
         session.commit()
 
         for spec in data.get("measure_specs", []):
@@ -16,9 +16,31 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str | None = None
-    db_echo: bool = True
-    db_pool_size: int = 5
-    db_max_overflow: int = 10
+    db_echo: bool = False
+    db_pool_size: int = 20
+    db_max_overflow: int = 20
+    # Pool propio del engine async (listados async y worker de subidas)
+    db_async_pool_size: int = 10
+    db_async_max_overflow: int = 5
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    db_query_stats_enabled: bool = True
+    # >0 marca como posible N+1 una sentencia repetida más de N veces por request
+    db_query_repeat_threshold: int = 0
+
+    # Hidrómetro: tabla precalculada de API a 60°F (ver app/utils/hydrometer_table.py)
+    api60f_lookup_enabled: bool = False
+    api60f_table_path: str | None = None
+
+    # Retención de muestras (ver app/utils/sample_retention.py); 0 desactiva el barrido
+    sample_retention_sweep_interval_seconds: int = 0
+    sample_retention_auto_dispose: bool = False
+    sample_retention_batch_size: int = 500
+
+    # Catálogo de tipos de análisis externo (ver app/utils/external_analysis_catalog.py); 0 lo desactiva
+    external_analysis_type_cache_ttl_seconds: int = 300
 
     # SuperAdmin
     superadmin_email: str = "admin@local.dev"
@@ -29,6 +51,23 @@ class Settings(BaseSettings):
     # Security
     secret_key: str = "your-secret-key-change-this-in-production"
     access_token_expire_minutes: int = 60
+    auth_cache_ttl_seconds: int = 30
+    auth_cache_max_entries: int = 1024
+
+    # Archivos subidos (ver app/services/storage.py): "supabase" o "local"
+    storage_backend: str = "supabase"
+    storage_local_root: str = "storage"
+    storage_local_base_url: str = "http://localhost:8080/storage"
+    upload_max_image_bytes: int = 5 * 1024 * 1024
+    upload_max_pdf_bytes: int = 2 * 1024 * 1024
+
+    # Cola de subidas de PDF (ver app/services/upload_queue.py); 0 desactiva el worker del lifespan
+    upload_spool_dir: str = "upload_spool"
+    upload_worker_interval_seconds: int = 5
+    upload_worker_batch_size: int = 20
+    upload_job_max_attempts: int = 5
+    upload_job_retry_delay_seconds: int = 30
+    upload_job_lease_seconds: int = 300
 
     # Supabase Storage
     supabase_url: str | None = None
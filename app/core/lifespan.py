@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
@@ -7,6 +8,9 @@ from app.core.bootstrap import ensure_superadmin_account
 from app.core.config import get_settings
 from app.core.logging import setup_logging
 from app.db import events  # noqa: F401
+from app.services.upload_queue import run_upload_worker
+from app.utils.hydrometer_table import get_api60f_table
+from app.utils.sample_retention import run_sample_retention_sweeper
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -27,6 +31,30 @@ async def lifespan(app: FastAPI):
             logger.exception("❌ Failed to ensure superadmin account")
             raise RuntimeError("Superadmin bootstrap failed") from err
 
+    if settings.api60f_lookup_enabled:
+        get_api60f_table()
+        logger.info("✅ API-60 lookup table loaded")
+
+    retention_sweeper: asyncio.Task | None = None
+    if settings.app_env != "test" and settings.sample_retention_sweep_interval_seconds > 0:
+        retention_sweeper = asyncio.create_task(
+            run_sample_retention_sweeper(settings.sample_retention_sweep_interval_seconds)
+        )
+        logger.info("✅ Sample retention sweeper started")
+
+    upload_worker: asyncio.Task | None = None
+    if settings.app_env != "test" and settings.upload_worker_interval_seconds > 0:
+        upload_worker = asyncio.create_task(
+            run_upload_worker(settings.upload_worker_interval_seconds)
+        )
+        logger.info("✅ Upload worker started")
+
     yield
 
+    for task in (retention_sweeper, upload_worker):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
     logger.info("🛑 Shutting down application")
@@ -0,0 +1,79 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import start_query_stats, stop_query_stats
+
+logger = logging.getLogger("app.db.queries")
+
+
+class QueryStatsMiddleware:
+    """
+    Cuenta las sentencias SQL de cada request y las expone en cabeceras.
+
+    Agrega `X-DB-Queries`, `X-DB-Time-ms` y `Server-Timing`, y registra una
+    línea de log por request. Con `repeat_threshold > 0` marca como posible
+    N+1 cualquier sentencia repetida más de ese número de veces.
+
+    Las sentencias ejecutadas mientras se envía un cuerpo en streaming no
+    llegan a las cabeceras, pero sí a la línea de log.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 0) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_query_stats()
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time-ms"] = f"{stats.total_ms:.1f}"
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"',
+                )
+                repeated = stats.repeated(self.repeat_threshold)
+                if repeated:
+                    headers["X-DB-Repeated-Queries"] = str(len(repeated))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            stop_query_stats(token)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            log_fields = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "db_queries": stats.count,
+                "db_time_ms": round(stats.total_ms, 1),
+                "duration_ms": round(elapsed_ms, 1),
+            }
+            logger.info(
+                "%(method)s %(path)s status=%(status)s db_queries=%(db_queries)s "
+                "db_time_ms=%(db_time_ms)s duration_ms=%(duration_ms)s",
+                log_fields,
+                extra=log_fields,
+            )
+            for statement, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "Possible N+1: %s %s ran the same statement %d times: %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    " ".join(statement.split()),
+                )
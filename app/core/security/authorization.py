@@ -1,10 +1,22 @@
 from fastapi import Depends, HTTPException, status
 
-from app.core.security.dependencies import get_current_active_user
+from app.core.security.dependencies import (
+    get_current_active_user,
+    get_current_active_user_async,
+)
 from app.models.enums import UserType
 from app.models.user import User
 
 
+def _check_role(current_user: User, roles: tuple[UserType, ...]) -> User:
+    if current_user.user_type not in roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return current_user
+
+
 def require_role(*roles: UserType):
     """
     Dependency para restringir acceso por rol.
@@ -17,11 +29,22 @@ def require_role(*roles: UserType):
     def role_checker(
         current_user: User = Depends(get_current_active_user),
     ) -> User:
-        if current_user.user_type not in roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions",
-            )
-        return current_user
+        return _check_role(current_user, roles)
+
+    return role_checker
+
+
+def require_role_async(*roles: UserType):
+    """
+    Igual que `require_role`, para rutas `async def` con `AsyncSession`.
+
+    Uso:
+        Depends(require_role_async(UserType.admin))
+    """
+
+    async def role_checker(
+        current_user: User = Depends(get_current_active_user_async),
+    ) -> User:
+        return _check_role(current_user, roles)
 
     return role_checker
@@ -2,9 +2,17 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import get_settings
-from app.db.session import get_session
+from app.core.security.user_cache import (
+    attach_cached_user,
+    cache_user,
+    get_cached_user,
+    get_user_generation,
+    load_user_terminal_ids,
+)
+from app.db.session import get_async_session, get_session
 from app.models.user import User
 
 settings = get_settings()
@@ -12,16 +20,19 @@ settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session),
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _decode_access_token(token: str) -> tuple[int, int]:
+    """
+    Devuelve `(user_id, token_version)` del access token.
+    """
+    credentials_exception = _credentials_exception()
     try:
         payload = jwt.decode(
             token,
@@ -35,24 +46,73 @@ def get_current_user(
         user_id_int = int(user_id)
     except (JWTError, ValueError):
         raise credentials_exception from None
+    return user_id_int, token_version
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_session),
+) -> User:
+    user_id_int, token_version = _decode_access_token(token)
+
+    cached = get_cached_user(user_id_int, token_version)
+    if cached is not None:
+        return attach_cached_user(session, cached)
 
+    generation = get_user_generation(user_id_int)
     statement = select(User).where(User.id == user_id_int)
     user = session.exec(statement).first()
 
-    if not user:
-        raise credentials_exception
-    if user.token_version != token_version:
-        raise credentials_exception
+    if not user or user.token_version != token_version:
+        raise _credentials_exception()
 
+    cache_user(user, load_user_terminal_ids(session, user_id_int), generation)
     return user
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user),
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session),
 ) -> User:
+    """
+    Variante de `get_current_user` para rutas `async def`: usa la misma
+    `AsyncSession` de la request, así que no pasa por el threadpool ni
+    toma una conexión del pool sync.
+    """
+    user_id_int, token_version = _decode_access_token(token)
+
+    cached = get_cached_user(user_id_int, token_version)
+    if cached is not None:
+        return attach_cached_user(session.sync_session, cached)
+
+    generation = get_user_generation(user_id_int)
+    statement = select(User).where(User.id == user_id_int)
+    user = (await session.exec(statement)).first()
+
+    if not user or user.token_version != token_version:
+        raise _credentials_exception()
+
+    terminal_ids = await session.run_sync(load_user_terminal_ids, user_id_int)
+    cache_user(user, terminal_ids, generation)
+    return user
+
+
+def _ensure_active(current_user: User) -> User:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
     return current_user
+
+
+def get_current_active_user(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    return _ensure_active(current_user)
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    return _ensure_active(current_user)
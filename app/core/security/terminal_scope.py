@@ -0,0 +1,90 @@
+from collections.abc import Iterable
+from typing import Any, TypeVar
+
+from fastapi import Depends, HTTPException, status
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security.dependencies import (
+    get_current_active_user,
+    get_current_active_user_async,
+)
+from app.core.security.user_cache import get_user_terminal_ids
+from app.db.session import get_async_session, get_session
+from app.models.enums import UserType
+from app.models.user import User
+
+StatementT = TypeVar("StatementT")
+
+
+class TerminalScope:
+    """
+    Terminales visibles para el usuario de la request.
+
+    Un conjunto vacío significa acceso sin restricción: `superadmin` o
+    usuarios sin terminales asignadas.
+    """
+
+    def __init__(self, user: User, terminal_ids: Iterable[int] = ()) -> None:
+        self.user = user
+        self.terminal_ids: frozenset[int] = frozenset(terminal_ids)
+
+    @property
+    def is_restricted(self) -> bool:
+        return bool(self.terminal_ids)
+
+    def has_access(self, terminal_id: int | None) -> bool:
+        return not self.terminal_ids or terminal_id in self.terminal_ids
+
+    def check(self, terminal_id: int | None) -> None:
+        if not self.has_access(terminal_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have access to this terminal",
+            )
+
+    def apply(self, statement: StatementT, column: Any) -> StatementT:
+        """
+        Restringe `statement` a las terminales visibles filtrando por `column`.
+        """
+        if not self.terminal_ids:
+            return statement
+        return statement.where(column.in_(sorted(self.terminal_ids)))  # type: ignore[attr-defined]
+
+
+def resolve_terminal_scope(session: Session, user: User) -> TerminalScope:
+    if user.user_type == UserType.superadmin:
+        return TerminalScope(user)
+    return TerminalScope(user, get_user_terminal_ids(session, user))
+
+
+async def resolve_terminal_scope_async(session: AsyncSession, user: User) -> TerminalScope:
+    if user.user_type == UserType.superadmin:
+        return TerminalScope(user)
+    return TerminalScope(user, await session.run_sync(get_user_terminal_ids, user))
+
+
+def get_terminal_scope(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+) -> TerminalScope:
+    """
+    Dependency que resuelve una sola vez por request las terminales del usuario.
+
+    Uso:
+        terminal_scope: TerminalScope = Depends(get_terminal_scope)
+    """
+    return resolve_terminal_scope(session, current_user)
+
+
+async def get_terminal_scope_async(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user_async),
+) -> TerminalScope:
+    """
+    Igual que `get_terminal_scope`, para rutas `async def` con `AsyncSession`.
+
+    Uso:
+        terminal_scope: TerminalScope = Depends(get_terminal_scope_async)
+    """
+    return await resolve_terminal_scope_async(session, current_user)
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.models.user import User
+from app.models.user_terminal import UserTerminal
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    data: dict[str, Any]
+    terminal_ids: tuple[int, ...]
+    expires_at: float
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[tuple[int, int], CachedUser]" = OrderedDict()
+# Se incrementa en cada invalidación para descartar cargas concurrentes
+# que leyeron el usuario antes del cambio.
+_generations: dict[int, int] = {}
+# Clave de `Session.info` con los usuarios a invalidar al hacer commit.
+_PENDING_INVALIDATIONS = "user_cache_pending_invalidations"
+
+
+def _enabled() -> bool:
+    return settings.auth_cache_ttl_seconds > 0 and settings.auth_cache_max_entries > 0
+
+
+def get_user_generation(user_id: int) -> int:
+    with _lock:
+        return _generations.get(user_id, 0)
+
+
+def get_cached_user(user_id: int, token_version: int) -> CachedUser | None:
+    if not _enabled():
+        return None
+    key = (user_id, token_version)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del _entries[key]
+            return None
+        _entries.move_to_end(key)
+        return entry
+
+
+def cache_user(user: User, terminal_ids: list[int], generation: int) -> None:
+    if not _enabled() or user.id is None:
+        return
+    entry = CachedUser(
+        data=user.model_dump(),
+        terminal_ids=tuple(terminal_ids),
+        expires_at=time.monotonic() + settings.auth_cache_ttl_seconds,
+    )
+    with _lock:
+        if _generations.get(user.id, 0) != generation:
+            return
+        _entries[(user.id, user.token_version)] = entry
+        _entries.move_to_end((user.id, user.token_version))
+        while len(_entries) > settings.auth_cache_max_entries:
+            _entries.popitem(last=False)
+
+
+def invalidate_user(user_id: int | None) -> None:
+    if user_id is None:
+        return
+    with _lock:
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+        for key in [key for key in _entries if key[0] == user_id]:
+            del _entries[key]
+
+
+def clear_user_cache() -> None:
+    with _lock:
+        _entries.clear()
+        _generations.clear()
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed_users(session: OrmSession) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_pending_invalidations(session: OrmSession) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+def revoke_user_tokens(user: User) -> None:
+    """
+    Invalida todos los access tokens emitidos para el usuario.
+
+    Incrementa `token_version`; el cambio se persiste con el commit de la
+    sesión del llamador y la entrada cacheada se descarta después de ese
+    commit. Invalidar antes dejaría que una request concurrente volviera a
+    cachear el `token_version` anterior hasta que venza el TTL.
+    """
+    user.token_version += 1
+    session = object_session(user)
+    if session is None or user.id is None:
+        invalidate_user(user.id)
+        return
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(user.id)
+
+
+def attach_cached_user(session: Session, entry: CachedUser) -> User:
+    """
+    Devuelve el usuario cacheado asociado a la sesión sin ejecutar SQL.
+    """
+    identity_key = session.identity_key(User, entry.data["id"])
+    existing = session.identity_map.get(identity_key)
+    if existing is not None:
+        return existing  # type: ignore[return-value]
+    user = User(**entry.data)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
+
+def load_user_terminal_ids(session: Session, user_id: int) -> list[int]:
+    return list(
+        session.exec(
+            select(UserTerminal.terminal_id).where(UserTerminal.user_id == user_id)
+        ).all()
+    )
+
+
+def get_user_terminal_ids(session: Session, user: User) -> list[int]:
+    """
+    Terminales asignadas al usuario, desde la caché de autenticación si existe.
+    """
+    if user.id is None:
+        return []
+    entry = get_cached_user(user.id, user.token_version)
+    if entry is not None:
+        return list(entry.terminal_ids)
+    return load_user_terminal_ids(session, user.id)
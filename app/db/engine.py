@@ -1,13 +1,85 @@
+from typing import Any
+
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
 
 if not settings.database_url:
     raise RuntimeError("DATABASE_URL is not set. Check your .env file.")
 
+
+def _async_database_url(database_url: str) -> URL:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def _engine_options(
+    settings: Settings,
+    database_url: str,
+    *,
+    is_async: bool = False,
+) -> dict[str, Any]:
+    url = make_url(database_url)
+    pool_size = settings.db_async_pool_size if is_async else settings.db_pool_size
+    max_overflow = settings.db_async_max_overflow if is_async else settings.db_max_overflow
+    options: dict[str, Any] = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.get_backend_name() == "sqlite":
+        # SQLite en memoria usa SingletonThreadPool, que no acepta tamaño de pool.
+        if url.database not in (None, "", ":memory:"):
+            options["pool_size"] = pool_size
+            options["max_overflow"] = max_overflow
+            options["pool_timeout"] = settings.db_pool_timeout
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    options["pool_size"] = pool_size
+    options["max_overflow"] = max_overflow
+    options["pool_timeout"] = settings.db_pool_timeout
+    options["pool_recycle"] = settings.db_pool_recycle
+    if url.get_backend_name() == "postgresql" and settings.db_statement_timeout_ms > 0:
+        timeout = str(settings.db_statement_timeout_ms)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
 engine = create_engine(
     settings.database_url,
-    echo=settings.db_echo,
+    **_engine_options(settings, settings.database_url),
+)
+
+async_engine: AsyncEngine = create_async_engine(
+    _async_database_url(settings.database_url),
+    **_engine_options(settings, settings.database_url, is_async=True),
 )
+
+
+def get_pool_status(bind: Engine | AsyncEngine = engine) -> dict[str, Any]:
+    pool = bind.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    is_async = isinstance(bind, AsyncEngine)
+    checked_out = pool.checkedout()
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": settings.db_async_max_overflow if is_async else settings.db_max_overflow,
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
@@ -0,0 +1,73 @@
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_START_ATTR = "_query_stats_started_at"
+
+
+@dataclass
+class QueryStats:
+    """
+    Sentencias SQL ejecutadas durante una request.
+    """
+
+    count: int = 0
+    total_ms: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Sentencias que se repiten más de `threshold` veces (posible N+1).
+        """
+        if threshold <= 0:
+            return []
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count > threshold
+        ]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats",
+    default=None,
+)
+
+
+def start_query_stats() -> tuple[QueryStats, Token[QueryStats | None]]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_stats(token: Token[QueryStats | None]) -> None:
+    _current_stats.reset(token)
+
+
+def get_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+# Se registran sobre la clase Engine: cubren el engine sync, el async
+# (que ejecuta sobre su sync_engine) y los engines creados en tests.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started_at = getattr(context, _START_ATTR, None)
+    if stats is None or started_at is None:
+        return
+    stats.record(statement, (time.perf_counter() - started_at) * 1000)
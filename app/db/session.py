@@ -1,9 +1,11 @@
+from collections.abc import AsyncIterator
 from typing import Annotated
 
 from fastapi import Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db.engine import engine
+from app.db.engine import async_engine, engine
 
 
 def get_session():
@@ -11,4 +13,10 @@ def get_session():
         yield session
 
 
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDependency = Annotated[Session, Depends(get_session)]
+AsyncSessionDependency = Annotated[AsyncSession, Depends(get_async_session)]
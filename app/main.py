@@ -1,9 +1,18 @@
-from fastapi import FastAPI
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.v1.api import api_router
 from app.core.config import get_settings
 from app.core.lifespan import lifespan
+from app.core.middleware import QueryStatsMiddleware
+from app.db.engine import async_engine, engine, get_pool_status
 
 settings = get_settings()
 
@@ -21,12 +30,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.db_query_stats_enabled:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        repeat_threshold=settings.db_query_repeat_threshold,
+    )
+
 app.include_router(
     api_router,
     prefix="/api/v1",
 )
 
+if settings.storage_backend == "local":
+    # Sin Supabase los archivos subidos se sirven desde el disco local.
+    Path(settings.storage_local_root).mkdir(parents=True, exist_ok=True)
+    app.mount(
+        urlparse(settings.storage_local_base_url).path.rstrip("/"),
+        StaticFiles(directory=settings.storage_local_root),
+        name="storage",
+    )
+
 
 @app.get("/", tags=["Health"])
 async def root() -> dict[str, str]:
     return {"message": "Hello FastAPI"}
+
+
+@app.get("/health/db", tags=["Health"])
+def health_db() -> dict[str, Any]:
+    """
+    Verifica la conexión a la base de datos y reporta el estado del pool
+    sync y, en `async_pool`, el del engine async.
+
+    Respuestas:
+    - 503: la base de datos no responde.
+    """
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except SQLAlchemyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable",
+        ) from exc
+    return {
+        "status": "ok",
+        **get_pool_status(engine),
+        "async_pool": get_pool_status(async_engine),
+    }
@@ -3,6 +3,7 @@ from .company_block import CompanyBlock
 from .company_terminal import CompanyTerminal
 from .equipment import Equipment
 from .equipment_calibration import EquipmentCalibration, EquipmentCalibrationResult
+from .equipment_compliance import EquipmentCompliance
 from .equipment_history import EquipmentHistoryEntry
 from .equipment_inspection import EquipmentInspection, EquipmentInspectionResponse
 from .equipment_measure_spec import EquipmentMeasureSpec
@@ -20,5 +21,7 @@ from .external_analysis_terminal import ExternalAnalysisTerminal
 from .external_analysis_type import ExternalAnalysisType
 from .sample import Sample, SampleAnalysis, SampleAnalysisHistory
 from .terminal_product_type import TerminalProduct, TerminalProductType
+from .terminal_sample_counter import TerminalSampleCounter
+from .upload_job import UploadJob
 from .user import User
 from .user_terminal import UserTerminal
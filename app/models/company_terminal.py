@@ -27,7 +27,6 @@ class CompanyTerminalBase(SQLModel):
 class CompanyTerminal(AuditMixin, CompanyTerminalBase, table=True):
     __tablename__ = "company_terminal"
     id: int | None = Field(default=None, primary_key=True)
-    next_sample_sequence: int = Field(default=1, nullable=False)
 
 
 class CompanyTerminalCreate(SQLModel):
@@ -117,6 +116,7 @@ class CompanyTerminalReadWithIncludes(CompanyTerminalRead):
 class CompanyTerminalListResponse(SQLModel):
     items: list[CompanyTerminalReadWithIncludes] = Field(default_factory=list)
     message: str | None = None
+    next_cursor: str | None = None
 
 
 class CompanyTerminalDeleteResponse(SQLModel):
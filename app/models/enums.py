@@ -40,6 +40,12 @@ class EquipmentStatus(StrEnum):
     unknown = "unknown"
 
 
+class ComplianceType(StrEnum):
+    calibration = "calibration"
+    inspection = "inspection"
+    verification = "verification"
+
+
 class InspectionResponseType(StrEnum):
     boolean = "boolean"
     text = "text"
@@ -55,3 +61,15 @@ class ProductType(StrEnum):
     crudo = "crudo"
     diesel = "diesel"
     gasolina = "gasolina"
+
+
+class UploadJobKind(StrEnum):
+    calibration_certificate = "calibration_certificate"
+    external_analysis_report = "external_analysis_report"
+
+
+class UploadJobStatus(StrEnum):
+    pending = "pending"
+    processing = "processing"
+    done = "done"
+    failed = "failed"
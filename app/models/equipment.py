@@ -146,6 +146,7 @@ class EquipmentReadWithIncludes(EquipmentRead):
 class EquipmentListResponse(SQLModel):
     items: list[EquipmentReadWithIncludes] = Field(default_factory=list)
     message: str | None = None
+    next_cursor: str | None = None
 
 
 class EquipmentDeleteResponse(SQLModel):
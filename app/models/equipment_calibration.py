@@ -1,10 +1,17 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class EquipmentCalibration(SQLModel, table=True):
     __tablename__ = "equipment_calibration"
+    __table_args__ = (
+        Index(
+            "ix_equipment_calibration_equipment_calibrated",
+            "equipment_id",
+            "calibrated_at",
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     equipment_id: int = Field(foreign_key="equipment.id")
     calibrated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -18,7 +25,7 @@ class EquipmentCalibration(SQLModel, table=True):
 class EquipmentCalibrationResult(SQLModel, table=True):
     __tablename__ = "equipment_calibration_result"
     id: int | None = Field(default=None, primary_key=True)
-    calibration_id: int = Field(foreign_key="equipment_calibration.id")
+    calibration_id: int = Field(foreign_key="equipment_calibration.id", index=True)
     point_label: str | None = None
     reference_value: float | None = None
     measured_value: float | None = None
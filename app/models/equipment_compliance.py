@@ -0,0 +1,47 @@
+from datetime import UTC, datetime
+
+from sqlmodel import Field, Index, SQLModel
+
+from app.models.enums import ComplianceType
+
+
+class EquipmentCompliance(SQLModel, table=True):
+    __tablename__ = "equipment_compliance"
+    __table_args__ = (
+        Index("ix_equipment_compliance_terminal_due", "terminal_id", "next_due_at"),
+        Index("ix_equipment_compliance_next_due_at", "next_due_at"),
+    )
+    id: int | None = Field(default=None, primary_key=True)
+    equipment_id: int = Field(foreign_key="equipment.id", index=True)
+    terminal_id: int = Field(foreign_key="company_terminal.id")
+    compliance_type: ComplianceType
+    verification_type_id: int | None = Field(
+        default=None,
+        foreign_key="equipment_type_verification.id",
+    )
+    frequency_days: int = Field(default=0, ge=0)
+    last_performed_at: datetime | None = Field(
+        default=None,
+        description="Last calibration/inspection/verification (UTC).",
+    )
+    next_due_at: datetime | None = Field(
+        default=None,
+        description="Next due date (UTC). Null when there is no expiry.",
+    )
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class EquipmentComplianceRead(SQLModel):
+    equipment_id: int
+    terminal_id: int
+    compliance_type: ComplianceType
+    verification_type_id: int | None
+    frequency_days: int
+    last_performed_at: datetime | None
+    next_due_at: datetime | None
+    is_overdue: bool = False
+
+
+class EquipmentComplianceListResponse(SQLModel):
+    items: list[EquipmentComplianceRead] = Field(default_factory=list)
+    message: str | None = None
@@ -1,12 +1,19 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 from app.models.enums import InspectionResponseType
 
 
 class EquipmentInspection(SQLModel, table=True):
     __tablename__ = "equipment_inspection"
+    __table_args__ = (
+        Index(
+            "ix_equipment_inspection_equipment_inspected",
+            "equipment_id",
+            "inspected_at",
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     equipment_id: int = Field(foreign_key="equipment.id")
     inspected_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -18,7 +25,7 @@ class EquipmentInspection(SQLModel, table=True):
 class EquipmentInspectionResponse(SQLModel, table=True):
     __tablename__ = "equipment_inspection_response"
     id: int | None = Field(default=None, primary_key=True)
-    inspection_id: int = Field(foreign_key="equipment_inspection.id")
+    inspection_id: int = Field(foreign_key="equipment_inspection.id", index=True)
     inspection_item_id: int = Field(foreign_key="equipment_type_inspection_item.id")
     response_type: InspectionResponseType
     value_bool: bool | None = None
@@ -72,3 +79,4 @@ class EquipmentInspectionRead(SQLModel):
 class EquipmentInspectionListResponse(SQLModel):
     items: list[EquipmentInspectionRead] = Field(default_factory=list)
     message: str | None = None
+    next_cursor: str | None = None
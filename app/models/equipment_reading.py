@@ -1,10 +1,13 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class EquipmentReading(SQLModel, table=True):
     __tablename__ = "equipment_reading"
+    __table_args__ = (
+        Index("ix_equipment_reading_equipment_measured", "equipment_id", "measured_at"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     equipment_id: int = Field(foreign_key="equipment.id")
     value_celsius: float = Field(description="Temperature in Celsius")
@@ -1,12 +1,19 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 from app.models.enums import EquipmentStatus
 
 
 class EquipmentStatusHistory(SQLModel, table=True):
     __tablename__ = "equipment_status_history"
+    __table_args__ = (
+        Index(
+            "ix_equipment_status_history_equipment_ended",
+            "equipment_id",
+            "ended_at",
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     equipment_id: int = Field(foreign_key="equipment.id")
     status: EquipmentStatus = Field(description="Equipment status")
@@ -1,10 +1,17 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class EquipmentTypeHistory(SQLModel, table=True):
     __tablename__ = "equipment_type_history"
+    __table_args__ = (
+        Index(
+            "ix_equipment_type_history_equipment_ended",
+            "equipment_id",
+            "ended_at",
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     equipment_id: int = Field(foreign_key="equipment.id")
     equipment_type_id: int = Field(foreign_key="equipment_type.id")
@@ -1,12 +1,25 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 from app.models.enums import InspectionResponseType
 
 
 class EquipmentVerification(SQLModel, table=True):
     __tablename__ = "equipment_verification"
+    __table_args__ = (
+        Index(
+            "ix_equipment_verification_equipment_type_verified",
+            "equipment_id",
+            "verification_type_id",
+            "verified_at",
+        ),
+        Index(
+            "ix_equipment_verification_equipment_verified",
+            "equipment_id",
+            "verified_at",
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     equipment_id: int = Field(foreign_key="equipment.id")
     verification_type_id: int = Field(foreign_key="equipment_type_verification.id")
@@ -19,7 +32,7 @@ class EquipmentVerification(SQLModel, table=True):
 class EquipmentVerificationResponse(SQLModel, table=True):
     __tablename__ = "equipment_verification_response"
     id: int | None = Field(default=None, primary_key=True)
-    verification_id: int = Field(foreign_key="equipment_verification.id")
+    verification_id: int = Field(foreign_key="equipment_verification.id", index=True)
     verification_item_id: int = Field(foreign_key="equipment_type_verification_item.id")
     response_type: InspectionResponseType
     value_bool: bool | None = None
@@ -118,3 +131,4 @@ class EquipmentVerificationRead(SQLModel):
 class EquipmentVerificationListResponse(SQLModel):
     items: list[EquipmentVerificationRead] = Field(default_factory=list)
     message: str | None = None
+    next_cursor: str | None = None
@@ -1,12 +1,26 @@
 from datetime import UTC, datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 from app.models.mixins.audit import AuditMixin
 
 
 class ExternalAnalysisRecord(AuditMixin, SQLModel, table=True):
     __tablename__ = "external_analysis_record"
+    __table_args__ = (
+        Index(
+            "ix_external_analysis_record_terminal_type_performed",
+            "terminal_id",
+            "analysis_type_id",
+            "performed_at",
+        ),
+        Index(
+            "ix_external_analysis_record_terminal_performed_id",
+            "terminal_id",
+            "performed_at",
+            "id",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     terminal_id: int = Field(foreign_key="company_terminal.id")
@@ -68,3 +82,4 @@ class ExternalAnalysisRecordRead(SQLModel):
 class ExternalAnalysisRecordListResponse(SQLModel):
     items: list[ExternalAnalysisRecordRead] = Field(default_factory=list)
     message: str | None = None
+    next_cursor: str | None = None
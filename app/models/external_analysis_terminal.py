@@ -48,3 +48,20 @@ class ExternalAnalysisTerminalRead(SQLModel):
 class ExternalAnalysisTerminalListResponse(SQLModel):
     items: list[ExternalAnalysisTerminalRead] = Field(default_factory=list)
     message: str | None = None
+
+
+class ExternalAnalysisDueRead(SQLModel):
+    terminal_id: int
+    terminal_name: str
+    analysis_type_id: int
+    analysis_type_name: str
+    frequency_days: int
+    last_performed_at: datetime | None = None
+    next_due_at: datetime | None = None
+    is_overdue: bool
+
+
+class ExternalAnalysisDueListResponse(SQLModel):
+    items: list[ExternalAnalysisDueRead] = Field(default_factory=list)
+    message: str | None = None
+    next_cursor: str | None = None
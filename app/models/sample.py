@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from sqlmodel import Field, SQLModel
+from sqlalchemy import text
+from sqlmodel import Field, Index, SQLModel
 
 from app.models.enums import SampleAnalysisType
 from app.models.mixins.audit import AuditMixin
@@ -26,7 +27,20 @@ class SampleBase(SQLModel):
 
 class Sample(AuditMixin, SampleBase, table=True):
     __tablename__ = "sample"
+    __table_args__ = (
+        Index("ix_sample_terminal_created_id", "terminal_id", "created_at", "id"),
+        # Solo muestras pendientes: el barrido de retención no recorre las ya dispuestas.
+        Index(
+            "ix_sample_disposal_due_pending",
+            "disposal_due_at",
+            "id",
+            postgresql_where=text("disposed_at IS NULL"),
+            sqlite_where=text("disposed_at IS NULL"),
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
+    # `created_at + retention_days`; se mantiene al crear y al cambiar la retención.
+    disposal_due_at: datetime | None = None
 
 
 class SampleAnalysisBase(SQLModel):
@@ -50,6 +64,7 @@ class SampleAnalysisBase(SQLModel):
 
 class SampleAnalysis(AuditMixin, SampleAnalysisBase, table=True):
     __tablename__ = "sample_analysis"
+    __table_args__ = (Index("ix_sample_analysis_sample_id", "sample_id"),)
     id: int | None = Field(default=None, primary_key=True)
 
 
@@ -105,6 +120,10 @@ class SampleCreate(SQLModel):
     retention_days: int | None = None
 
 
+class SampleBatchCreate(SQLModel):
+    items: list[SampleCreate] = Field(min_length=1, max_length=500)
+
+
 class SampleAnalysisUpdate(SQLModel):
     id: int | None = None
     analysis_type: SampleAnalysisType
@@ -175,9 +194,15 @@ class SampleRead(SQLModel):
     retention_days: int | None = None
     disposed_at: datetime | None = None
     disposed_by_user_id: int | None = None
+    disposal_due_at: datetime | None = None
     analyses: list[SampleAnalysisRead] = Field(default_factory=list)
 
 
 class SampleListResponse(SQLModel):
     items: list[SampleRead] = Field(default_factory=list)
     message: str | None = None
+    next_cursor: str | None = None
+
+
+class SampleBatchResponse(SQLModel):
+    items: list[SampleRead] = Field(default_factory=list)
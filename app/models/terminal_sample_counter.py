@@ -0,0 +1,14 @@
+from sqlmodel import Field, SQLModel
+
+
+class TerminalSampleCounter(SQLModel, table=True):
+    """
+    Próximo consecutivo de muestra por terminal.
+
+    Tabla separada de `company_terminal` para que la asignación de códigos
+    no bloquee la fila de la terminal; ver `app.utils.sample_sequence`.
+    """
+
+    __tablename__ = "terminal_sample_counter"
+    terminal_id: int = Field(foreign_key="company_terminal.id", primary_key=True)
+    next_sequence: int = Field(default=1, nullable=False)
@@ -0,0 +1,51 @@
+from datetime import UTC, datetime
+
+from sqlmodel import Field, Index, SQLModel
+
+from app.models.enums import UploadJobKind, UploadJobStatus
+from app.models.mixins.audit import AuditMixin
+
+
+class UploadJob(AuditMixin, SQLModel, table=True):
+    """
+    Subida de PDF pendiente de enviar al almacenamiento.
+
+    Se registra antes de responder (write-ahead): el archivo queda en el
+    spool local y el worker de `app.services.upload_queue` lo sube y fija la
+    URL en el registro destino (`kind`, `target_id`).
+    """
+
+    __tablename__ = "upload_job"
+    __table_args__ = (
+        Index("ix_upload_job_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_upload_job_kind_target", "kind", "target_id"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    kind: UploadJobKind
+    target_id: int
+    terminal_id: int = Field(foreign_key="company_terminal.id")
+    storage_path: str
+    spool_path: str
+    content_type: str
+    status: UploadJobStatus = Field(default=UploadJobStatus.pending)
+    attempts: int = Field(default=0, ge=0)
+    next_attempt_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    locked_until: datetime | None = None
+    last_error: str | None = None
+    result_url: str | None = None
+    created_by_user_id: int = Field(foreign_key="user.id")
+
+
+class UploadJobRead(SQLModel):
+    id: int
+    kind: UploadJobKind
+    target_id: int
+    terminal_id: int
+    status: UploadJobStatus
+    attempts: int
+    next_attempt_at: datetime
+    last_error: str | None
+    result_url: str | None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,226 @@
+"""
+Almacenamiento de archivos subidos (fotos, certificados y reportes PDF).
+
+`STORAGE_BACKEND` elige el backend: `supabase` (por defecto) o `local`, que
+guarda bajo `STORAGE_LOCAL_ROOT` y sirve los archivos en
+`STORAGE_LOCAL_BASE_URL`; sirve para tests y despliegues sin Supabase.
+
+Las subidas son asíncronas y leen el `UploadFile` (ya volcado a disco por
+Starlette) por trozos: el tamaño se valida antes de leer y el archivo nunca
+se carga entero en memoria. Los endpoints cierran su transacción antes de
+subir, así que una subida lenta no retiene conexiones del pool.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import quote, unquote
+
+import anyio
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.config import get_settings
+from app.services.supabase_storage import SupabaseStorage
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class StorageBackend(Protocol):
+    async def upload(
+        self, path: str, chunks: AsyncIterable[bytes], content_type: str
+    ) -> str:
+        """Guarda `chunks` en `path` (reemplazando) y devuelve la URL pública."""
+        ...
+
+    async def delete(self, path: str) -> None: ...
+
+    def path_from_url(self, url: str) -> str | None: ...
+
+
+class LocalStorage:
+    """
+    Backend en disco local; los archivos se escriben con reemplazo atómico.
+    """
+
+    def __init__(self, root: str | Path, base_url: str) -> None:
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+
+    def _target(self, path: str) -> Path:
+        target = (self.root / path).resolve()
+        if not target.is_relative_to(self.root):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid storage path",
+            )
+        return target
+
+    def public_url(self, path: str) -> str:
+        return f"{self.base_url}/{quote(path)}"
+
+    def path_from_url(self, url: str) -> str | None:
+        prefix = f"{self.base_url}/"
+        if not url.startswith(prefix):
+            return None
+        return unquote(url[len(prefix) :])
+
+    async def upload(
+        self, path: str, chunks: AsyncIterable[bytes], content_type: str
+    ) -> str:
+        target = self._target(path)
+        await anyio.Path(target.parent).mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as handle:
+                async for chunk in chunks:
+                    await handle.write(chunk)
+            await anyio.to_thread.run_sync(os.replace, tmp_path, target)
+        except BaseException:
+            await anyio.Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return self.public_url(path)
+
+    async def delete(self, path: str) -> None:
+        await anyio.Path(self._target(path)).unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    settings = get_settings()
+    if settings.storage_backend == "local":
+        return LocalStorage(settings.storage_local_root, settings.storage_local_base_url)
+    if not settings.supabase_url or not settings.supabase_service_role_key:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Supabase storage is not configured",
+        )
+    if not settings.supabase_storage_bucket:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Supabase storage bucket is not configured",
+        )
+    return SupabaseStorage(
+        settings.supabase_url,
+        settings.supabase_service_role_key,
+        settings.supabase_storage_bucket,
+    )
+
+
+def _size_limit_error(label: str, max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"{label} no debe superar {max_bytes // (1024 * 1024)}MB.",
+    )
+
+
+def check_upload_size(file: UploadFile, max_bytes: int, label: str) -> None:
+    """
+    Rechaza el archivo por su tamaño declarado, antes de leerlo.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _size_limit_error(label, max_bytes)
+
+
+async def iter_upload(
+    file: UploadFile, max_bytes: int, label: str
+) -> AsyncIterator[bytes]:
+    """
+    Lee `file` por trozos desde el inicio; corta si supera `max_bytes`
+    aunque el tamaño no viniera declarado.
+    """
+    await file.seek(0)
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise _size_limit_error(label, max_bytes)
+        yield chunk
+
+
+def _is_pdf(file: UploadFile) -> bool:
+    content_type = (file.content_type or "").lower()
+    filename = (file.filename or "").lower()
+    return content_type == "application/pdf" or filename.endswith(".pdf")
+
+
+def validate_pdf_upload(file: UploadFile) -> None:
+    check_upload_size(file, get_settings().upload_max_pdf_bytes, "El PDF")
+    if not _is_pdf(file):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid PDF file",
+        )
+
+
+async def _upload_pdf(file: UploadFile, path: str) -> str:
+    validate_pdf_upload(file)
+    chunks = iter_upload(file, get_settings().upload_max_pdf_bytes, "El PDF")
+    return await get_storage().upload(path, chunks, "application/pdf")
+
+
+def _safe_segment(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value.strip())
+
+
+async def upload_user_photo(file: UploadFile, user_id: int) -> str:
+    if not file.content_type or not file.content_type.startswith("image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image file",
+        )
+    max_bytes = get_settings().upload_max_image_bytes
+    check_upload_size(file, max_bytes, "La imagen")
+    extension = f".{_safe_segment(file.content_type.split('/')[-1])}"
+    path = f"profile_pictures/{user_id}/avatar{extension}"
+    chunks = iter_upload(file, max_bytes, "La imagen")
+    return await get_storage().upload(path, chunks, file.content_type)
+
+
+def calibration_certificate_path(
+    calibration_id: int,
+    equipment_serial: str | None = None,
+    equipment_type_name: str | None = None,
+    calibrated_at: datetime | None = None,
+) -> str:
+    safe_type = _safe_segment(equipment_type_name or "Equipo")
+    safe_serial = _safe_segment(equipment_serial or f"CAL-{calibration_id}")
+    date_segment = calibrated_at.strftime("%Y%m%d") if calibrated_at else "sin-fecha"
+    filename = f"{safe_type} - {safe_serial} - {date_segment}.pdf"
+    return f"calibration_certificates/{calibration_id}/{filename}"
+
+
+async def upload_calibration_certificate(
+    file: UploadFile,
+    calibration_id: int,
+    equipment_serial: str | None = None,
+    equipment_type_name: str | None = None,
+    calibrated_at: datetime | None = None,
+) -> str:
+    path = calibration_certificate_path(
+        calibration_id, equipment_serial, equipment_type_name, calibrated_at
+    )
+    return await _upload_pdf(file, path)
+
+
+def external_analysis_report_path(record_id: int) -> str:
+    return f"external_analysis_reports/{record_id}/report.pdf"
+
+
+async def upload_external_analysis_report(file: UploadFile, record_id: int) -> str:
+    return await _upload_pdf(file, external_analysis_report_path(record_id))
+
+
+async def delete_user_photo(photo_url: str) -> None:
+    if not photo_url:
+        return
+    storage = get_storage()
+    path = storage.path_from_url(photo_url)
+    if path:
+        await storage.delete(path)
@@ -0,0 +1,406 @@
+"""
+Cola de subidas de PDF (certificados de calibración y reportes externos).
+
+El endpoint valida el PDF, lo copia al spool local (`UPLOAD_SPOOL_DIR`) y
+registra un `upload_job` antes de responder 202, así que la respuesta no
+depende del almacenamiento remoto. El worker sube el archivo con reintentos
+(`UPLOAD_JOB_MAX_ATTEMPTS`, espera exponencial desde
+`UPLOAD_JOB_RETRY_DELAY_SECONDS`) y al terminar fija `certificate_pdf_url`
+o `report_pdf_url` en el registro destino.
+
+El worker corre dentro del proceso desde el lifespan
+(`UPLOAD_WORKER_INTERVAL_SECONDS` > 0) o como comando:
+`python -m app.services.upload_queue [--once] [--batch-size N]`; fuera del
+proceso de la API el spool debe apuntar al mismo directorio. Varios workers
+pueden correr a la vez: cada trabajo se reclama con un `UPDATE` condicional
+y un arriendo (`UPLOAD_JOB_LEASE_SECONDS`) que lo libera si el worker muere.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+
+import anyio
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import and_, or_, update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import get_settings
+from app.db.engine import async_engine
+from app.models.enums import UploadJobKind, UploadJobStatus
+from app.models.equipment_calibration import EquipmentCalibration
+from app.models.external_analysis_record import ExternalAnalysisRecord
+from app.models.upload_job import UploadJob
+from app.services.storage import (
+    UPLOAD_CHUNK_SIZE,
+    LocalStorage,
+    get_storage,
+    iter_upload,
+    validate_pdf_upload,
+)
+
+logger = logging.getLogger(__name__)
+
+_TARGETS: dict[UploadJobKind, tuple[type, str]] = {
+    UploadJobKind.calibration_certificate: (EquipmentCalibration, "certificate_pdf_url"),
+    UploadJobKind.external_analysis_report: (ExternalAnalysisRecord, "report_pdf_url"),
+}
+
+# Despierta al worker del lifespan cuando la API encola un trabajo.
+_wakeup: asyncio.Event | None = None
+
+
+def _spool() -> LocalStorage:
+    return LocalStorage(get_settings().upload_spool_dir, "")
+
+
+async def enqueue_pdf_upload(
+    session: AsyncSession,
+    file: UploadFile,
+    *,
+    kind: UploadJobKind,
+    target_id: int,
+    terminal_id: int,
+    storage_path: str,
+    user_id: int,
+) -> UploadJob:
+    """
+    Valida el PDF, lo escribe en el spool y registra el trabajo.
+
+    Cada trabajo sube a su propia ruta (`storage_path` con un segmento
+    único antes del nombre), así que un trabajo viejo que termine tarde no
+    reemplaza el archivo de uno más nuevo. Si el registro falla se borra la
+    copia del spool.
+    """
+    validate_pdf_upload(file)
+    spool = _spool()
+    token = uuid.uuid4().hex
+    spool_path = f"{token}.pdf"
+    chunks = iter_upload(file, get_settings().upload_max_pdf_bytes, "El PDF")
+    await spool.upload(spool_path, chunks, "application/pdf")
+    job = UploadJob(
+        kind=kind,
+        target_id=target_id,
+        terminal_id=terminal_id,
+        storage_path=_job_storage_path(storage_path, token),
+        spool_path=spool_path,
+        content_type="application/pdf",
+        created_by_user_id=user_id,
+    )
+    try:
+        session.add(job)
+        await session.commit()
+    except BaseException:
+        await spool.delete(spool_path)
+        raise
+    notify_upload_worker()
+    return job
+
+
+def _job_storage_path(storage_path: str, token: str) -> str:
+    directory, _, filename = storage_path.rpartition("/")
+    return f"{directory}/{token}/{filename}" if directory else f"{token}/{filename}"
+
+
+def notify_upload_worker() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(
+            col(UploadJob.status) == UploadJobStatus.pending,
+            col(UploadJob.next_attempt_at) <= now,
+        ),
+        and_(
+            col(UploadJob.status) == UploadJobStatus.processing,
+            col(UploadJob.locked_until) < now,
+        ),
+    )
+
+
+async def claim_next_upload_job(
+    session: AsyncSession,
+) -> tuple[UploadJob, datetime] | None:
+    """
+    Reclama el trabajo vencido más antiguo y devuelve el trabajo con el fin
+    de su arriendo; `None` si no queda ninguno.
+
+    El `UPDATE` repite la condición, así que si otro worker lo tomó entre la
+    lectura y la escritura no afecta filas y se intenta con el siguiente.
+    La hora se toma en cada intento: en un lote largo, un arriendo calculado
+    al inicio ya estaría vencido y otro worker volvería a tomar el trabajo.
+    """
+    lease = timedelta(seconds=get_settings().upload_job_lease_seconds)
+    while True:
+        now = _now()
+        job_id = (
+            await session.exec(
+                select(UploadJob.id)
+                .where(_claimable(now))
+                .order_by(col(UploadJob.next_attempt_at), col(UploadJob.id))
+                .limit(1)
+            )
+        ).first()
+        if job_id is None:
+            await session.commit()
+            return None
+        locked_until = now + lease
+        result = await session.exec(
+            update(UploadJob)
+            .where(col(UploadJob.id) == job_id, _claimable(now))
+            .values(
+                status=UploadJobStatus.processing,
+                locked_until=locked_until,
+                attempts=col(UploadJob.attempts) + 1,
+                updated_at=now,
+            )
+        )
+        await session.commit()
+        if result.rowcount:
+            job = await session.get(UploadJob, job_id, populate_existing=True)
+            if job is not None:
+                return job, locked_until
+
+
+async def _iter_spool(path: anyio.Path) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(path, "rb") as handle:
+        while chunk := await handle.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+async def _newer_job_id(session: AsyncSession, job: UploadJob) -> int | None:
+    return (
+        await session.exec(
+            select(UploadJob.id)
+            .where(
+                col(UploadJob.kind) == job.kind,
+                col(UploadJob.target_id) == job.target_id,
+                col(UploadJob.id) > job.id,
+                col(UploadJob.status) != UploadJobStatus.failed,
+            )
+            .limit(1)
+        )
+    ).first()
+
+
+async def _delete_stored(path: str | None) -> None:
+    """
+    Borra un objeto subido que ya no referencia ningún registro; un error
+    solo se registra porque el trabajo ya terminó.
+    """
+    if not path:
+        return
+    try:
+        await get_storage().delete(path)
+    except Exception as exc:
+        logger.warning("Could not delete stored upload %s: %s", path, exc)
+
+
+def _error_message(exc: Exception) -> str:
+    message = exc.detail if isinstance(exc, HTTPException) else str(exc) or type(exc).__name__
+    return str(message)[:500]
+
+
+async def _transition(
+    session: AsyncSession, job: UploadJob, locked_until: datetime, **values: object
+) -> bool:
+    """
+    Cambia el estado solo si este worker conserva el arriendo; sin commit.
+
+    Si el arriendo venció y otro worker reclamó el trabajo no se escribe
+    nada: un worker tardío no debe pisar un `done` ni borrar su spool.
+    """
+    result = await session.exec(
+        update(UploadJob)
+        .where(
+            col(UploadJob.id) == job.id,
+            col(UploadJob.status) == UploadJobStatus.processing,
+            col(UploadJob.locked_until) == locked_until,
+        )
+        .values(locked_until=None, updated_at=_now(), **values)
+    )
+    if result.rowcount:
+        return True
+    await session.rollback()
+    logger.warning("Upload job %s lease lost; leaving it to the current holder", job.id)
+    return False
+
+
+async def _finish(
+    session: AsyncSession,
+    job: UploadJob,
+    locked_until: datetime,
+    status: UploadJobStatus,
+    *,
+    error: str | None = None,
+    result_url: str | None = None,
+) -> bool:
+    if not await _transition(
+        session, job, locked_until, status=status, last_error=error, result_url=result_url
+    ):
+        return False
+    await session.commit()
+    await _spool().delete(job.spool_path)
+    return True
+
+
+async def process_upload_job(
+    session: AsyncSession, job: UploadJob, locked_until: datetime
+) -> None:
+    """
+    Sube un trabajo reclamado hasta `locked_until` y fija la URL en su
+    registro destino.
+
+    Un error deja el trabajo `pending` con espera exponencial hasta agotar
+    los intentos; si el destino ya no existe o llegó una subida más nueva
+    para el mismo registro, termina en `failed` sin reintentar. La subida
+    más nueva se vuelve a buscar al fijar la URL, con el registro destino
+    bloqueado: la que llegó durante la subida también gana.
+    """
+    settings = get_settings()
+    model, url_field = _TARGETS[job.kind]
+    newer_job_id = await _newer_job_id(session, job)
+    if newer_job_id is not None:
+        await _finish(
+            session,
+            job,
+            locked_until,
+            UploadJobStatus.failed,
+            error=f"Superseded by upload job {newer_job_id}",
+        )
+        return
+    if await session.get(model, job.target_id) is None:
+        await _finish(
+            session, job, locked_until, UploadJobStatus.failed, error="Upload target not found"
+        )
+        return
+    # Sin transacción abierta mientras dura la subida.
+    await session.commit()
+
+    try:
+        spool_file = anyio.Path(_spool().root / job.spool_path)
+        url = await get_storage().upload(job.storage_path, _iter_spool(spool_file), job.content_type)
+    except Exception as exc:
+        logger.warning("Upload job %s attempt %s failed: %s", job.id, job.attempts, exc)
+        if job.attempts >= settings.upload_job_max_attempts:
+            await _finish(
+                session, job, locked_until, UploadJobStatus.failed, error=_error_message(exc)
+            )
+            return
+        delay = settings.upload_job_retry_delay_seconds * 2 ** (job.attempts - 1)
+        if await _transition(
+            session,
+            job,
+            locked_until,
+            status=UploadJobStatus.pending,
+            last_error=_error_message(exc),
+            next_attempt_at=_now() + timedelta(seconds=delay),
+        ):
+            await session.commit()
+        return
+
+    # El bloqueo ordena a los trabajos del mismo registro que terminan a la vez.
+    target = await session.get(
+        model, job.target_id, populate_existing=True, with_for_update=True
+    )
+    if target is None:
+        if await _finish(
+            session, job, locked_until, UploadJobStatus.failed, error="Upload target not found"
+        ):
+            await _delete_stored(job.storage_path)
+        return
+    newer_job_id = await _newer_job_id(session, job)
+    if newer_job_id is not None:
+        if await _finish(
+            session,
+            job,
+            locked_until,
+            UploadJobStatus.failed,
+            error=f"Superseded by upload job {newer_job_id}",
+        ):
+            await _delete_stored(job.storage_path)
+        return
+    # La URL y el `done` van en la misma transacción, solo si el arriendo sigue vigente.
+    if not await _transition(
+        session, job, locked_until, status=UploadJobStatus.done, last_error=None, result_url=url
+    ):
+        return
+    replaced_url = getattr(target, url_field)
+    setattr(target, url_field, url)
+    session.add(target)
+    await session.commit()
+    await _spool().delete(job.spool_path)
+    if replaced_url and replaced_url != url:
+        await _delete_stored(get_storage().path_from_url(replaced_url))
+
+
+async def process_pending_uploads(
+    session: AsyncSession,
+    *,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Procesa hasta `batch_size` trabajos vencidos y devuelve cuántos tomó.
+    """
+    batch_size = batch_size or get_settings().upload_worker_batch_size
+    processed = 0
+    while processed < batch_size:
+        claimed = await claim_next_upload_job(session)
+        if claimed is None:
+            break
+        await process_upload_job(session, *claimed)
+        processed += 1
+    return processed
+
+
+async def _run_batch(batch_size: int | None = None) -> int:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        return await process_pending_uploads(session, batch_size=batch_size)
+
+
+async def run_upload_worker(interval_seconds: float) -> None:
+    """
+    Bucle del lifespan: procesa la cola cada `interval_seconds` o en cuanto
+    la API encola un trabajo.
+    """
+    global _wakeup
+    _wakeup = asyncio.Event()
+    try:
+        while True:
+            _wakeup.clear()
+            try:
+                while await _run_batch():
+                    pass
+            except Exception:
+                logger.exception("Upload worker batch failed")
+            with suppress(TimeoutError):
+                await asyncio.wait_for(_wakeup.wait(), timeout=interval_seconds)
+    finally:
+        _wakeup = None
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app.services.upload_queue")
+    parser.add_argument("--once", action="store_true", help="Procesar un lote y salir.")
+    parser.add_argument("--batch-size", type=int, default=settings.upload_worker_batch_size)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.once:
+        count = asyncio.run(_run_batch(args.batch_size))
+        logger.info("Upload worker processed %s jobs", count)
+    else:
+        asyncio.run(run_upload_worker(max(settings.upload_worker_interval_seconds, 1)))
@@ -1,2 +1,2 @@
 # Package marker for app.utils
-from .hydrometer import api_60f_crude, validate_inputs  # noqa: F401
+from .hydrometer import api_60f_crude, api_60f_crude_batch, validate_inputs  # noqa: F401
@@ -0,0 +1,154 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models.enums import ComplianceType
+from app.models.equipment import Equipment
+from app.models.equipment_calibration import EquipmentCalibration
+from app.models.equipment_compliance import EquipmentCompliance
+from app.models.equipment_inspection import EquipmentInspection
+from app.models.equipment_type import EquipmentType
+from app.models.equipment_type_verification import EquipmentTypeVerification
+from app.models.equipment_verification import EquipmentVerification
+
+ComplianceKey = tuple[ComplianceType, int | None]
+
+
+def _as_utc(dt_value: datetime | None) -> datetime | None:
+    if dt_value is None:
+        return None
+    if dt_value.tzinfo is None:
+        return dt_value.replace(tzinfo=UTC)
+    return dt_value.astimezone(UTC)
+
+
+def _next_due_at(
+    last_performed_at: datetime | None,
+    frequency_days: int,
+    created_at: datetime,
+    *,
+    required: bool,
+) -> datetime | None:
+    if last_performed_at is None:
+        # Nunca realizada: vence desde el alta del equipo.
+        return created_at if required or frequency_days > 0 else None
+    if frequency_days <= 0:
+        return None
+    return last_performed_at + timedelta(days=frequency_days)
+
+
+def refresh_equipment_compliance(session: Session, equipment: Equipment) -> None:
+    """
+    Recalcula las filas de `equipment_compliance` de un equipo.
+
+    Debe llamarse en la misma transacción que la escritura de calibraciones,
+    inspecciones, verificaciones o cambios del equipo; no hace commit.
+    """
+    if equipment.id is None:
+        return
+    equipment_id = equipment.id
+    equipment_type = session.get(EquipmentType, equipment.equipment_type_id)
+    created_at = _as_utc(equipment.created_at) or datetime.now(UTC)
+
+    last_calibration_at = session.exec(
+        select(func.max(EquipmentCalibration.calibrated_at)).where(
+            EquipmentCalibration.equipment_id == equipment_id
+        )
+    ).one()
+    last_inspection_at = session.exec(
+        select(func.max(EquipmentInspection.inspected_at)).where(
+            EquipmentInspection.equipment_id == equipment_id
+        )
+    ).one()
+    last_verification_by_type: dict[int, datetime] = {
+        verification_type_id: verified_at
+        for verification_type_id, verified_at in session.exec(
+            select(
+                EquipmentVerification.verification_type_id,
+                func.max(EquipmentVerification.verified_at),
+            )
+            .where(EquipmentVerification.equipment_id == equipment_id)
+            .group_by(EquipmentVerification.verification_type_id)  # type: ignore[arg-type]
+        ).all()
+    }
+    verification_types = session.exec(
+        select(EquipmentTypeVerification).where(
+            EquipmentTypeVerification.equipment_type_id == equipment.equipment_type_id,
+            EquipmentTypeVerification.is_active == True,  # noqa: E712
+        )
+    ).all()
+
+    calibration_days = equipment_type.calibration_days if equipment_type else 0
+    inspection_days = (
+        equipment.inspection_days_override
+        if equipment.inspection_days_override is not None
+        else (equipment_type.inspection_days if equipment_type else 0)
+    )
+    desired: dict[ComplianceKey, tuple[int, datetime | None, bool]] = {
+        (ComplianceType.calibration, None): (
+            calibration_days,
+            _as_utc(last_calibration_at),
+            True,
+        ),
+        (ComplianceType.inspection, None): (
+            inspection_days,
+            _as_utc(last_inspection_at),
+            False,
+        ),
+    }
+    for verification_type in verification_types:
+        if verification_type.id is None:
+            continue
+        desired[(ComplianceType.verification, verification_type.id)] = (
+            verification_type.frequency_days,
+            _as_utc(last_verification_by_type.get(verification_type.id)),
+            False,
+        )
+
+    existing: dict[ComplianceKey, EquipmentCompliance] = {
+        (row.compliance_type, row.verification_type_id): row
+        for row in session.exec(
+            select(EquipmentCompliance).where(
+                EquipmentCompliance.equipment_id == equipment_id
+            )
+        ).all()
+    }
+    now = datetime.now(UTC)
+    for key, (frequency_days, last_performed_at, required) in desired.items():
+        row = existing.pop(key, None) or EquipmentCompliance(
+            equipment_id=equipment_id,
+            terminal_id=equipment.terminal_id,
+            compliance_type=key[0],
+            verification_type_id=key[1],
+        )
+        row.terminal_id = equipment.terminal_id
+        row.frequency_days = frequency_days
+        row.last_performed_at = last_performed_at
+        row.next_due_at = _next_due_at(
+            last_performed_at,
+            frequency_days,
+            created_at,
+            required=required,
+        )
+        row.updated_at = now
+        session.add(row)
+    for stale_row in existing.values():
+        session.delete(stale_row)
+
+
+def refresh_equipment_compliance_by_id(session: Session, equipment_id: int) -> None:
+    equipment = session.get(Equipment, equipment_id)
+    if equipment is not None:
+        refresh_equipment_compliance(session, equipment)
+
+
+def refresh_equipment_type_compliance(session: Session, equipment_type_id: int) -> None:
+    """
+    Recalcula el cumplimiento de todos los equipos de un tipo (cambio de
+    frecuencias o de tipos de verificación).
+    """
+    for equipment in session.exec(
+        select(Equipment).where(Equipment.equipment_type_id == equipment_type_id)
+    ).all():
+        refresh_equipment_compliance(session, equipment)
@@ -0,0 +1,84 @@
+"""
+Catálogo en memoria de tipos de análisis externo.
+
+Los tipos cambian muy poco y se leen en cada respuesta de registros para
+resolver `analysis_type_name`. El catálogo se recarga completo cuando vence
+(`EXTERNAL_ANALYSIS_TYPE_CACHE_TTL_SECONDS`, 0 lo desactiva), cuando se pide
+un ID que no contiene o cuando las escrituras de tipos lo invalidan.
+
+La invalidación es por proceso, así que solo sirve para nombres; el listado
+público de tipos se lee siempre de la base.
+"""
+
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.models.external_analysis_type import ExternalAnalysisType, ExternalAnalysisTypeRead
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class AnalysisTypeCatalog:
+    types: dict[int, ExternalAnalysisTypeRead]
+    expires_at: float
+
+    def names(self) -> dict[int, str]:
+        return {type_id: row.name for type_id, row in self.types.items()}
+
+
+_lock = threading.Lock()
+_catalog: AnalysisTypeCatalog | None = None
+# Se incrementa en cada invalidación para descartar cargas concurrentes
+# que leyeron los tipos antes del cambio.
+_generation = 0
+
+
+def _load_catalog(session: Session) -> AnalysisTypeCatalog:
+    rows = session.exec(select(ExternalAnalysisType).order_by(ExternalAnalysisType.id)).all()  # type: ignore[arg-type]
+    return AnalysisTypeCatalog(
+        types={
+            row.id: ExternalAnalysisTypeRead(**row.model_dump())
+            for row in rows
+            if row.id is not None
+        },
+        expires_at=time.monotonic() + settings.external_analysis_type_cache_ttl_seconds,
+    )
+
+
+def get_analysis_type_catalog(
+    session: Session, required_ids: Iterable[int] = ()
+) -> AnalysisTypeCatalog:
+    """
+    Catálogo vigente; se recarga si venció o si falta alguno de `required_ids`
+    (p. ej. un tipo creado desde otro proceso).
+    """
+    global _catalog
+    if settings.external_analysis_type_cache_ttl_seconds <= 0:
+        return _load_catalog(session)
+    with _lock:
+        catalog = _catalog
+        generation = _generation
+    if (
+        catalog is not None
+        and catalog.expires_at > time.monotonic()
+        and all(type_id in catalog.types for type_id in required_ids)
+    ):
+        return catalog
+    catalog = _load_catalog(session)
+    with _lock:
+        if _generation == generation:
+            _catalog = catalog
+    return catalog
+
+
+def invalidate_analysis_type_catalog() -> None:
+    global _catalog, _generation
+    with _lock:
+        _catalog = None
+        _generation += 1
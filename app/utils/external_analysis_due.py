@@ -0,0 +1,137 @@
+"""
+Vencimientos de análisis externos por (terminal, tipo) en una sola consulta.
+
+La frecuencia efectiva es la de `external_analysis_terminal` si es > 0 y,
+si no, `default_frequency_days` del tipo; el último `performed_at` sale de
+un `MAX ... GROUP BY` sobre los registros.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Select, and_, case, func, literal, true
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlmodel import select
+
+from app.models.company_terminal import CompanyTerminal
+from app.models.external_analysis_record import ExternalAnalysisRecord
+from app.models.external_analysis_terminal import ExternalAnalysisTerminal
+from app.models.external_analysis_type import ExternalAnalysisType
+
+# Clave de orden de los pares nunca realizados: vencen antes que cualquiera.
+NEVER_PERFORMED_DUE_AT = datetime(1970, 1, 1)
+
+
+class add_days(FunctionElement):
+    """
+    `timestamp + N días` con N tomado de otra columna.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(add_days)
+def _add_days_default(element: add_days, compiler: Any, **kw: Any) -> str:
+    timestamp, days = list(element.clauses)
+    return (
+        f"({compiler.process(timestamp, **kw)} "
+        f"+ make_interval(days => {compiler.process(days, **kw)}))"
+    )
+
+
+@compiles(add_days, "sqlite")
+def _add_days_sqlite(element: add_days, compiler: Any, **kw: Any) -> str:
+    # Mismo formato de texto con el que SQLAlchemy guarda DateTime en SQLite,
+    # para que el resultado compare bien contra parámetros y columnas.
+    timestamp, days = list(element.clauses)
+    return (
+        f"strftime('%Y-%m-%d %H:%M:%f000', {compiler.process(timestamp, **kw)}, "
+        f"'+' || {compiler.process(days, **kw)} || ' days')"
+    )
+
+
+def external_analysis_due_statement(
+    *,
+    terminal_ids: Select | None = None,
+    due_before: datetime | None = None,
+) -> tuple[Select, Any]:
+    """
+    Pares (terminal activa, tipo activo) con frecuencia > 0, ordenados por
+    urgencia: primero los nunca realizados y luego por `next_due_at`.
+
+    `terminal_ids` es una subconsulta de IDs de terminal que acota tanto los
+    pares como el `GROUP BY` de registros. Devuelve la consulta y la
+    expresión de la clave de orden, para paginar por keyset sobre ella.
+    """
+    last_performed = select(
+        ExternalAnalysisRecord.terminal_id,
+        ExternalAnalysisRecord.analysis_type_id,
+        func.max(ExternalAnalysisRecord.performed_at).label("last_performed_at"),
+    )
+    if terminal_ids is not None:
+        last_performed = last_performed.where(
+            ExternalAnalysisRecord.terminal_id.in_(terminal_ids)  # type: ignore[attr-defined]
+        )
+    last_performed_subquery = last_performed.group_by(
+        ExternalAnalysisRecord.terminal_id,  # type: ignore[arg-type]
+        ExternalAnalysisRecord.analysis_type_id,  # type: ignore[arg-type]
+    ).subquery()
+
+    frequency_days = case(
+        (
+            ExternalAnalysisTerminal.frequency_days > 0,  # type: ignore[operator]
+            ExternalAnalysisTerminal.frequency_days,
+        ),
+        else_=ExternalAnalysisType.default_frequency_days,
+    )
+    is_active = func.coalesce(
+        ExternalAnalysisTerminal.is_active, ExternalAnalysisType.is_active
+    )
+    last_performed_at = last_performed_subquery.c.last_performed_at
+    next_due_at = add_days(last_performed_at, frequency_days)
+    due_key = func.coalesce(
+        next_due_at, literal(NEVER_PERFORMED_DUE_AT, type_=DateTime())
+    )
+
+    statement = (
+        select(
+            CompanyTerminal.id,
+            CompanyTerminal.name,
+            ExternalAnalysisType.id,
+            ExternalAnalysisType.name,
+            frequency_days.label("frequency_days"),
+            last_performed_at,
+            next_due_at.label("next_due_at"),
+            due_key.label("due_key"),
+        )
+        .select_from(CompanyTerminal)
+        .join(ExternalAnalysisType, true())
+        .outerjoin(
+            ExternalAnalysisTerminal,
+            and_(
+                ExternalAnalysisTerminal.terminal_id == CompanyTerminal.id,
+                ExternalAnalysisTerminal.analysis_type_id == ExternalAnalysisType.id,
+            ),
+        )
+        .outerjoin(
+            last_performed_subquery,
+            and_(
+                last_performed_subquery.c.terminal_id == CompanyTerminal.id,
+                last_performed_subquery.c.analysis_type_id == ExternalAnalysisType.id,
+            ),
+        )
+        .where(
+            CompanyTerminal.is_active == True,  # noqa: E712
+            is_active == True,  # noqa: E712
+            frequency_days > 0,
+        )
+    )
+    if terminal_ids is not None:
+        statement = statement.where(
+            CompanyTerminal.id.in_(terminal_ids)  # type: ignore[union-attr]
+        )
+    if due_before is not None:
+        statement = statement.where(due_key < due_before)
+    return statement, due_key
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+TEMP_MIN_F = -58.0
+TEMP_MAX_F = 302.0
+DENSIDAD_MIN = 610.6
+DENSIDAD_MAX = 1163.5
 
 
 def validate_inputs(temp_obs_f: float, lectura_api: float) -> None:
-    temp_min = -58.0
-    temp_max = 302.0
-    if temp_obs_f < temp_min or temp_obs_f > temp_max:
+    if temp_obs_f < TEMP_MIN_F or temp_obs_f > TEMP_MAX_F:
         raise ValueError(f"Temperatura fuera del rango permitido: {temp_obs_f:.1f} °F")
     if lectura_api <= 0:
         raise ValueError(f"Lectura API debe ser mayor que cero: {lectura_api}")
     densidad = (141.5 * 999.016) / (lectura_api + 131.5)
-    if densidad < 610.6 or densidad > 1163.5:
+    if densidad < DENSIDAD_MIN or densidad > DENSIDAD_MAX:
         raise ValueError(f"Densidad calculada fuera de rango: {densidad:.1f} kg/m³")
 
 
@@ -97,3 +105,167 @@ def api_60f_crude(temp_obs_f: float, lectura_api: float) -> float:
     densidad60 = densidad_m
     api = (141.5 / (densidad60 / 999.016)) - 131.5
     return round(api, 1)
+
+
+@dataclass(frozen=True)
+class Api60fBatch:
+    """
+    Resultado de `api_60f_crude_batch`: `api_60f` vale NaN donde la entrada
+    es inválida y las máscaras indican qué validación falló.
+    """
+
+    temp_obs_f: npt.NDArray[np.float64]
+    lectura_api: npt.NDArray[np.float64]
+    api_60f: npt.NDArray[np.float64]
+    temp_out_of_range: npt.NDArray[np.bool_]
+    api_not_positive: npt.NDArray[np.bool_]
+    density_out_of_range: npt.NDArray[np.bool_]
+
+    @property
+    def valid(self) -> npt.NDArray[np.bool_]:
+        return ~(self.temp_out_of_range | self.api_not_positive | self.density_out_of_range)
+
+    def error(self, index: int) -> str | None:
+        """
+        Mismo mensaje que lanzaría `validate_inputs` para el elemento `index`.
+        """
+        temp_obs_f = float(self.temp_obs_f[index])
+        lectura_api = float(self.lectura_api[index])
+        if self.temp_out_of_range[index]:
+            return f"Temperatura fuera del rango permitido: {temp_obs_f:.1f} °F"
+        if self.api_not_positive[index]:
+            return f"Lectura API debe ser mayor que cero: {lectura_api}"
+        if self.density_out_of_range[index]:
+            densidad = (141.5 * 999.016) / (lectura_api + 131.5)
+            return f"Densidad calculada fuera de rango: {densidad:.1f} kg/m³"
+        return None
+
+    def values(self) -> list[float | None]:
+        """
+        Valores como `float` de Python (None donde la entrada es inválida).
+        """
+        return [None if math.isnan(value) else value for value in self.api_60f.tolist()]
+
+
+def api_60f_crude_batch(
+    temp_obs_f: Sequence[float] | npt.ArrayLike,
+    lectura_api: Sequence[float] | npt.ArrayLike,
+) -> Api60fBatch:
+    """
+    Versión vectorizada de `api_60f_crude` sobre arreglos del mismo tamaño.
+
+    Itera todos los elementos a la vez hasta que convergen (o 15 iteraciones),
+    congelando cada uno al converger como hace la versión escalar. Las
+    entradas inválidas no lanzan `ValueError`: quedan en NaN y se marcan en
+    las máscaras del resultado.
+    """
+    temp, api = _as_input_arrays(temp_obs_f, lectura_api)
+    batch = _empty_batch(temp, api)
+    valid = batch.valid
+    if valid.any():
+        batch.api_60f[valid] = _api_60f_crude_valid(temp[valid], api[valid])
+    return batch
+
+
+def _as_input_arrays(
+    temp_obs_f: Sequence[float] | npt.ArrayLike,
+    lectura_api: Sequence[float] | npt.ArrayLike,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    temp = np.asarray(temp_obs_f, dtype=np.float64)
+    api = np.asarray(lectura_api, dtype=np.float64)
+    if temp.shape != api.shape or temp.ndim != 1:
+        raise ValueError("temp_obs_f y lectura_api deben ser arreglos 1-D del mismo tamaño")
+    return temp, api
+
+
+def _empty_batch(temp: npt.NDArray[np.float64], api: npt.NDArray[np.float64]) -> Api60fBatch:
+    # Máscaras de `validate_inputs` por elemento y `api_60f` en NaN.
+    temp_out_of_range = (temp < TEMP_MIN_F) | (temp > TEMP_MAX_F)
+    api_not_positive = ~temp_out_of_range & (api <= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        densidad_lectura = (141.5 * 999.016) / (api + 131.5)
+    density_out_of_range = (
+        ~temp_out_of_range
+        & ~api_not_positive
+        & ((densidad_lectura < DENSIDAD_MIN) | (densidad_lectura > DENSIDAD_MAX))
+    )
+    return Api60fBatch(
+        temp_obs_f=temp,
+        lectura_api=api,
+        api_60f=np.full(temp.shape, np.nan),
+        temp_out_of_range=temp_out_of_range,
+        api_not_positive=api_not_positive,
+        density_out_of_range=density_out_of_range,
+    )
+
+
+def _api_60f_crude_valid(
+    temp_obs_f: npt.NDArray[np.float64],
+    lectura_api: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    # Mismas fórmulas que `api_60f_crude`; las entradas ya están validadas.
+    presion = 0.0
+    s60 = 0.01374979547
+
+    densidad = (141.5 / (lectura_api + 131.5)) * 999.016
+    hyc = 1 - (0.00001278 * (temp_obs_f - 60)) - (0.0000000062 * ((temp_obs_f - 60) ** 2))
+    densidad_hyc = densidad * hyc
+
+    a1 = -0.148759
+    a2 = -0.267408
+    a3 = 1.08076
+    a4 = 1.269056
+    a5 = -4.089591
+    a6 = -1.871251
+    a7 = 7.438081
+    a8 = -3.536296
+
+    tc90 = (temp_obs_f - 32.0) / 1.8
+    tau = tc90 / 630.0
+    delta_tau = (
+        a1 + (a2 + (a3 + (a4 + (a5 + (a6 + (a7 + (a8 * tau)) * tau) * tau) * tau) * tau) * tau) * tau
+    ) * tau
+    tc68 = tc90 - delta_tau
+    tf68 = (1.8 * tc68) + 32.0
+
+    k0 = 341.0957
+    k1 = 0.0
+    k2 = 0.0
+    tb = 60.0068749
+    da = 2.0
+
+    densidad_m = densidad_hyc.copy()
+    active = np.ones(densidad_m.shape, dtype=bool)
+
+    for _ in range(15):
+        if not active.any():
+            break
+        dm = densidad_m[active]
+        d_hyc = densidad_hyc[active]
+        t68 = tf68[active]
+
+        a = (s60 / 2.0) * ((((k0 / dm) + k1) / dm) + k2)
+        b = (2.0 * k0 + k1 * dm) / (k0 + (k1 + k2 * dm) * dm)
+        de = dm * (1.0 + ((np.exp(a * (1.0 + 0.8 * a)) - 1.0) / (1.0 + a * (1.0 + 1.6 * a) * b)))
+        alfa60 = ((k0 / de) + k1) * (1.0 / de) + k2
+        dt = t68 - tb
+        ctl = np.exp(-alfa60 * dt * (1.0 + 0.8 * alfa60 * (dt + s60)))
+        fp = np.exp(-1.9947 + 0.00013427 * t68 + ((793920 + 2326 * t68) / (de**2)))
+        cpl = 1.0 / (1.0 - fp * presion * 0.00001)
+        ctpl = ctl * cpl
+
+        e_m = (d_hyc / (ctl * cpl)) - dm
+        dt2 = t68 - 60.0
+        d_tm = da * alfa60 * dt2 * (1.0 + 1.6 * alfa60 * dt2)
+        d_pm = (2.0 * cpl * presion * fp * (7.9392 + 0.02326 * t68)) / (dm**2)
+        dm = dm + e_m / (1.0 + d_tm + d_pm)
+        densidad_m[active] = dm
+
+        converged = np.abs(d_hyc - dm * ctpl) < 0.0001
+        active_idx = np.flatnonzero(active)
+        active[active_idx[converged]] = False
+
+    api_60f = (141.5 / (densidad_m / 999.016)) - 131.5
+    # `round` de Python por elemento: np.round escala por 10 y puede diferir
+    # de `api_60f_crude` en valores justo a mitad de décima.
+    return np.array([round(value, 1) for value in api_60f.tolist()], dtype=np.float64)
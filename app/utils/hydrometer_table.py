@@ -0,0 +1,169 @@
+"""
+Tabla precalculada de API a 60°F para crudo.
+
+La corrección de `api_60f_crude` es determinista sobre un dominio acotado
+(-58 a 302 °F, API entre 0 y 100) y las lecturas llegan cuantizadas a 0.1,
+así que se precalcula la rejilla completa en décimas (int16, ~7 MB).
+Una lectura sobre la rejilla se resuelve con un índice y devuelve
+exactamente lo que devolvería el solver; las pocas que caen fuera de la
+rejilla pasan por el solver vectorizado, para que `POST /samples/batch`
+guarde el mismo API-60 que `POST /samples`.
+
+Se genera en el primer uso o en build con
+`python -m app.utils.hydrometer_table <ruta.npy>`, y se carga por memory map.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from app.core.config import get_settings
+from app.utils.hydrometer import (
+    TEMP_MAX_F,
+    TEMP_MIN_F,
+    Api60fBatch,
+    _api_60f_crude_valid,
+    _as_input_arrays,
+    _empty_batch,
+    api_60f_crude_batch,
+    validate_inputs,
+)
+
+logger = logging.getLogger(__name__)
+
+# Ejes en décimas. El eje API llega a 100.1 (lecturas válidas hasta ~100.007
+# por el límite de densidad); se conserva para no invalidar tablas guardadas.
+TEMP_TENTHS = np.arange(round(TEMP_MIN_F * 10), round(TEMP_MAX_F * 10) + 1)
+API_TENTHS = np.arange(0, 1002)
+_EXACT_TOLERANCE = 1e-6
+_BUILD_CHUNK_ROWS = 200
+
+
+@dataclass(frozen=True)
+class Api60fTable:
+    """
+    Rejilla `(temperatura, lectura API)` con el API a 60°F en décimas.
+    """
+
+    grid: npt.NDArray[np.int16]
+
+    def lookup_batch(
+        self,
+        temp_obs_f: Sequence[float] | npt.ArrayLike,
+        lectura_api: Sequence[float] | npt.ArrayLike,
+    ) -> Api60fBatch:
+        """
+        Igual que `api_60f_crude_batch`, pero leyendo la rejilla.
+        """
+        temp, api = _as_input_arrays(temp_obs_f, lectura_api)
+        batch = _empty_batch(temp, api)
+        valid = batch.valid
+        if not valid.any():
+            return batch
+
+        ti = temp[valid] * 10 - TEMP_TENTHS[0]
+        aj = api[valid] * 10 - API_TENTHS[0]
+        i = np.round(ti).astype(np.intp)
+        j = np.round(aj).astype(np.intp)
+        # Acierto exacto: se toma el nodo tal cual, sin ruido de coma flotante.
+        exact = (np.abs(ti - i) < _EXACT_TOLERANCE) & (np.abs(aj - j) < _EXACT_TOLERANCE)
+        values = np.empty(len(ti), dtype=np.float64)
+        values[exact] = self.grid[i[exact], j[exact]] / 10
+        off_grid = ~exact
+        if off_grid.any():
+            values[off_grid] = _api_60f_crude_valid(
+                temp[valid][off_grid], api[valid][off_grid]
+            )
+        batch.api_60f[valid] = values
+        return batch
+
+    def lookup(self, temp_obs_f: float, lectura_api: float) -> float:
+        """
+        Versión escalar; lanza `ValueError` como `api_60f_crude`.
+        """
+        validate_inputs(temp_obs_f, lectura_api)
+        return float(self.lookup_batch([temp_obs_f], [lectura_api]).api_60f[0])
+
+    def save(self, path: str | Path) -> None:
+        # Escritura atómica: otros procesos pueden estar cargando la ruta.
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.save(handle, self.grid)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str | Path) -> Api60fTable:
+        grid = np.load(path, mmap_mode="r")
+        expected = (len(TEMP_TENTHS), len(API_TENTHS))
+        if grid.shape != expected or grid.dtype != np.int16:
+            raise ValueError(f"Tabla API-60 inválida en {path}: {grid.shape} {grid.dtype}")
+        return cls(grid=grid)
+
+
+def build_api60f_table() -> Api60fTable:
+    """
+    Calcula la rejilla completa con el solver iterativo (unos segundos).
+    """
+    api_axis = API_TENTHS / 10
+    grid = np.empty((len(TEMP_TENTHS), len(API_TENTHS)), dtype=np.int16)
+    for start in range(0, len(TEMP_TENTHS), _BUILD_CHUNK_ROWS):
+        temps = TEMP_TENTHS[start : start + _BUILD_CHUNK_ROWS] / 10
+        temp_block, api_block = np.meshgrid(temps, api_axis, indexing="ij")
+        values = _api_60f_crude_valid(temp_block.ravel(), api_block.ravel())
+        grid[start : start + len(temps)] = np.round(values * 10).astype(np.int16).reshape(temp_block.shape)
+    return Api60fTable(grid=grid)
+
+
+@lru_cache(maxsize=1)
+def get_api60f_table() -> Api60fTable:
+    """
+    Tabla del proceso: se carga de `API60F_TABLE_PATH` si existe; si no, se
+    genera y, si hay ruta configurada, se guarda ahí para el próximo arranque.
+    """
+    path = get_settings().api60f_table_path
+    if path and Path(path).exists():
+        try:
+            return Api60fTable.load(path)
+        except ValueError:
+            logger.warning("Regenerating API-60 table at %s", path)
+    table = build_api60f_table()
+    if path:
+        table.save(path)
+        return Api60fTable.load(path)
+    return table
+
+
+def api_60f_batch(
+    temp_obs_f: Sequence[float] | npt.ArrayLike,
+    lectura_api: Sequence[float] | npt.ArrayLike,
+) -> Api60fBatch:
+    """
+    API a 60°F por lotes con la tabla si `API60F_LOOKUP_ENABLED`, o con el
+    solver vectorizado si no.
+    """
+    if get_settings().api60f_lookup_enabled:
+        return get_api60f_table().lookup_batch(temp_obs_f, lectura_api)
+    return api_60f_crude_batch(temp_obs_f, lectura_api)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python -m app.utils.hydrometer_table <ruta.npy>", file=sys.stderr)
+        raise SystemExit(2)
+    build_api60f_table().save(sys.argv[1])
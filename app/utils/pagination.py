@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Codifica la clave de la última fila de una página como cursor opaco.
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Decodifica un cursor generado por `encode_cursor` con `size` valores.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    Decodifica un cursor de listados paginados solo por `id`.
+
+    Lanza `ValueError` si el valor no es un entero, para que un cursor
+    manipulado responda 400 y no llegue a la base de datos.
+    """
+    (value,) = decode_cursor(cursor, 1)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("Invalid cursor")
+    return value
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.sample import Sample, SampleAnalysis
+
+# Filas por lote del cursor de servidor y por trozo enviado al cliente.
+EXPORT_BATCH_SIZE = 500
+
+# (columna exportada, columna SQL). Una fila por análisis; las muestras sin
+# análisis salen una vez con las columnas de análisis vacías.
+EXPORT_COLUMNS: list[tuple[str, Any]] = [
+    ("sample_id", Sample.id),
+    ("code", Sample.code),
+    ("sequence", Sample.sequence),
+    ("identifier", Sample.identifier),
+    ("product_name", Sample.product_name),
+    ("created_at", Sample.created_at),
+    ("analyzed_at", Sample.analyzed_at),
+    ("volume", Sample.volume),
+    ("retention_days", Sample.retention_days),
+    ("disposal_due_at", Sample.disposal_due_at),
+    ("disposed_at", Sample.disposed_at),
+    ("lab_humidity", Sample.lab_humidity),
+    ("lab_temperature", Sample.lab_temperature),
+    ("analysis_id", SampleAnalysis.id),
+    ("analysis_type", SampleAnalysis.analysis_type),
+    ("temp_obs_f", SampleAnalysis.temp_obs_f),
+    ("lectura_api", SampleAnalysis.lectura_api),
+    ("api_60f", SampleAnalysis.api_60f),
+    ("hydrometer_id", SampleAnalysis.hydrometer_id),
+    ("thermometer_id", SampleAnalysis.thermometer_id),
+    ("water_value", SampleAnalysis.water_value),
+    ("water_sample_weight", SampleAnalysis.water_sample_weight),
+    ("water_sample_weight_unit", SampleAnalysis.water_sample_weight_unit),
+    ("water_volume_consumed", SampleAnalysis.water_volume_consumed),
+    ("water_volume_unit", SampleAnalysis.water_volume_unit),
+    ("kf_equipment_id", SampleAnalysis.kf_equipment_id),
+    ("kf_factor_avg", SampleAnalysis.kf_factor_avg),
+]
+EXPORT_FIELDS = [name for name, _column in EXPORT_COLUMNS]
+
+
+def _as_utc(dt_value: datetime) -> datetime:
+    if dt_value.tzinfo is None:
+        return dt_value.replace(tzinfo=UTC)
+    return dt_value.astimezone(UTC)
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _as_utc(value).isoformat()
+    return value
+
+
+def sample_export_statement(
+    terminal_id: int,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> Select:
+    """
+    Muestras de la terminal unidas a sus análisis, en orden de creación.
+    """
+    statement = (
+        select(*[column for _name, column in EXPORT_COLUMNS])
+        .select_from(Sample)
+        .outerjoin(SampleAnalysis, SampleAnalysis.sample_id == Sample.id)  # type: ignore[arg-type]
+        .where(Sample.terminal_id == terminal_id)
+    )
+    if created_from is not None:
+        statement = statement.where(Sample.created_at >= _as_utc(created_from))
+    if created_to is not None:
+        statement = statement.where(Sample.created_at <= _as_utc(created_to))
+    return statement.order_by(
+        Sample.created_at,  # type: ignore[arg-type]
+        Sample.id,  # type: ignore[arg-type]
+        SampleAnalysis.id,  # type: ignore[arg-type]
+    ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps(
+            {name: _export_value(value) for name, value in zip(EXPORT_FIELDS, row, strict=True)},
+            ensure_ascii=False,
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+async def stream_sample_export(
+    session: AsyncSession,
+    statement: Select,
+    export_format: str,
+) -> AsyncIterator[str]:
+    """
+    Genera el export por trozos con un cursor de servidor (`yield_per`):
+    la memoria no depende del tamaño del rango.
+    """
+    if export_format == "csv":
+        yield _csv_chunk([EXPORT_FIELDS])
+        to_chunk = _csv_chunk
+    else:
+        to_chunk = _ndjson_chunk
+    result = await session.stream(statement)
+    async for rows in result.partitions():
+        yield to_chunk(rows)
@@ -0,0 +1,136 @@
+"""
+Retención de muestras: vencimiento (`disposal_due_at`) y barrido periódico.
+
+El barrido se ejecuta dentro del proceso desde el lifespan
+(`SAMPLE_RETENTION_SWEEP_INTERVAL_SECONDS` > 0) o como comando:
+`python -m app.utils.sample_retention [--dispose] [--batch-size N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import Select, update
+from sqlmodel import Session, col, func, select
+
+from app.core.config import get_settings
+from app.db.engine import engine
+from app.models.sample import Sample
+
+logger = logging.getLogger(__name__)
+
+
+def disposal_due_at(created_at: datetime, retention_days: int | None) -> datetime | None:
+    if retention_days is None:
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+    return created_at + timedelta(days=retention_days)
+
+
+def due_for_disposal_statement(as_of: datetime) -> Select:
+    """
+    Muestras pendientes cuya retención venció en `as_of`, por vencimiento.
+
+    Usa el índice parcial `ix_sample_disposal_due_pending`.
+    """
+    return (
+        select(Sample)
+        .where(
+            col(Sample.disposed_at).is_(None),
+            col(Sample.disposal_due_at) <= as_of,
+        )
+        .order_by(col(Sample.disposal_due_at), col(Sample.id))
+    )
+
+
+def count_due_for_disposal(session: Session, as_of: datetime) -> int:
+    return session.exec(
+        select(func.count()).select_from(due_for_disposal_statement(as_of).order_by(None).subquery())
+    ).one()
+
+
+def dispose_due_samples(
+    session: Session,
+    *,
+    as_of: datetime | None = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Marca como dispuestas las muestras vencidas en lotes de `batch_size`.
+
+    Cada lote es un `UPDATE ... WHERE id IN (...)` con su propio commit, así
+    que las transacciones quedan acotadas aunque haya miles de vencidas.
+    `disposed_by_user_id` queda nulo: la disposición la hizo el sistema.
+    """
+    as_of = as_of or datetime.now(UTC)
+    total = 0
+    while True:
+        ids = session.exec(
+            due_for_disposal_statement(as_of).with_only_columns(col(Sample.id)).limit(batch_size)
+        ).all()
+        if not ids:
+            return total
+        session.exec(
+            update(Sample)
+            .where(col(Sample.id).in_(ids), col(Sample.disposed_at).is_(None))
+            .values(disposed_at=as_of, updated_at=datetime.now(UTC))
+        )
+        session.commit()
+        total += len(ids)
+
+
+def sweep_sample_retention(
+    session: Session,
+    *,
+    dispose: bool,
+    batch_size: int = 500,
+    as_of: datetime | None = None,
+) -> int:
+    """
+    Una pasada del barrido: dispone las vencidas si `dispose`; si no, solo
+    las cuenta (quedan visibles en `GET /samples/due-for-disposal`).
+    """
+    as_of = as_of or datetime.now(UTC)
+    if dispose:
+        count = dispose_due_samples(session, as_of=as_of, batch_size=batch_size)
+        logger.info("Sample retention sweep disposed %s samples", count)
+    else:
+        count = count_due_for_disposal(session, as_of)
+        logger.info("Sample retention sweep found %s samples due for disposal", count)
+    return count
+
+
+def _run_sweep() -> int:
+    settings = get_settings()
+    with Session(engine) as session:
+        return sweep_sample_retention(
+            session,
+            dispose=settings.sample_retention_auto_dispose,
+            batch_size=settings.sample_retention_batch_size,
+        )
+
+
+async def run_sample_retention_sweeper(interval_seconds: float) -> None:
+    """
+    Bucle del lifespan: una pasada cada `interval_seconds` en un hilo aparte.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(_run_sweep)
+        except Exception:
+            logger.exception("Sample retention sweep failed")
+        await asyncio.sleep(interval_seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.utils.sample_retention")
+    parser.add_argument("--dispose", action="store_true", help="Marcar como dispuestas las vencidas.")
+    parser.add_argument("--batch-size", type=int, default=get_settings().sample_retention_batch_size)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with Session(engine) as session:
+        sweep_sample_retention(session, dispose=args.dispose, batch_size=args.batch_size)
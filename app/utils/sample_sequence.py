@@ -0,0 +1,85 @@
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, func, select
+
+from app.models.sample import Sample
+from app.models.terminal_sample_counter import TerminalSampleCounter
+
+
+def _next_after_max_sequence(session: Session, terminal_ids: list[int]) -> dict[int, int]:
+    rows = session.exec(
+        select(Sample.terminal_id, func.max(Sample.sequence))
+        .where(Sample.terminal_id.in_(terminal_ids))  # type: ignore[attr-defined]
+        .group_by(Sample.terminal_id)  # type: ignore[arg-type]
+    ).all()
+    next_by_terminal = {terminal_id: (max_sequence or 0) + 1 for terminal_id, max_sequence in rows}
+    return {terminal_id: next_by_terminal.get(terminal_id, 1) for terminal_id in terminal_ids}
+
+
+def _increment(session: Session, terminal_id: int, count: int) -> int | None:
+    statement = (
+        update(TerminalSampleCounter)
+        .where(TerminalSampleCounter.terminal_id == terminal_id)  # type: ignore[arg-type]
+        .values(next_sequence=TerminalSampleCounter.next_sequence + count)
+        .returning(TerminalSampleCounter.next_sequence)
+    )
+    return session.exec(statement).scalar_one_or_none()
+
+
+def allocate_sample_sequences(session: Session, terminal_id: int, count: int = 1) -> int:
+    """
+    Reserva `count` consecutivos de muestra de la terminal y devuelve el primero.
+
+    Un único `UPDATE ... RETURNING` sobre `terminal_sample_counter`: la fila
+    queda bloqueada hasta el commit del llamador, así que debe invocarse
+    justo antes de insertar las muestras y confirmar la transacción.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    next_sequence = _increment(session, terminal_id, count)
+    if next_sequence is None:
+        # Primera muestra de la terminal: se crea el contador a partir del
+        # máximo existente. Si otra request lo crea en paralelo, se reintenta.
+        first = _next_after_max_sequence(session, [terminal_id])[terminal_id]
+        try:
+            with session.begin_nested():
+                session.add(TerminalSampleCounter(terminal_id=terminal_id, next_sequence=first + count))
+            return first
+        except IntegrityError:
+            next_sequence = _increment(session, terminal_id, count)
+            if next_sequence is None:
+                raise
+    return next_sequence - count
+
+
+def release_sample_sequence(session: Session, terminal_id: int, sequence: int) -> None:
+    """
+    Devuelve el consecutivo `sequence` si sigue siendo el último asignado.
+    """
+    session.exec(
+        update(TerminalSampleCounter)
+        .where(
+            TerminalSampleCounter.terminal_id == terminal_id,  # type: ignore[arg-type]
+            TerminalSampleCounter.next_sequence == sequence + 1,  # type: ignore[arg-type]
+        )
+        .values(next_sequence=sequence)
+    )
+
+
+def get_next_sample_sequences(session: Session, terminal_ids: list[int]) -> dict[int, int]:
+    """
+    Próximo consecutivo por terminal, sin reservarlo.
+    """
+    unique_terminal_ids = sorted(set(terminal_ids))
+    if not unique_terminal_ids:
+        return {}
+    rows = session.exec(
+        select(TerminalSampleCounter).where(
+            TerminalSampleCounter.terminal_id.in_(unique_terminal_ids)  # type: ignore[attr-defined]
+        )
+    ).all()
+    next_by_terminal = {row.terminal_id: row.next_sequence for row in rows}
+    missing = [terminal_id for terminal_id in unique_terminal_ids if terminal_id not in next_by_terminal]
+    if missing:
+        next_by_terminal.update(_next_after_max_sequence(session, missing))
+    return next_by_terminal
@@ -0,0 +1,7 @@
+"""
+Benchmarks de los endpoints de listado sobre una flota sintética en SQLite.
+
+`generator` puebla la base a escala realista y `scenarios` mide latencia
+(percentiles) y sentencias SQL por request vía `TestClient`. Se ejecuta con
+`python -m benchmarks`; ver `benchmarks/__main__.py`.
+"""
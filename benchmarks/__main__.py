@@ -0,0 +1,126 @@
+"""
+Uso:
+    python -m benchmarks --output benchmarks/results/baseline.json
+    python -m benchmarks --equipment-per-terminal 100 --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, fields
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+# Debe configurarse antes de importar la app: el engine se crea al importar.
+_DB_DIR = tempfile.mkdtemp(prefix="benchmarks-")
+os.environ["APP_ENV"] = "test"
+os.environ["DATABASE_URL"] = os.environ.get("BENCHMARK_DATABASE_URL", f"sqlite:///{_DB_DIR}/benchmark.db")
+os.environ.setdefault("DB_QUERY_STATS_ENABLED", "true")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session, SQLModel  # noqa: E402
+
+import app.models  # noqa: E402, F401
+from app.db.engine import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.generator import FleetSpec, generate_fleet  # noqa: E402
+from benchmarks.scenarios import SCENARIOS, run_scenarios  # noqa: E402
+
+COMPARED_METRICS = ("p50_ms", "p95_ms", "db_queries")
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    for spec_field in fields(FleetSpec):
+        parser.add_argument(
+            f"--{spec_field.name.replace('_', '-')}",
+            type=int,
+            default=spec_field.default,
+        )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="Ejecutar solo estos escenarios (repetible).",
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="JSON previo para comparar.")
+    return parser.parse_args(argv)
+
+
+def _print_comparison(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    print(f"\n{'scenario':40} {'metric':10} {'before':>10} {'after':>10} {'delta':>8}")
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before = previous.get(metric)
+            after = result.get(metric)
+            if not before or after is None:
+                continue
+            delta = (after - before) / before * 100
+            print(f"{name:40} {metric:10} {before:>10} {after:>10} {delta:>+7.1f}%")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    spec = FleetSpec(**{spec_field.name: getattr(args, spec_field.name) for spec_field in fields(FleetSpec)})
+
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        fleet = generate_fleet(session, spec)
+    print(f"Generated fleet: {json.dumps(fleet.counts)}")
+
+    with TestClient(app) as client:
+        scenarios = run_scenarios(
+            client,
+            fleet,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            only=set(args.scenario or []),
+        )
+
+    report = {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "git_commit": _git_commit(),
+        "database": engine.url.get_backend_name(),
+        "spec": asdict(spec),
+        "counts": fleet.counts,
+        "scenarios": scenarios,
+    }
+    for name, result in scenarios.items():
+        print(
+            f"{name:40} p50={result['p50_ms']:>8}ms p95={result['p95_ms']:>8}ms "
+            f"queries={result['db_queries']:>5} status={result['status_codes']}"
+        )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    if args.compare:
+        _print_comparison(json.loads(args.compare.read_text()), report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,491 @@
+import random
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app.core.bootstrap.equipment_type import (
+    ensure_default_equipment_type_inspection_items,
+    ensure_default_equipment_type_verifications,
+    ensure_default_equipment_types,
+)
+from app.core.bootstrap.external_analysis import ensure_default_external_analysis_types
+from app.core.security.password import hash_password
+from app.models.company import Company
+from app.models.company_block import CompanyBlock
+from app.models.company_terminal import CompanyTerminal
+from app.models.enums import (
+    CompanyType,
+    EquipmentStatus,
+    InspectionResponseType,
+    SampleAnalysisType,
+    UserType,
+)
+from app.models.equipment import Equipment
+from app.models.equipment_calibration import (
+    EquipmentCalibration,
+    EquipmentCalibrationResult,
+)
+from app.models.equipment_inspection import (
+    EquipmentInspection,
+    EquipmentInspectionResponse,
+)
+from app.models.equipment_reading import EquipmentReading
+from app.models.equipment_status_history import EquipmentStatusHistory
+from app.models.equipment_terminal_history import EquipmentTerminalHistory
+from app.models.equipment_type import EquipmentType
+from app.models.equipment_type_history import EquipmentTypeHistory
+from app.models.equipment_type_inspection_item import EquipmentTypeInspectionItem
+from app.models.equipment_type_verification import EquipmentTypeVerification
+from app.models.equipment_type_verification_item import EquipmentTypeVerificationItem
+from app.models.equipment_verification import (
+    EquipmentVerification,
+    EquipmentVerificationResponse,
+)
+from app.models.external_analysis_record import ExternalAnalysisRecord
+from app.models.external_analysis_terminal import ExternalAnalysisTerminal
+from app.models.external_analysis_type import ExternalAnalysisType
+from app.models.sample import Sample, SampleAnalysis
+from app.models.terminal_sample_counter import TerminalSampleCounter
+from app.models.user import User
+from app.models.user_terminal import UserTerminal
+from app.utils.equipment_compliance import refresh_equipment_compliance
+
+SUPERADMIN_EMAIL = "bench-admin@local.dev"
+SUPERADMIN_PASSWORD = "benchmark-password"
+
+
+@dataclass(frozen=True)
+class FleetSpec:
+    """
+    Tamaño de la flota sintética.
+
+    Las frecuencias de los tipos de equipo vienen de
+    `app/core/bootstrap/data`; `min_interval_days` acota las de alta
+    frecuencia (p. ej. verificaciones diarias) para que el volumen sea
+    manejable.
+    """
+
+    companies: int = 2
+    terminals_per_company: int = 3
+    equipment_per_terminal: int = 25
+    users_per_company: int = 10
+    samples_per_terminal: int = 200
+    years: int = 3
+    min_interval_days: int = 7
+    seed: int = 2026
+
+
+@dataclass
+class Fleet:
+    superadmin_id: int
+    company_ids: list[int] = field(default_factory=list)
+    terminal_ids: list[int] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+def _dates(start: datetime, end: datetime, every_days: int, rng: random.Random) -> list[datetime]:
+    values: list[datetime] = []
+    current = start + timedelta(days=rng.randint(0, max(every_days - 1, 0)))
+    while current < end:
+        values.append(current)
+        current += timedelta(days=every_days, hours=rng.randint(-6, 6))
+    return values
+
+
+def _response_values(
+    response_type: InspectionResponseType,
+    rng: random.Random,
+) -> dict[str, object]:
+    if response_type == InspectionResponseType.boolean:
+        return {"value_bool": rng.random() > 0.05}
+    if response_type == InspectionResponseType.number:
+        return {"value_number": round(rng.uniform(0, 100), 2)}
+    return {"value_text": "OK"}
+
+
+class _FleetBuilder:
+    def __init__(self, session: Session, spec: FleetSpec) -> None:
+        self.session = session
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.now = datetime.now(UTC)
+        self.history_start = self.now - timedelta(days=365 * spec.years)
+        self.counts: dict[str, int] = {}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def _interval(self, frequency_days: int) -> int:
+        return max(frequency_days, self.spec.min_interval_days)
+
+    def build(self) -> Fleet:
+        superadmin = self._ensure_superadmin()
+        assert superadmin.id is not None
+        ensure_default_equipment_types(self.session)
+        ensure_default_equipment_type_verifications(self.session)
+        ensure_default_equipment_type_inspection_items(self.session)
+        ensure_default_external_analysis_types(self.session)
+
+        fleet = Fleet(superadmin_id=superadmin.id)
+        equipment_types = self.session.exec(
+            select(EquipmentType).where(EquipmentType.is_active == True)  # noqa: E712
+        ).all()
+        analysis_types = self.session.exec(select(ExternalAnalysisType)).all()
+        password_hash = hash_password(SUPERADMIN_PASSWORD)
+
+        for company_index in range(self.spec.companies):
+            company = Company(
+                name=f"Bench Company {company_index + 1:03d}",
+                company_type=CompanyType.master if company_index == 0 else CompanyType.client,
+                created_by_user_id=superadmin.id,
+            )
+            self.session.add(company)
+            self.session.flush()
+            assert company.id is not None
+            fleet.company_ids.append(company.id)
+            if company_index == 0:
+                superadmin.company_id = company.id
+                self.session.add(superadmin)
+
+            block = CompanyBlock(
+                name=f"Bench Block {company_index + 1:03d}",
+                company_id=company.id,
+                created_by_user_id=superadmin.id,
+            )
+            self.session.add(block)
+            self.session.flush()
+            assert block.id is not None
+
+            company_terminal_ids: list[int] = []
+            for terminal_index in range(self.spec.terminals_per_company):
+                number = company_index * self.spec.terminals_per_company + terminal_index + 1
+                terminal = CompanyTerminal(
+                    name=f"Bench Terminal {number:03d}",
+                    block_id=block.id,
+                    owner_company_id=company.id,
+                    admin_company_id=company.id,
+                    created_by_user_id=superadmin.id,
+                    terminal_code=f"T{number:03d}",
+                )
+                self.session.add(terminal)
+                self.session.flush()
+                assert terminal.id is not None
+                company_terminal_ids.append(terminal.id)
+                self._count("terminals")
+
+                for analysis_type in analysis_types:
+                    self._add_external_analyses(terminal.id, analysis_type, superadmin.id)
+                for _ in range(self.spec.equipment_per_terminal):
+                    self._add_equipment(
+                        self.rng.choice(equipment_types),
+                        company.id,
+                        terminal.id,
+                        superadmin.id,
+                    )
+                self._add_samples(terminal, superadmin.id)
+                self.session.commit()
+
+            self._add_users(company.id, company_terminal_ids, password_hash)
+            fleet.terminal_ids.extend(company_terminal_ids)
+            self.session.commit()
+
+        fleet.counts = dict(sorted(self.counts.items()))
+        return fleet
+
+    def _ensure_superadmin(self) -> User:
+        superadmin = self.session.exec(select(User).where(User.email == SUPERADMIN_EMAIL)).first()
+        if superadmin is not None:
+            return superadmin
+        superadmin = User(
+            name="Bench",
+            last_name="Admin",
+            email=SUPERADMIN_EMAIL,
+            user_type=UserType.superadmin,
+            password_hash=hash_password(SUPERADMIN_PASSWORD),
+            is_active=True,
+        )
+        self.session.add(superadmin)
+        self.session.commit()
+        self.session.refresh(superadmin)
+        return superadmin
+
+    def _add_users(self, company_id: int, terminal_ids: list[int], password_hash: str) -> None:
+        for user_index in range(self.spec.users_per_company):
+            user = User(
+                name="Bench",
+                last_name=f"User {company_id:03d}{user_index:03d}",
+                email=f"bench-{company_id}-{user_index}@local.dev",
+                user_type=UserType.user if user_index else UserType.admin,
+                password_hash=password_hash,
+                company_id=company_id,
+            )
+            self.session.add(user)
+            self.session.flush()
+            assert user.id is not None
+            assigned = self.rng.sample(terminal_ids, k=self.rng.randint(1, len(terminal_ids)))
+            self.session.add_all([UserTerminal(user_id=user.id, terminal_id=terminal_id) for terminal_id in assigned])
+            self._count("users")
+            self._count("user_terminals", len(assigned))
+
+    def _add_external_analyses(
+        self,
+        terminal_id: int,
+        analysis_type: ExternalAnalysisType,
+        user_id: int,
+    ) -> None:
+        assert analysis_type.id is not None
+        frequency_days = analysis_type.default_frequency_days or 180
+        self.session.add(
+            ExternalAnalysisTerminal(
+                terminal_id=terminal_id,
+                analysis_type_id=analysis_type.id,
+                frequency_days=frequency_days,
+                created_by_user_id=user_id,
+            )
+        )
+        for performed_at in _dates(self.history_start, self.now, self._interval(frequency_days), self.rng):
+            self.session.add(
+                ExternalAnalysisRecord(
+                    terminal_id=terminal_id,
+                    analysis_type_id=analysis_type.id,
+                    performed_at=performed_at,
+                    report_number=f"R-{terminal_id}-{performed_at:%Y%m%d}",
+                    result_value=round(self.rng.uniform(0, 50), 3),
+                    result_unit="%",
+                    created_by_user_id=user_id,
+                )
+            )
+            self._count("external_analysis_records")
+
+    def _add_equipment(
+        self,
+        equipment_type: EquipmentType,
+        company_id: int,
+        terminal_id: int,
+        user_id: int,
+    ) -> None:
+        assert equipment_type.id is not None
+        self._count("equipment")
+        serial = f"BENCH-{terminal_id:03d}-{self.counts['equipment']:06d}"
+        created_at = self.history_start - timedelta(days=self.rng.randint(0, 90))
+        equipment = Equipment(
+            serial=serial,
+            internal_code=f"EQ-{self.counts['equipment']:06d}",
+            model="Bench",
+            brand="Synthetic",
+            status=EquipmentStatus.in_use,
+            equipment_type_id=equipment_type.id,
+            owner_company_id=company_id,
+            terminal_id=terminal_id,
+            created_by_user_id=user_id,
+            created_at=created_at,
+        )
+        self.session.add(equipment)
+        self.session.flush()
+        assert equipment.id is not None
+        self.session.add_all(
+            [
+                EquipmentTypeHistory(
+                    equipment_id=equipment.id,
+                    equipment_type_id=equipment_type.id,
+                    started_at=created_at,
+                    changed_by_user_id=user_id,
+                ),
+                EquipmentTerminalHistory(
+                    equipment_id=equipment.id,
+                    terminal_id=terminal_id,
+                    started_at=created_at,
+                    changed_by_user_id=user_id,
+                ),
+                EquipmentStatusHistory(
+                    equipment_id=equipment.id,
+                    status=EquipmentStatus.in_use,
+                    started_at=created_at,
+                    changed_by_user_id=user_id,
+                ),
+            ]
+        )
+
+        self._add_inspections(equipment.id, equipment_type, user_id)
+        self._add_verifications(equipment.id, equipment_type, user_id)
+        self._add_calibrations(equipment.id, equipment_type, user_id)
+        for measured_at in _dates(self.history_start, self.now, self.spec.min_interval_days, self.rng):
+            self.session.add(
+                EquipmentReading(
+                    equipment_id=equipment.id,
+                    value_celsius=round(self.rng.uniform(15, 35), 2),
+                    measured_at=measured_at,
+                    created_by_user_id=user_id,
+                )
+            )
+            self._count("equipment_readings")
+        self.session.flush()
+        refresh_equipment_compliance(self.session, equipment)
+
+    def _add_inspections(self, equipment_id: int, equipment_type: EquipmentType, user_id: int) -> None:
+        if equipment_type.inspection_days <= 0:
+            return
+        items = self.session.exec(
+            select(EquipmentTypeInspectionItem).where(
+                EquipmentTypeInspectionItem.equipment_type_id == equipment_type.id
+            )
+        ).all()
+        for inspected_at in _dates(
+            self.history_start,
+            self.now,
+            self._interval(equipment_type.inspection_days),
+            self.rng,
+        ):
+            inspection = EquipmentInspection(
+                equipment_id=equipment_id,
+                inspected_at=inspected_at,
+                created_by_user_id=user_id,
+                is_ok=True,
+            )
+            self.session.add(inspection)
+            self.session.flush()
+            assert inspection.id is not None
+            for item in items:
+                assert item.id is not None
+                self.session.add(
+                    EquipmentInspectionResponse(
+                        inspection_id=inspection.id,
+                        inspection_item_id=item.id,
+                        response_type=item.response_type,
+                        is_ok=True,
+                        **_response_values(item.response_type, self.rng),
+                    )
+                )
+            self._count("equipment_inspections")
+            self._count("equipment_inspection_responses", len(items))
+
+    def _add_verifications(self, equipment_id: int, equipment_type: EquipmentType, user_id: int) -> None:
+        verification_types = self.session.exec(
+            select(EquipmentTypeVerification).where(
+                EquipmentTypeVerification.equipment_type_id == equipment_type.id,
+                EquipmentTypeVerification.is_active == True,  # noqa: E712
+            )
+        ).all()
+        for verification_type in verification_types:
+            if verification_type.frequency_days <= 0 or verification_type.id is None:
+                continue
+            items = self.session.exec(
+                select(EquipmentTypeVerificationItem).where(
+                    EquipmentTypeVerificationItem.verification_type_id == verification_type.id
+                )
+            ).all()
+            for verified_at in _dates(
+                self.history_start,
+                self.now,
+                self._interval(verification_type.frequency_days),
+                self.rng,
+            ):
+                verification = EquipmentVerification(
+                    equipment_id=equipment_id,
+                    verification_type_id=verification_type.id,
+                    verified_at=verified_at,
+                    created_by_user_id=user_id,
+                    is_ok=True,
+                )
+                self.session.add(verification)
+                self.session.flush()
+                assert verification.id is not None
+                for item in items:
+                    assert item.id is not None
+                    self.session.add(
+                        EquipmentVerificationResponse(
+                            verification_id=verification.id,
+                            verification_item_id=item.id,
+                            response_type=item.response_type,
+                            is_ok=True,
+                            **_response_values(item.response_type, self.rng),
+                        )
+                    )
+                self._count("equipment_verifications")
+                self._count("equipment_verification_responses", len(items))
+
+    def _add_calibrations(self, equipment_id: int, equipment_type: EquipmentType, user_id: int) -> None:
+        if equipment_type.calibration_days <= 0:
+            return
+        for calibrated_at in _dates(
+            self.history_start,
+            self.now,
+            self._interval(equipment_type.calibration_days),
+            self.rng,
+        ):
+            calibration = EquipmentCalibration(
+                equipment_id=equipment_id,
+                calibrated_at=calibrated_at,
+                created_by_user_id=user_id,
+                certificate_number=f"C-{equipment_id}-{calibrated_at:%Y%m%d}",
+            )
+            self.session.add(calibration)
+            self.session.flush()
+            assert calibration.id is not None
+            for point in ("low", "mid", "high"):
+                reference_value = round(self.rng.uniform(0, 100), 2)
+                self.session.add(
+                    EquipmentCalibrationResult(
+                        calibration_id=calibration.id,
+                        point_label=point,
+                        reference_value=reference_value,
+                        measured_value=reference_value + round(self.rng.uniform(-0.5, 0.5), 2),
+                        is_ok=True,
+                    )
+                )
+            self._count("equipment_calibrations")
+            self._count("equipment_calibration_results", 3)
+
+    def _add_samples(self, terminal: CompanyTerminal, user_id: int) -> None:
+        assert terminal.id is not None
+        step = (self.now - self.history_start) / max(self.spec.samples_per_terminal, 1)
+        for index in range(self.spec.samples_per_terminal):
+            sequence = index + 1
+            created_at = self.history_start + step * index
+            sample = Sample(
+                terminal_id=terminal.id,
+                code=f"{terminal.terminal_code}-{sequence:04d}",
+                sequence=sequence,
+                created_by_user_id=user_id,
+                analyzed_at=created_at,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            self.session.add(sample)
+            self.session.flush()
+            assert sample.id is not None
+            lectura_api = round(self.rng.uniform(10, 45), 1)
+            self.session.add_all(
+                [
+                    SampleAnalysis(
+                        sample_id=sample.id,
+                        analysis_type=SampleAnalysisType.api_astm_1298,
+                        temp_obs_f=round(self.rng.uniform(60, 120), 1),
+                        lectura_api=lectura_api,
+                        api_60f=lectura_api,
+                    ),
+                    SampleAnalysis(
+                        sample_id=sample.id,
+                        analysis_type=SampleAnalysisType.water_astm_4377,
+                        water_value=round(self.rng.uniform(0, 2), 3),
+                    ),
+                ]
+            )
+            self._count("samples")
+            self._count("sample_analyses", 2)
+        self.session.add(
+            TerminalSampleCounter(
+                terminal_id=terminal.id,
+                next_sequence=self.spec.samples_per_terminal + 1,
+            )
+        )
+
+
+def generate_fleet(session: Session, spec: FleetSpec) -> Fleet:
+    """
+    Puebla la base con una flota sintética a partir de los catálogos de
+    `app/core/bootstrap/data`. Con la misma `seed` los volúmenes son los
+    mismos; las fechas se anclan al momento de ejecución.
+    """
+    return _FleetBuilder(session, spec).build()
@@ -0,0 +1,135 @@
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from benchmarks.generator import SUPERADMIN_EMAIL, SUPERADMIN_PASSWORD, Fleet
+
+API = "/api/v1"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    path: Callable[[Fleet], str]
+
+
+SCENARIOS: list[Scenario] = [
+    Scenario("equipment_list", lambda fleet: f"{API}/equipment/"),
+    Scenario(
+        "equipment_list_full_includes",
+        lambda fleet: (
+            f"{API}/equipment/?include=equipment_type,owner_company,terminal,creator,"
+            "inspections,verifications,calibrations"
+        ),
+    ),
+    Scenario(
+        "equipment_list_latest_includes",
+        lambda fleet: (f"{API}/equipment/?include=inspections:latest,verifications:latest,calibrations:latest"),
+    ),
+    Scenario("equipment_compliance", lambda fleet: f"{API}/equipment/compliance"),
+    Scenario(
+        "samples_by_terminal",
+        lambda fleet: f"{API}/samples/terminal/{fleet.terminal_ids[0]}",
+    ),
+    Scenario("users_with_terminals", lambda fleet: f"{API}/users/?include=company,terminals"),
+    Scenario(
+        "external_analyses_by_terminal",
+        lambda fleet: f"{API}/external-analyses/terminal/{fleet.terminal_ids[0]}",
+    ),
+    Scenario(
+        "external_analysis_records_by_terminal",
+        lambda fleet: f"{API}/external-analyses/records/terminal/{fleet.terminal_ids[0]}",
+    ),
+]
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def login(client: TestClient) -> dict[str, str]:
+    response = client.post(
+        f"{API}/auth/login",
+        data={"username": SUPERADMIN_EMAIL, "password": SUPERADMIN_PASSWORD},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def run_scenario(
+    client: TestClient,
+    headers: dict[str, str],
+    scenario: Scenario,
+    fleet: Fleet,
+    *,
+    iterations: int,
+    warmup: int,
+) -> dict[str, Any]:
+    """
+    Ejecuta un escenario y resume latencia y sentencias SQL por request.
+
+    El número de sentencias sale de la cabecera `X-DB-Queries` de
+    `QueryStatsMiddleware`.
+    """
+    path = scenario.path(fleet)
+    for _ in range(warmup):
+        client.get(path, headers=headers)
+
+    latencies_ms: list[float] = []
+    db_time_ms: list[float] = []
+    db_queries: list[int] = []
+    status_codes: set[int] = set()
+    response_bytes = 0
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies_ms.append((time.perf_counter() - started_at) * 1000)
+        status_codes.add(response.status_code)
+        response_bytes = len(response.content)
+        db_queries.append(int(response.headers.get("X-DB-Queries", 0)))
+        db_time_ms.append(float(response.headers.get("X-DB-Time-ms", 0)))
+
+    return {
+        "path": path,
+        "iterations": iterations,
+        "status_codes": sorted(status_codes),
+        "response_bytes": response_bytes,
+        "mean_ms": round(statistics.fmean(latencies_ms), 2),
+        "min_ms": round(min(latencies_ms), 2),
+        "p50_ms": round(_percentile(latencies_ms, 50), 2),
+        "p95_ms": round(_percentile(latencies_ms, 95), 2),
+        "p99_ms": round(_percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2),
+        "db_queries": max(db_queries),
+        "db_time_p50_ms": round(_percentile(db_time_ms, 50), 2),
+    }
+
+
+def run_scenarios(
+    client: TestClient,
+    fleet: Fleet,
+    *,
+    iterations: int = 20,
+    warmup: int = 2,
+    only: set[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    headers = login(client)
+    return {
+        scenario.name: run_scenario(
+            client,
+            headers,
+            scenario,
+            fleet,
+            iterations=iterations,
+            warmup=warmup,
+        )
+        for scenario in SCENARIOS
+        if not only or scenario.name in only
+    }
@@ -1,3 +1,6 @@
+from app.utils.pagination import encode_cursor
+
+
 def _login_headers(client, email: str, password: str) -> dict[str, str]:
     response = client.post(
         "/api/v1/auth/login",
@@ -623,6 +626,99 @@ def test_list_company_terminals_with_include_owner_company(client, auth_headers)
     assert "name" in terminal_with_company["owner_company"]
 
 
+def test_list_company_terminals_paginates_and_filters(client, auth_headers):
+    owner_company_id = _admin_company_id(client, auth_headers)
+    block_id = _create_block(client, auth_headers, owner_company_id)
+    admin_company_id = _create_admin_company(client, auth_headers)
+    created = [
+        _create_terminal(
+            client,
+            auth_headers,
+            owner_company_id=owner_company_id,
+            block_id=block_id,
+            admin_company_id=admin_company_id,
+            name=f"Paged Terminal {index}",
+            code=f"PG{index}",
+        )
+        for index in range(3)
+    ]
+    client.put(
+        f"/api/v1/company-terminals/{created[2]}",
+        json={"is_active": False},
+        headers=auth_headers,
+    )
+
+    seen: list[int] = []
+    params: dict = {"block_id": block_id, "limit": 2}
+    while True:
+        page = client.get("/api/v1/company-terminals/", params=params, headers=auth_headers).json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == created
+
+    active = client.get(
+        "/api/v1/company-terminals/",
+        params={"block_id": block_id, "is_active": "true"},
+        headers=auth_headers,
+    ).json()
+    assert [item["id"] for item in active["items"]] == created[:2]
+
+
+def test_list_company_terminals_invalid_cursor(client, auth_headers):
+    response = client.get(
+        "/api/v1/company-terminals/",
+        params={"cursor": "not-a-cursor"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_list_company_terminals_rejects_non_integer_cursor(client, auth_headers):
+    response = client.get(
+        "/api/v1/company-terminals/",
+        params={"cursor": encode_cursor({"a": 1})},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_list_company_terminals_includes_use_constant_queries(client, auth_headers):
+    owner_company_id = _admin_company_id(client, auth_headers)
+    block_id = _create_block(client, auth_headers, owner_company_id)
+    admin_company_id = _create_admin_company(client, auth_headers)
+    params = {"include": "block,owner_company,admin_company,creator", "limit": 500}
+
+    def list_with_includes():
+        # Primera request: refresca la sesión compartida de los tests tras los commits.
+        client.get("/api/v1/company-terminals/", params=params, headers=auth_headers)
+        response = client.get("/api/v1/company-terminals/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        return response
+
+    before = list_with_includes()
+    for index in range(2):
+        _create_terminal(
+            client,
+            auth_headers,
+            owner_company_id=owner_company_id,
+            block_id=block_id,
+            admin_company_id=admin_company_id,
+            name=f"Prefetch Terminal {index}",
+            code=f"PF{index}",
+        )
+    after = list_with_includes()
+
+    assert after.headers["X-DB-Queries"] == before.headers["X-DB-Queries"]
+    item = next(item for item in after.json()["items"] if item["terminal_code"] == "PF1")
+    assert item["block"]["id"] == block_id
+    assert item["owner_company"]["id"] == owner_company_id
+    assert item["admin_company"]["id"] == admin_company_id
+    assert item["creator"] is not None
+
+
 # ---------------------------------------------------------------------------
 # GET /company-terminals/{id} — auth, include, owner_company_id requerido
 # ---------------------------------------------------------------------------
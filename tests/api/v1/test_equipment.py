@@ -1,3 +1,7 @@
+import pytest
+
+from app.utils.pagination import encode_cursor
+
 # Module-level IDs cache — populated once per test session (lazy setup)
 _ids: dict = {}
 
@@ -369,6 +373,134 @@ def test_list_equipment(client, auth_headers):
     assert len(data["items"]) >= 1
 
 
+def test_list_equipment_keyset_pagination(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    created = [
+        _create_equipment(client, auth_headers, ids, serial=f"SN-PAGE-{n:03d}")
+        for n in range(3)
+    ]
+
+    first = client.get(
+        "/api/v1/equipment/?serial_prefix=SN-PAGE-&limit=2", headers=auth_headers
+    )
+    assert first.status_code == 200
+    first_data = first.json()
+    assert [i["id"] for i in first_data["items"]] == created[:2]
+    assert first_data["next_cursor"]
+
+    second = client.get(
+        "/api/v1/equipment/",
+        params={
+            "serial_prefix": "SN-PAGE-",
+            "limit": 2,
+            "cursor": first_data["next_cursor"],
+        },
+        headers=auth_headers,
+    )
+    assert second.status_code == 200
+    second_data = second.json()
+    assert [i["id"] for i in second_data["items"]] == created[2:]
+    assert second_data["next_cursor"] is None
+
+
+def test_list_equipment_filters(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    equipment_id = _create_equipment(client, auth_headers, ids, serial="SN-FILTER-001")
+
+    response = client.get(
+        "/api/v1/equipment/",
+        params={
+            "serial_prefix": "SN-FILTER-",
+            "status": "in_use",
+            "equipment_type_id": ids["eq_type_id"],
+            "terminal_id": ids["terminal_id"],
+            "is_active": True,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert [i["id"] for i in response.json()["items"]] == [equipment_id]
+
+    response = client.get(
+        "/api/v1/equipment/",
+        params={"serial_prefix": "SN-FILTER-", "status": "lost"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+def test_list_equipment_invalid_cursor(client, auth_headers):
+    response = client.get("/api/v1/equipment/?cursor=not-a-cursor", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("value", [{"a": 1}, "abc", None])
+def test_list_equipment_rejects_non_integer_cursor(client, auth_headers, value):
+    response = client.get(
+        "/api/v1/equipment/",
+        params={"cursor": encode_cursor(value)},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400
+
+
+def test_list_equipment_compliance(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    equipment_id = _create_equipment(client, auth_headers, ids, serial="SN-COMPLIANCE-001")
+
+    response = client.get(
+        "/api/v1/equipment/compliance",
+        params={"terminal_id": ids["terminal_id"], "compliance_type": "calibration"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    (row,) = [i for i in response.json()["items"] if i["equipment_id"] == equipment_id]
+    assert row["last_performed_at"] is None
+    assert row["frequency_days"] == 180
+    assert row["is_overdue"] is True
+
+    r = client.post(
+        f"/api/v1/equipment-calibrations/equipment/{equipment_id}",
+        json={
+            "calibration_company_id": ids["company_id"],
+            "certificate_number": "CERT-COMPLIANCE-1",
+            "calibrated_at": "2024-01-15T00:00:00",
+            "results": [],
+        },
+        headers=auth_headers,
+    )
+    assert r.status_code == 201
+
+    response = client.get(
+        "/api/v1/equipment/compliance",
+        params={
+            "terminal_id": ids["terminal_id"],
+            "compliance_type": "calibration",
+            "due_before": "2024-07-13T00:00:00Z",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert equipment_id not in [i["equipment_id"] for i in response.json()["items"]]
+
+    response = client.get(
+        "/api/v1/equipment/compliance",
+        params={
+            "terminal_id": ids["terminal_id"],
+            "compliance_type": "calibration",
+            "due_before": "2024-07-13T00:00:01Z",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    (row,) = [i for i in response.json()["items"] if i["equipment_id"] == equipment_id]
+    assert row["last_performed_at"].startswith("2024-01-15")
+    assert row["next_due_at"].startswith("2024-07-13")
+
+
 def test_list_equipment_requires_auth(client):
     response = client.get("/api/v1/equipment/")
 
@@ -449,6 +581,57 @@ def test_get_equipment_requires_auth(client, auth_headers):
     assert response.status_code == 401
 
 
+def test_get_equipment_include_latest_calibrations(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    equipment_id = _create_equipment(client, auth_headers, ids, serial="SN-LATEST-001")
+    for day in ("10", "20", "15"):
+        r = client.post(
+            f"/api/v1/equipment-calibrations/equipment/{equipment_id}",
+            json={
+                "calibration_company_id": ids["company_id"],
+                "certificate_number": f"CERT-LATEST-{day}",
+                "calibrated_at": f"2024-01-{day}T00:00:00",
+                "results": [],
+            },
+            headers=auth_headers,
+        )
+        assert r.status_code == 201
+
+    response = client.get(
+        f"/api/v1/equipment/{equipment_id}?include=calibrations:2",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    certificates = [c["certificate_number"] for c in response.json()["calibrations"]]
+    assert certificates == ["CERT-LATEST-20", "CERT-LATEST-15"]
+
+    response = client.get(
+        "/api/v1/equipment/",
+        params={"serial_prefix": "SN-LATEST-", "include": "calibrations:latest"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    (item,) = response.json()["items"]
+    assert [c["certificate_number"] for c in item["calibrations"]] == ["CERT-LATEST-20"]
+
+
+def test_get_equipment_include_invalid_modifier(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    equipment_id = _create_equipment(client, auth_headers, ids, serial="SN-LATEST-BAD")
+
+    response = client.get(
+        f"/api/v1/equipment/{equipment_id}?include=calibrations:0",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        f"/api/v1/equipment/{equipment_id}?include=terminal:latest",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 def test_get_equipment_include_owner_company(client, auth_headers):
     ids = _setup(client, auth_headers)
     eq_id = _create_equipment(client, auth_headers, ids, serial="SN-GET-OC-001")
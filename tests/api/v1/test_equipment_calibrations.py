@@ -275,6 +275,79 @@ def test_update_calibration_not_found(client, auth_headers):
     assert response.status_code == 404
 
 
+# ---------------------------------------------------------------------------
+# POST /equipment-calibrations/{calibration_id}/certificate
+# ---------------------------------------------------------------------------
+
+
+def _create_dated_calibration(client, auth_headers, ids: dict, calibrated_at: str, cert: str) -> int:
+    payload = _calibration_payload(ids["company_id"], cert=cert)
+    payload["calibrated_at"] = calibrated_at
+    response = client.post(
+        f"/api/v1/equipment-calibrations/equipment/{ids['equipment_id']}",
+        json=payload,
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _upload_certificate(client, auth_headers, calibration_id: int) -> dict:
+    response = client.post(
+        f"/api/v1/equipment-calibrations/{calibration_id}/certificate",
+        files={"file": ("certificado.pdf", b"%PDF-1.4 cert", "application/pdf")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202
+    return response.json()
+
+
+def test_upload_certificate_is_queued_then_stored_by_worker(
+    client, auth_headers, local_storage, run_upload_worker
+):
+    ids = _setup(client, auth_headers)
+    calibration_id = _create_dated_calibration(
+        client, auth_headers, ids, "2023-03-01T00:00:00", "CERT-UPLOAD"
+    )
+
+    job = _upload_certificate(client, auth_headers, calibration_id)
+
+    assert job["status"] == "pending"
+    assert job["kind"] == "calibration_certificate"
+    assert job["terminal_id"] == ids["terminal_id"]
+    before = client.get(f"/api/v1/equipment-calibrations/{calibration_id}", headers=auth_headers)
+    assert before.json()["certificate_pdf_url"] is None
+
+    run_upload_worker()
+
+    job = client.get(f"/api/v1/upload-jobs/{job['id']}", headers=auth_headers).json()
+    assert job["status"] == "done"
+    after = client.get(f"/api/v1/equipment-calibrations/{calibration_id}", headers=auth_headers)
+    assert after.json()["certificate_pdf_url"] == job["result_url"]
+    stored = local_storage / f"calibration_certificates/{calibration_id}"
+    assert [path.read_bytes() for path in stored.rglob("*.pdf")] == [b"%PDF-1.4 cert"]
+
+
+def test_upload_certificate_fails_when_calibration_is_deleted(
+    client, auth_headers, local_storage, run_upload_worker
+):
+    ids = _setup(client, auth_headers)
+    calibration_id = _create_dated_calibration(
+        client, auth_headers, ids, "2023-04-01T00:00:00", "CERT-UPLOAD-DELETED"
+    )
+    job = _upload_certificate(client, auth_headers, calibration_id)
+    deleted = client.delete(f"/api/v1/equipment-calibrations/{calibration_id}", headers=auth_headers)
+    assert deleted.status_code == 204
+
+    run_upload_worker()
+
+    job = client.get(f"/api/v1/upload-jobs/{job['id']}", headers=auth_headers).json()
+    assert job["status"] == "failed"
+    assert job["last_error"] == "Upload target not found"
+    assert not (local_storage / f"calibration_certificates/{calibration_id}").exists()
+    assert list((local_storage.parent / "spool").glob("*")) == []
+
+
 # ---------------------------------------------------------------------------
 # DELETE /equipment-calibrations/{calibration_id}
 # ---------------------------------------------------------------------------
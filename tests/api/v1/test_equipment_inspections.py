@@ -298,6 +298,61 @@ def test_list_inspections(client, auth_headers):
     assert len(data["items"]) >= 1
 
 
+def test_list_inspections_paginates_with_range_filter(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    url = f"/api/v1/equipment-inspections/equipment/{ids['equipment_id']}"
+    june = {"inspected_from": "2024-06-01T00:00:00Z"}
+
+    def create(day: str) -> None:
+        created = client.post(
+            url,
+            json=_ok_inspection_payload(ids, date=f"{day}T08:00:00"),
+            headers=auth_headers,
+        )
+        assert created.status_code == 201
+
+    def list_page(**params):
+        response = client.get(url, params=params, headers=auth_headers)
+        assert response.status_code == 200
+        return response
+
+    # Cada medición va precedida de una request que refresca la sesión
+    # compartida de los tests tras los commits de `create`.
+    create("2024-06-01")
+    list_page(**june)
+    before = list_page(**june)
+    create("2024-06-02")
+    create("2024-06-03")
+    list_page(**june)
+    after = list_page(**june)
+    # Las respuestas se cargan en una sola consulta para toda la página.
+    assert after.headers["X-DB-Queries"] == before.headers["X-DB-Queries"]
+    assert [item["inspected_at"][:10] for item in after.json()["items"]] == [
+        "2024-06-03",
+        "2024-06-02",
+        "2024-06-01",
+    ]
+    assert all(len(item["responses"]) == 1 for item in after.json()["items"])
+
+    params = {**june, "inspected_to": "2024-06-02T23:59:59Z", "limit": 1}
+    first = list_page(**params).json()
+    assert [item["inspected_at"][:10] for item in first["items"]] == ["2024-06-02"]
+    assert first["next_cursor"]
+    second = list_page(**params, before=first["next_cursor"]).json()
+    assert [item["inspected_at"][:10] for item in second["items"]] == ["2024-06-01"]
+    assert second["next_cursor"] is None
+
+
+def test_list_inspections_invalid_cursor(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    response = client.get(
+        f"/api/v1/equipment-inspections/equipment/{ids['equipment_id']}",
+        params={"before": "not-a-cursor"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 def test_list_inspections_equipment_not_found(client, auth_headers):
     response = client.get(
         "/api/v1/equipment-inspections/equipment/999999",
@@ -213,6 +213,36 @@ def test_list_verifications(client, auth_headers):
     assert len(data["items"]) >= 1
 
 
+def test_list_verifications_paginates_with_range_filter(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    url = f"/api/v1/equipment-verifications/equipment/{ids['equipment_id']}"
+    for day in ("2024-06-01", "2024-06-02", "2024-06-03"):
+        created = client.post(
+            url,
+            json=_verification_payload(ids, date=f"{day}T08:00:00"),
+            headers=auth_headers,
+        )
+        assert created.status_code == 201
+
+    params = {
+        "verified_from": "2024-06-01T00:00:00Z",
+        "verified_to": "2024-06-02T23:59:59Z",
+        "limit": 1,
+    }
+    first = client.get(url, params=params, headers=auth_headers)
+    assert first.status_code == 200
+    data = first.json()
+    assert [item["verified_at"][:10] for item in data["items"]] == ["2024-06-02"]
+    assert data["next_cursor"]
+
+    second = client.get(
+        url, params={**params, "before": data["next_cursor"]}, headers=auth_headers
+    )
+    assert second.status_code == 200
+    assert [item["verified_at"][:10] for item in second.json()["items"]] == ["2024-06-01"]
+    assert second.json()["next_cursor"] is None
+
+
 def test_list_verifications_equipment_not_found(client, auth_headers):
     response = client.get(
         "/api/v1/equipment-verifications/equipment/999999",
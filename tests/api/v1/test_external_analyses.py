@@ -1,3 +1,52 @@
+from datetime import UTC, datetime, timedelta
+
+import anyio
+from fastapi import HTTPException
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import get_settings
+from app.models.external_analysis_record import ExternalAnalysisRecord
+from app.models.external_analysis_terminal import ExternalAnalysisTerminal
+from app.models.external_analysis_type import ExternalAnalysisType
+from app.models.upload_job import UploadJob
+from app.services import upload_queue
+from app.services.storage import LocalStorage, get_storage
+from app.utils.external_analysis_catalog import invalidate_analysis_type_catalog
+
+
+class _FlakyStorage(LocalStorage):
+    """Backend local que falla las primeras `failures` subidas."""
+
+    def __init__(self, root, base_url: str, *, failures: int) -> None:
+        super().__init__(root, base_url)
+        self.failures = failures
+
+    async def upload(self, path, chunks, content_type):
+        if self.failures:
+            self.failures -= 1
+            raise HTTPException(status_code=502, detail="Storage upload failed")
+        return await super().upload(path, chunks, content_type)
+
+
+class _HookStorage(LocalStorage):
+    """Backend local que corre `before_upload` una vez antes de la primera subida."""
+
+    def __init__(self, root, base_url: str, before_upload) -> None:
+        super().__init__(root, base_url)
+        self.before_upload = before_upload
+
+    async def upload(self, path, chunks, content_type):
+        hook, self.before_upload = self.before_upload, None
+        if hook is not None:
+            await hook()
+        return await super().upload(path, chunks, content_type)
+
+
+def _stored_file(local_storage, url: str):
+    return local_storage / get_storage().path_from_url(url)
+
+
 # Module-level IDs cache — populated once per test session (lazy setup)
 _ids: dict = {}
 
@@ -123,6 +172,27 @@ def test_list_types_no_auth_required(client, auth_headers):
     assert len(data["items"]) >= 1
 
 
+def test_list_types_reads_changes_made_by_other_workers(client, auth_headers, session):
+    ids = _setup(client, auth_headers)
+    client.get("/api/v1/external-analyses/types")
+
+    # Otro proceso renombra el tipo: la caché de este proceso no se entera.
+    row = session.get(ExternalAnalysisType, ids["analysis_type_id"])
+    original_name = row.name
+    row.name = "Renamed By Another Worker"
+    session.add(row)
+    session.commit()
+    try:
+        response = client.get("/api/v1/external-analyses/types")
+        names = {item["id"]: item["name"] for item in response.json()["items"]}
+        assert names[ids["analysis_type_id"]] == "Renamed By Another Worker"
+    finally:
+        row.name = original_name
+        session.add(row)
+        session.commit()
+        invalidate_analysis_type_catalog()
+
+
 # ---------------------------------------------------------------------------
 # POST /external-analyses/types
 # ---------------------------------------------------------------------------
@@ -315,6 +385,144 @@ def test_delete_analysis_type_requires_admin(client, auth_headers):
     assert response.status_code == 403
 
 
+# ---------------------------------------------------------------------------
+# GET /external-analyses/due
+# ---------------------------------------------------------------------------
+
+
+def _create_due_fixture(client, auth_headers, session) -> dict:
+    ids = _setup(client, auth_headers)
+    block = client.post(
+        "/api/v1/company-blocks/",
+        json={"name": "EXT Due Block", "is_active": True, "company_id": ids["company_id"]},
+        headers=auth_headers,
+    )
+    assert block.status_code == 201
+    block_id = block.json()["id"]
+    terminal_ids = []
+    for name, code in (("EXT Due One", "EXD1"), ("EXT Due Two", "EXD2")):
+        terminal = client.post(
+            "/api/v1/company-terminals/",
+            json={
+                "name": name,
+                "is_active": True,
+                "has_lab": True,
+                "block_id": block_id,
+                "owner_company_id": ids["company_id"],
+                "admin_company_id": ids["company_id"],
+                "terminal_code": code,
+            },
+            headers=auth_headers,
+        )
+        assert terminal.status_code == 201
+        terminal_ids.append(terminal.json()["id"])
+    type_ids = []
+    for name, frequency_days, is_active in (
+        ("EXT Due A", 10, True),
+        ("EXT Due B", 0, True),
+        ("EXT Due Inactive", 10, False),
+    ):
+        atype = client.post(
+            "/api/v1/external-analyses/types",
+            json={"name": name, "default_frequency_days": frequency_days, "is_active": is_active},
+            headers=auth_headers,
+        )
+        assert atype.status_code == 201
+        type_ids.append(atype.json()["id"])
+    type_a, type_b, _inactive = type_ids
+    first, _second = terminal_ids
+
+    # Frecuencia propia de la terminal para un tipo sin frecuencia por defecto.
+    upsert = client.post(
+        f"/api/v1/external-analyses/terminal/{first}",
+        json={"analysis_type_id": type_b, "is_active": True},
+        headers=auth_headers,
+    )
+    assert upsert.status_code == 200
+    config = session.exec(
+        select(ExternalAnalysisTerminal).where(
+            ExternalAnalysisTerminal.terminal_id == first,
+            ExternalAnalysisTerminal.analysis_type_id == type_b,
+        )
+    ).one()
+    config.frequency_days = 5
+    session.add(config)
+    session.commit()
+
+    for type_id, performed_at in (
+        (type_a, "2023-12-01T00:00:00Z"),
+        (type_a, "2024-01-01T00:00:00Z"),
+        (type_b, "2024-02-01T00:00:00Z"),
+    ):
+        _create_record(
+            client,
+            auth_headers,
+            {"terminal_id": first, "analysis_type_id": type_id},
+            performed_at=performed_at,
+        )
+    return {"block_id": block_id, "terminal_ids": terminal_ids, "type_ids": type_ids}
+
+
+def test_list_due_sorted_by_urgency_and_paginated(client, auth_headers, session):
+    due = _create_due_fixture(client, auth_headers, session)
+    first, second = due["terminal_ids"]
+    type_a, type_b, inactive = due["type_ids"]
+
+    response = client.get(
+        "/api/v1/external-analyses/due",
+        params={"block_id": due["block_id"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert all(item["terminal_id"] in (first, second) for item in items)
+    assert all(item["analysis_type_id"] != inactive for item in items)
+    ours = [
+        (item["terminal_id"], item["analysis_type_id"], item["next_due_at"])
+        for item in items
+        if item["analysis_type_id"] in (type_a, type_b)
+    ]
+    assert [(t, a) for t, a, _ in ours] == [(second, type_a), (first, type_a), (first, type_b)]
+    assert ours[0][2] is None
+    assert ours[1][2].startswith("2024-01-11")
+    assert ours[2][2].startswith("2024-02-06")
+    assert all(item["is_overdue"] for item in items)
+
+    # La misma lista recorrida de a una fila por cursor.
+    paged = []
+    params = {"block_id": due["block_id"], "limit": 1}
+    while True:
+        page = client.get(
+            "/api/v1/external-analyses/due", params=params, headers=auth_headers
+        )
+        assert page.status_code == 200
+        paged.extend(page.json()["items"])
+        if not page.json()["next_cursor"]:
+            break
+        params["cursor"] = page.json()["next_cursor"]
+    assert paged == items
+
+    before = client.get(
+        "/api/v1/external-analyses/due",
+        params={"block_id": due["block_id"], "before": "2024-02-01T00:00:00Z"},
+        headers=auth_headers,
+    )
+    assert before.status_code == 200
+    assert (first, type_b) not in {
+        (item["terminal_id"], item["analysis_type_id"]) for item in before.json()["items"]
+    }
+    assert len(before.json()["items"]) == len(items) - 1
+
+
+def test_list_due_invalid_cursor(client, auth_headers):
+    response = client.get(
+        "/api/v1/external-analyses/due",
+        params={"cursor": "not-a-cursor"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 # ---------------------------------------------------------------------------
 # GET /external-analyses/terminal/{id}
 # ---------------------------------------------------------------------------
@@ -374,6 +582,47 @@ def test_list_terminal_analyses_next_due_at_computed(client, auth_headers):
     assert matching[0]["next_due_at"] is not None
 
 
+def test_list_terminal_analyses_constant_queries(client, auth_headers):
+    """last_performed_at sale de una consulta agrupada, no de una por tipo."""
+    ids = _setup(client, auth_headers)
+    url = f"/api/v1/external-analyses/terminal/{ids['terminal_id']}"
+
+    def list_analyses():
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        return response
+
+    list_analyses()
+    before = list_analyses()
+    type_ids = []
+    for name, frequency_days in (("EXT Grouped A", 10), ("EXT Grouped B", 0)):
+        atype = client.post(
+            "/api/v1/external-analyses/types",
+            json={"name": name, "default_frequency_days": frequency_days, "is_active": True},
+            headers=auth_headers,
+        )
+        assert atype.status_code == 201
+        type_ids.append(atype.json()["id"])
+    for performed_at in ("2024-01-01T00:00:00Z", "2024-03-01T00:00:00Z"):
+        for type_id in type_ids:
+            _create_record(
+                client,
+                auth_headers,
+                {**ids, "analysis_type_id": type_id},
+                performed_at=performed_at,
+            )
+    list_analyses()
+    after = list_analyses()
+
+    assert after.headers["X-DB-Queries"] == before.headers["X-DB-Queries"]
+    items = {item["analysis_type_id"]: item for item in after.json()["items"]}
+    grouped_a, grouped_b = (items[type_id] for type_id in type_ids)
+    assert grouped_a["last_performed_at"].startswith("2024-03-01")
+    assert grouped_a["next_due_at"].startswith("2024-03-11")
+    assert grouped_b["last_performed_at"].startswith("2024-03-01")
+    assert grouped_b["next_due_at"] is None
+
+
 # ---------------------------------------------------------------------------
 # POST /external-analyses/terminal/{id}  (upsert config)
 # ---------------------------------------------------------------------------
@@ -600,6 +849,84 @@ def test_list_records_filter_by_type(client, auth_headers):
     assert all(i["analysis_type_id"] == type2_id for i in data["items"])
 
 
+def test_list_records_paginates_with_range_filter(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    url = f"/api/v1/external-analyses/records/terminal/{ids['terminal_id']}"
+    range_params = {
+        "performed_from": "2022-01-01T00:00:00Z",
+        "performed_to": "2022-12-31T23:59:59Z",
+    }
+
+    def list_page(**params):
+        response = client.get(url, params=params, headers=auth_headers)
+        assert response.status_code == 200
+        return response
+
+    lab = client.post(
+        "/api/v1/companies/",
+        json={"name": "EXT Range Lab", "company_type": "client"},
+        headers=auth_headers,
+    )
+    assert lab.status_code == 201
+    lab_id = lab.json()["id"]
+    lab_name = lab.json()["name"]
+
+    # Cada medición va precedida de una request que refresca la sesión
+    # compartida de los tests tras los commits de `_create_record`.
+    _create_record(
+        client,
+        auth_headers,
+        ids,
+        performed_at="2022-01-01T00:00:00Z",
+        analysis_company_id=lab_id,
+    )
+    list_page(**range_params)
+    before = list_page(**range_params)
+    _create_record(
+        client,
+        auth_headers,
+        ids,
+        performed_at="2022-02-01T00:00:00Z",
+        analysis_company_id=lab_id,
+    )
+    _create_record(client, auth_headers, ids, performed_at="2022-03-01T00:00:00Z")
+    _create_record(client, auth_headers, ids, performed_at="2023-01-01T00:00:00Z")
+    list_page(**range_params)
+    after = list_page(**range_params)
+
+    # Nombres de tipo desde el catálogo y de empresa en una sola consulta.
+    assert after.headers["X-DB-Queries"] == before.headers["X-DB-Queries"]
+    items = after.json()["items"]
+    assert [item["performed_at"][:10] for item in items] == [
+        "2022-03-01",
+        "2022-02-01",
+        "2022-01-01",
+    ]
+    assert {item["analysis_type_name"] for item in items} == {"EXT Test Analysis"}
+    assert [item["analysis_company_name"] for item in items] == [
+        None,
+        lab_name,
+        lab_name,
+    ]
+
+    first = list_page(**range_params, limit=2).json()
+    assert [item["id"] for item in first["items"]] == [item["id"] for item in items[:2]]
+    assert first["next_cursor"]
+    second = list_page(**range_params, limit=2, cursor=first["next_cursor"]).json()
+    assert [item["id"] for item in second["items"]] == [items[2]["id"]]
+    assert second["next_cursor"] is None
+
+
+def test_list_records_invalid_cursor(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    response = client.get(
+        f"/api/v1/external-analyses/records/terminal/{ids['terminal_id']}",
+        params={"cursor": "not-a-cursor"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 def test_list_records_terminal_not_found(client, auth_headers):
     response = client.get(
         "/api/v1/external-analyses/records/terminal/999999",
@@ -619,6 +946,216 @@ def test_list_records_requires_auth(client, auth_headers):
     assert response.status_code == 401
 
 
+# ---------------------------------------------------------------------------
+# POST /external-analyses/records/{id}/report
+# ---------------------------------------------------------------------------
+
+
+def _upload_report(client, auth_headers, record_id: int, content: bytes) -> dict:
+    response = client.post(
+        f"/api/v1/external-analyses/records/{record_id}/report",
+        files={"file": ("informe.pdf", content, "application/pdf")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202
+    return response.json()
+
+
+def _get_upload_job(client, auth_headers, job_id: int) -> dict:
+    response = client.get(f"/api/v1/upload-jobs/{job_id}", headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_upload_report_is_queued_then_stored_by_worker(
+    client, auth_headers, session, local_storage, run_upload_worker
+):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+
+    job = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 report")
+
+    assert job["status"] == "pending"
+    assert job["kind"] == "external_analysis_report"
+    assert job["target_id"] == record_id
+    assert not (local_storage / f"external_analysis_reports/{record_id}").exists()
+
+    assert run_upload_worker() >= 1
+
+    job = _get_upload_job(client, auth_headers, job["id"])
+    assert job["status"] == "done"
+    assert job["attempts"] == 1
+    assert f"/external_analysis_reports/{record_id}/" in job["result_url"]
+    assert job["result_url"].endswith("/report.pdf")
+    assert _stored_file(local_storage, job["result_url"]).read_bytes() == b"%PDF-1.4 report"
+    assert list((local_storage.parent / "spool").glob("*")) == []
+    session.expire_all()
+    record = session.get(ExternalAnalysisRecord, record_id)
+    assert record is not None
+    assert record.report_pdf_url == job["result_url"]
+
+
+def _expire_upload_job(session, job_id: int, **values) -> None:
+    """Adelanta los plazos de un trabajo como si hubiera pasado el tiempo."""
+    session.exec(update(UploadJob).where(UploadJob.id == job_id).values(**values))
+    session.commit()
+
+
+def test_upload_report_retries_after_storage_error(
+    client, auth_headers, session, local_storage, run_upload_worker, monkeypatch
+):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+    storage = _FlakyStorage(local_storage, get_settings().storage_local_base_url, failures=1)
+    monkeypatch.setattr(upload_queue, "get_storage", lambda: storage)
+
+    job = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 retry")
+    run_upload_worker()
+
+    job = _get_upload_job(client, auth_headers, job["id"])
+    assert job["status"] == "pending"
+    assert job["attempts"] == 1
+    assert job["last_error"] == "Storage upload failed"
+    assert datetime.fromisoformat(job["next_attempt_at"]).replace(tzinfo=UTC) > datetime.now(UTC)
+    assert list((local_storage.parent / "spool").glob("*.pdf"))
+    run_upload_worker()
+    assert _get_upload_job(client, auth_headers, job["id"])["attempts"] == 1
+
+    _expire_upload_job(session, job["id"], next_attempt_at=datetime.now(UTC) - timedelta(seconds=1))
+    run_upload_worker()
+
+    job = _get_upload_job(client, auth_headers, job["id"])
+    assert job["status"] == "done"
+    assert job["attempts"] == 2
+    assert job["last_error"] is None
+    assert _stored_file(local_storage, job["result_url"]).read_bytes() == b"%PDF-1.4 retry"
+
+
+def test_upload_job_late_worker_cannot_overwrite_reclaimed_job(
+    client, auth_headers, session, async_engine, local_storage, run_upload_worker
+):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+    job = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 lease")
+
+    async def claim():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            return await upload_queue.claim_next_upload_job(async_session)
+
+    async def process(claimed):
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            await upload_queue.process_upload_job(async_session, *claimed)
+
+    stale = anyio.run(claim)
+    assert stale is not None and stale[0].id == job["id"]
+    # El arriendo del primer worker vence y otro worker termina el trabajo.
+    _expire_upload_job(session, job["id"], locked_until=datetime.now(UTC) - timedelta(seconds=1))
+    run_upload_worker()
+    done = _get_upload_job(client, auth_headers, job["id"])
+    assert done["status"] == "done"
+    assert done["attempts"] == 2
+
+    # El worker tardío ya no tiene spool ni arriendo: no debe tocar el trabajo.
+    anyio.run(process, stale)
+
+    assert _get_upload_job(client, auth_headers, job["id"]) == done
+
+
+def test_upload_report_newer_job_supersedes_older(
+    client, auth_headers, local_storage, run_upload_worker
+):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+
+    first = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 first")
+    second = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 second")
+    run_upload_worker()
+
+    first = _get_upload_job(client, auth_headers, first["id"])
+    assert first["status"] == "failed"
+    assert first["last_error"] == f"Superseded by upload job {second['id']}"
+    second = _get_upload_job(client, auth_headers, second["id"])
+    assert second["status"] == "done"
+    assert _stored_file(local_storage, second["result_url"]).read_bytes() == b"%PDF-1.4 second"
+
+
+def test_upload_report_older_job_finishing_late_keeps_newer_file(
+    client, auth_headers, session, async_engine, local_storage, monkeypatch
+):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+    first = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 first")
+    second = {}
+
+    async def newer_upload_lands_first():
+        # Mientras el primer trabajo sube, llega otro y termina antes.
+        second.update(_upload_report(client, auth_headers, record_id, b"%PDF-1.4 second"))
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            assert await upload_queue.process_pending_uploads(async_session) == 1
+
+    storage = _HookStorage(
+        local_storage, get_settings().storage_local_base_url, newer_upload_lands_first
+    )
+    monkeypatch.setattr(upload_queue, "get_storage", lambda: storage)
+
+    async def process_first():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            return await upload_queue.process_pending_uploads(async_session, batch_size=1)
+
+    assert anyio.run(process_first) == 1
+
+    first = _get_upload_job(client, auth_headers, first["id"])
+    assert first["status"] == "failed"
+    assert first["last_error"] == f"Superseded by upload job {second['id']}"
+    second = _get_upload_job(client, auth_headers, second["id"])
+    assert second["status"] == "done"
+    session.expire_all()
+    record = session.get(ExternalAnalysisRecord, record_id)
+    assert record is not None
+    assert record.report_pdf_url == second["result_url"]
+    stored = list((local_storage / f"external_analysis_reports/{record_id}").rglob("*.pdf"))
+    assert stored == [_stored_file(local_storage, second["result_url"])]
+    assert stored[0].read_bytes() == b"%PDF-1.4 second"
+
+
+def test_upload_report_replacement_deletes_previous_file(
+    client, auth_headers, local_storage, run_upload_worker
+):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+    first = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 first")
+    run_upload_worker()
+    second = _upload_report(client, auth_headers, record_id, b"%PDF-1.4 second")
+    run_upload_worker()
+
+    first = _get_upload_job(client, auth_headers, first["id"])
+    second = _get_upload_job(client, auth_headers, second["id"])
+    assert first["status"] == second["status"] == "done"
+    assert not _stored_file(local_storage, first["result_url"]).exists()
+    assert _stored_file(local_storage, second["result_url"]).read_bytes() == b"%PDF-1.4 second"
+
+
+def test_upload_report_rejects_oversized_pdf(client, auth_headers, local_storage, monkeypatch):
+    ids = _setup(client, auth_headers)
+    record_id = _create_record(client, auth_headers, ids)
+    monkeypatch.setattr(get_settings(), "upload_max_pdf_bytes", 8)
+
+    response = client.post(
+        f"/api/v1/external-analyses/records/{record_id}/report",
+        files={"file": ("informe.pdf", b"%PDF-1.4 too large", "application/pdf")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 413
+    assert list((local_storage.parent / "spool").glob("*")) == []
+
+
+def test_get_upload_job_not_found(client, auth_headers):
+    response = client.get("/api/v1/upload-jobs/999999", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
 # ---------------------------------------------------------------------------
 # PATCH /external-analyses/records/{id}
 # ---------------------------------------------------------------------------
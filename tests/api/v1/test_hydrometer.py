@@ -44,3 +44,33 @@ def test_calculate_api_60f_out_of_range(client, auth_headers):
         headers=auth_headers,
     )
     assert response.status_code == 400
+
+
+def test_calculate_api_60f_batch(client, auth_headers):
+    readings = [
+        {"temp_obs_f": 60.0, "lectura_api": 30.0},
+        {"temp_obs_f": 9999.0, "lectura_api": 30.0},
+        {"temp_obs_f": 80.0, "lectura_api": 30.0},
+    ]
+    response = client.post(
+        "/api/v1/hydrometer/api60f/batch",
+        json={"items": readings},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 3
+    for reading, item in zip(readings, items, strict=True):
+        single = client.post("/api/v1/hydrometer/api60f", json=reading, headers=auth_headers)
+        if single.status_code == 200:
+            assert item == {"api_60f": single.json()["api_60f"], "error": None}
+        else:
+            assert item == {"api_60f": None, "error": single.json()["detail"]}
+
+
+def test_calculate_api_60f_batch_requires_auth(client):
+    response = client.post(
+        "/api/v1/hydrometer/api60f/batch",
+        json={"items": [{"temp_obs_f": 60.0, "lectura_api": 30.0}]},
+    )
+    assert response.status_code == 401
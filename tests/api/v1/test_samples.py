@@ -1,10 +1,16 @@
+import csv
+import io
+import json
 from datetime import UTC, datetime, timedelta
 
 from sqlmodel import select
 
 from app.core.security.password import hash_password
 from app.models.enums import UserType
+from app.models.terminal_sample_counter import TerminalSampleCounter
 from app.models.user import User
+from app.utils.sample_retention import dispose_due_samples, sweep_sample_retention
+from app.utils.sample_sequence import allocate_sample_sequences
 
 _ids: dict = {}
 
@@ -137,6 +143,45 @@ def test_create_sample_increments_sequence(client, auth_headers):
     assert r2.json()["sequence"] == r1.json()["sequence"] + 1
 
 
+def test_allocate_sample_sequences_reserves_block(client, auth_headers, session):
+    ids = _setup(client, auth_headers)
+    latest = client.post("/api/v1/samples/", json=_sample_payload(ids), headers=auth_headers)
+    assert latest.status_code == 201
+
+    first = allocate_sample_sequences(session, ids["terminal_id"], count=3)
+    session.commit()
+    assert first == latest.json()["sequence"] + 1
+
+    following = client.post("/api/v1/samples/", json=_sample_payload(ids), headers=auth_headers)
+    assert following.status_code == 201
+    assert following.json()["sequence"] == first + 3
+
+    terminal = client.get(
+        f"/api/v1/company-terminals/{ids['terminal_id']}",
+        params={"owner_company_id": ids["company_id"]},
+        headers=auth_headers,
+    )
+    assert terminal.json()["next_sample_sequence"] == first + 4
+
+
+def test_allocate_sample_sequences_creates_missing_counter(client, auth_headers, session):
+    ids = _setup(client, auth_headers)
+    latest = client.post("/api/v1/samples/", json=_sample_payload(ids), headers=auth_headers)
+    assert latest.status_code == 201
+    counter = session.get(TerminalSampleCounter, ids["terminal_id"])
+    assert counter is not None
+    session.delete(counter)
+    session.commit()
+
+    created = client.post("/api/v1/samples/", json=_sample_payload(ids), headers=auth_headers)
+    assert created.status_code == 201
+    assert created.json()["sequence"] == latest.json()["sequence"] + 1
+    session.expire_all()
+    counter = session.get(TerminalSampleCounter, ids["terminal_id"])
+    assert counter is not None
+    assert counter.next_sequence == created.json()["sequence"] + 1
+
+
 def test_create_sample_empty_identifier(client, auth_headers):
     ids = _setup(client, auth_headers)
     payload = _sample_payload(ids)
@@ -170,6 +215,54 @@ def test_create_sample_rejects_analyzed_at_older_than_72_hours_for_user(
     assert response.status_code == 400
 
 
+# ---------------------------------------------------------------------------
+# POST /samples/batch
+# ---------------------------------------------------------------------------
+
+
+def test_create_samples_batch(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    latest = client.post("/api/v1/samples/", json=_sample_payload(ids), headers=auth_headers)
+    items = [dict(_sample_payload(ids), identifier=f"LOTE-{i}") for i in range(3)]
+    response = client.post("/api/v1/samples/batch", json={"items": items}, headers=auth_headers)
+    assert response.status_code == 201
+    created = response.json()["items"]
+    first = latest.json()["sequence"] + 1
+    assert [item["sequence"] for item in created] == [first, first + 1, first + 2]
+    assert [item["identifier"] for item in created] == ["LOTE-0", "LOTE-1", "LOTE-2"]
+    assert created[0]["code"] == f"SMP-{first:04d}"
+    assert created[2]["analyses"][0]["api_60f"] is not None
+
+
+def test_create_samples_batch_reports_errors_by_index(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    before = client.get(f"/api/v1/samples/terminal/{ids['terminal_id']}", headers=auth_headers).json()
+    items = [
+        _sample_payload(ids),
+        dict(_sample_payload(ids), identifier="  "),
+        dict(_sample_payload(ids), terminal_id=999999),
+    ]
+    response = client.post("/api/v1/samples/batch", json={"items": items}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == [
+        {"index": 1, "detail": "Identifier is required"},
+        {"index": 2, "detail": "Terminal not found"},
+    ]
+    after = client.get(f"/api/v1/samples/terminal/{ids['terminal_id']}", headers=auth_headers).json()
+    assert len(after["items"]) == len(before["items"])
+
+
+def test_create_samples_batch_rejects_empty(client, auth_headers):
+    response = client.post("/api/v1/samples/batch", json={"items": []}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_create_samples_batch_requires_auth(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    response = client.post("/api/v1/samples/batch", json={"items": [_sample_payload(ids)]})
+    assert response.status_code == 401
+
+
 # ---------------------------------------------------------------------------
 # GET /samples/terminal/{terminal_id}
 # ---------------------------------------------------------------------------
@@ -224,12 +317,213 @@ def test_list_samples_empty_terminal(client, auth_headers):
     assert response.json().get("message") == "No records found"
 
 
+def test_list_samples_paginates_newest_first(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    for i in range(3):
+        client.post(
+            "/api/v1/samples/",
+            json=dict(_sample_payload(ids), identifier=f"PAGE-{i}"),
+            headers=auth_headers,
+        )
+    url = f"/api/v1/samples/terminal/{ids['terminal_id']}"
+    everything = client.get(url, params={"limit": 500}, headers=auth_headers).json()["items"]
+    assert [item["id"] for item in everything] == sorted((item["id"] for item in everything), reverse=True)
+
+    seen: list[int] = []
+    params: dict = {"limit": 2}
+    while True:
+        page = client.get(url, params=params, headers=auth_headers).json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [item["id"] for item in everything]
+
+    ascending = client.get(url, params={"order": "asc", "limit": 500}, headers=auth_headers).json()["items"]
+    assert [item["id"] for item in ascending] == list(reversed(seen))
+
+
+def test_list_samples_filters(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    created = client.post(
+        "/api/v1/samples/",
+        json=dict(_sample_payload(ids), identifier="FILTRO-XYZ"),
+        headers=auth_headers,
+    ).json()
+    url = f"/api/v1/samples/terminal/{ids['terminal_id']}"
+
+    by_identifier = client.get(url, params={"identifier_prefix": "FILTRO-"}, headers=auth_headers).json()
+    assert [item["id"] for item in by_identifier["items"]] == [created["id"]]
+
+    by_code = client.get(url, params={"code_prefix": created["code"]}, headers=auth_headers).json()
+    assert [item["id"] for item in by_code["items"]] == [created["id"]]
+
+    pending = client.get(url, params={"disposed": "false", "limit": 500}, headers=auth_headers).json()
+    assert created["id"] in [item["id"] for item in pending["items"]]
+    disposed = client.get(url, params={"disposed": "true"}, headers=auth_headers).json()
+    assert created["id"] not in [item["id"] for item in disposed["items"]]
+
+    future = (datetime.now(UTC) + timedelta(days=1)).isoformat()
+    later = client.get(url, params={"created_from": future}, headers=auth_headers).json()
+    assert later["items"] == []
+    earlier = client.get(url, params={"created_to": future, "limit": 500}, headers=auth_headers).json()
+    assert created["id"] in [item["id"] for item in earlier["items"]]
+
+
+def test_list_samples_invalid_cursor(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    response = client.get(
+        f"/api/v1/samples/terminal/{ids['terminal_id']}",
+        params={"cursor": "not-a-cursor"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 def test_list_samples_requires_auth(client, auth_headers):
     ids = _setup(client, auth_headers)
     response = client.get(f"/api/v1/samples/terminal/{ids['terminal_id']}")
     assert response.status_code == 401
 
 
+# ---------------------------------------------------------------------------
+# GET /samples/terminal/{terminal_id}/export
+# ---------------------------------------------------------------------------
+
+
+def test_export_samples_csv(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    created = client.post(
+        "/api/v1/samples/",
+        json=dict(_sample_payload(ids), identifier="EXPORT-CSV"),
+        headers=auth_headers,
+    ).json()
+    response = client.get(
+        f"/api/v1/samples/terminal/{ids['terminal_id']}/export",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    exported = [row for row in rows if row["sample_id"] == str(created["id"])]
+    assert len(exported) == 1
+    assert exported[0]["code"] == created["code"]
+    assert exported[0]["api_60f"] == str(created["analyses"][0]["api_60f"])
+    listed = client.get(
+        f"/api/v1/samples/terminal/{ids['terminal_id']}",
+        params={"limit": 500},
+        headers=auth_headers,
+    ).json()["items"]
+    assert {row["sample_id"] for row in rows} == {str(item["id"]) for item in listed}
+
+
+def test_export_samples_ndjson_with_range(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    created = client.post(
+        "/api/v1/samples/",
+        json=dict(_sample_payload(ids), identifier="EXPORT-NDJSON"),
+        headers=auth_headers,
+    ).json()
+    response = client.get(
+        f"/api/v1/samples/terminal/{ids['terminal_id']}/export",
+        params={"format": "ndjson", "from": created["created_at"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["sample_id"] for record in records] == [created["id"]]
+    assert records[0]["identifier"] == "EXPORT-NDJSON"
+    assert records[0]["analysis_type"] == "api_astm_1298"
+
+    future = (datetime.now(UTC) + timedelta(days=1)).isoformat()
+    empty = client.get(
+        f"/api/v1/samples/terminal/{ids['terminal_id']}/export",
+        params={"format": "ndjson", "from": future},
+        headers=auth_headers,
+    )
+    assert empty.status_code == 200
+    assert empty.text == ""
+
+
+def test_export_samples_requires_auth(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    response = client.get(f"/api/v1/samples/terminal/{ids['terminal_id']}/export")
+    assert response.status_code == 401
+
+
+# ---------------------------------------------------------------------------
+# GET /samples/due-for-disposal
+# ---------------------------------------------------------------------------
+
+
+def test_create_sample_sets_disposal_due_at(client, auth_headers):
+    ids = _setup(client, auth_headers)
+    created = client.post(
+        "/api/v1/samples/",
+        json=dict(_sample_payload(ids), retention_days=30),
+        headers=auth_headers,
+    ).json()
+    created_at = datetime.fromisoformat(created["created_at"])
+    assert datetime.fromisoformat(created["disposal_due_at"]) == created_at + timedelta(days=30)
+
+    updated = client.patch(
+        f"/api/v1/samples/{created['id']}",
+        json={"retention_days": 10},
+        headers=auth_headers,
+    ).json()
+    assert datetime.fromisoformat(updated["disposal_due_at"]) == created_at + timedelta(days=10)
+
+
+def test_due_for_disposal_and_sweeper(client, auth_headers, session):
+    ids = _setup(client, auth_headers)
+    due = client.post(
+        "/api/v1/samples/",
+        json=dict(_sample_payload(ids), retention_days=0),
+        headers=auth_headers,
+    ).json()
+    kept = client.post(
+        "/api/v1/samples/",
+        json=dict(_sample_payload(ids), retention_days=365),
+        headers=auth_headers,
+    ).json()
+
+    response = client.get(
+        "/api/v1/samples/due-for-disposal",
+        params={"terminal_id": ids["terminal_id"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    listed = [item["id"] for item in response.json()["items"]]
+    assert due["id"] in listed
+    assert kept["id"] not in listed
+
+    assert sweep_sample_retention(session, dispose=False) >= 1
+    assert dispose_due_samples(session, batch_size=1) >= 1
+
+    after = client.get(
+        "/api/v1/samples/due-for-disposal",
+        params={"terminal_id": ids["terminal_id"]},
+        headers=auth_headers,
+    ).json()
+    assert due["id"] not in [item["id"] for item in after["items"]]
+    disposed = client.get(
+        f"/api/v1/samples/terminal/{ids['terminal_id']}",
+        params={"disposed": "true", "limit": 500},
+        headers=auth_headers,
+    ).json()["items"]
+    swept = next(item for item in disposed if item["id"] == due["id"])
+    assert swept["disposed_at"] is not None
+    assert swept["disposed_by_user_id"] is None
+
+
+def test_due_for_disposal_requires_auth(client):
+    response = client.get("/api/v1/samples/due-for-disposal")
+    assert response.status_code == 401
+
+
 # ---------------------------------------------------------------------------
 # PATCH /samples/{sample_id}
 # ---------------------------------------------------------------------------
@@ -323,6 +617,19 @@ def test_delete_sample_only_latest(client, auth_headers):
     )
     assert response.status_code == 204
 
+    # El consecutivo liberado se reutiliza.
+    recreated = client.post(
+        "/api/v1/samples/",
+        json={
+            "terminal_id": ids["terminal_id"],
+            "identifier": "MUESTRA-RECREATED",
+            "analyses": [],
+        },
+        headers=auth_headers,
+    )
+    assert recreated.status_code == 201
+    assert recreated.json()["sequence"] == create.json()["sequence"]
+
 
 def test_delete_sample_not_found(client, auth_headers):
     response = client.delete(
@@ -376,6 +376,53 @@ def test_update_my_password(client, auth_headers):
     assert response.status_code == 204
 
 
+def test_update_my_password_invalidates_access_token(client, auth_headers):
+    assert client.get("/api/v1/users/me", headers=auth_headers).status_code == 200
+
+    response = client.put(
+        "/api/v1/users/me/password",
+        json={
+            "current_password": "supersecret123",
+            "new_password": "newsupersecret456",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 204
+
+    me_response = client.get("/api/v1/users/me", headers=auth_headers)
+    assert me_response.status_code == 401
+
+
+def test_deactivate_user_invalidates_access_token(client, auth_headers):
+    company_id = _admin_company_id(client, auth_headers)
+    create_response = client.post(
+        "/api/v1/users/",
+        json={
+            "name": "User",
+            "last_name": "ToDeactivate",
+            "email": "deactivate-token@test.com",
+            "password": "supersecret123",
+            "is_active": True,
+            "company_id": company_id,
+        },
+        headers=auth_headers,
+    )
+    assert create_response.status_code == 201
+    user_id = create_response.json()["id"]
+    user_headers = _login_headers(client, "deactivate-token@test.com", "supersecret123")
+    assert client.get("/api/v1/users/me", headers=user_headers).status_code == 200
+
+    response = client.put(
+        f"/api/v1/users/{user_id}",
+        json={"is_active": False},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    me_response = client.get("/api/v1/users/me", headers=user_headers)
+    assert me_response.status_code == 401
+
+
 def test_update_my_password_wrong_current(client, auth_headers):
     response = client.put(
         "/api/v1/users/me/password",
@@ -522,6 +569,41 @@ def test_update_me_invalid_photo_url(client, auth_headers):
     assert response.status_code == 422
 
 
+def test_upload_user_photo(client, auth_headers, local_storage):
+    company_id = _admin_company_id(client, auth_headers)
+    created = client.post(
+        "/api/v1/users/",
+        json={
+            "name": "Foto",
+            "last_name": "Usuario",
+            "email": "photo.upload@example.com",
+            "password": "supersecret123",
+            "user_type": "user",
+            "company_id": company_id,
+        },
+        headers=auth_headers,
+    )
+    assert created.status_code == 201
+    user_id = created.json()["id"]
+
+    response = client.post(
+        f"/api/v1/users/{user_id}/photo",
+        files={"file": ("avatar.png", b"\x89PNG image", "image/png")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["photo_url"].endswith(f"/profile_pictures/{user_id}/avatar.png")
+    assert (local_storage / f"profile_pictures/{user_id}/avatar.png").read_bytes() == b"\x89PNG image"
+
+    invalid = client.post(
+        f"/api/v1/users/{user_id}/photo",
+        files={"file": ("notes.txt", b"text", "text/plain")},
+        headers=auth_headers,
+    )
+    assert invalid.status_code == 400
+
+
 def test_update_my_password_changes_login(client, auth_headers):
     company_id = _admin_company_id(client, auth_headers)
     create_response = client.post(
@@ -728,3 +810,76 @@ def test_admin_cannot_delete_superadmin(client, auth_headers, session):
         headers=admin_headers,
     )
     assert delete_response.status_code == 403
+
+
+def test_list_users_with_includes_uses_constant_queries(client, auth_headers):
+    company_id = _admin_company_id(client, auth_headers)
+    block = client.post(
+        "/api/v1/company-blocks/",
+        json={"name": "UsersPrefetch Block", "is_active": True, "company_id": company_id},
+        headers=auth_headers,
+    )
+    admin_co = client.post(
+        "/api/v1/companies/",
+        json={"name": "UsersPrefetch Co", "company_type": "client"},
+        headers=auth_headers,
+    )
+    terminal_ids = []
+    for index in range(2):
+        terminal = client.post(
+            "/api/v1/company-terminals/",
+            json={
+                "name": f"UsersPrefetch Terminal {index}",
+                "terminal_code": f"UPF{index}",
+                "is_active": True,
+                "has_lab": True,
+                "block_id": block.json()["id"],
+                "owner_company_id": company_id,
+                "admin_company_id": admin_co.json()["id"],
+            },
+            headers=auth_headers,
+        )
+        assert terminal.status_code == 201
+        terminal_ids.append(terminal.json()["id"])
+
+    def create_users(prefix: str) -> None:
+        for index in range(3):
+            response = client.post(
+                "/api/v1/users/",
+                json={
+                    "name": "Prefetch",
+                    "last_name": "User",
+                    "email": f"{prefix}{index}@prefetch.com",
+                    "password": "supersecret123",
+                    "company_id": company_id,
+                    "terminal_ids": terminal_ids,
+                },
+                headers=auth_headers,
+            )
+            assert response.status_code == 201
+
+    def list_with_includes():
+        response = client.get(
+            "/api/v1/users/",
+            params={"include": "company,terminals"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        return response
+
+    # Cada medición va precedida de una request que refresca la sesión
+    # compartida de los tests tras los commits de `create_users`.
+    create_users("first")
+    list_with_includes()
+    before = list_with_includes()
+    create_users("second")
+    list_with_includes()
+    after = list_with_includes()
+
+    assert after.headers["X-DB-Queries"] == before.headers["X-DB-Queries"]
+    items = {item["email"]: item for item in after.json()["items"]}
+    linked = items["second0@prefetch.com"]
+    assert linked["terminal_ids"] == terminal_ids
+    assert linked["company"]["id"] == company_id
+    superadmin = next(item for item in items.values() if item["user_type"] == "superadmin")
+    assert set(terminal_ids) <= set(superadmin["terminal_ids"])
@@ -3,19 +3,26 @@ import os
 # Must be set before any app imports so get_settings() caches the correct env
 os.environ["APP_ENV"] = "test"
 
+import anyio  # noqa: E402
 import pytest  # noqa: E402
 from argon2 import PasswordHasher  # noqa: E402
 from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
 from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
 
 import app.core.security.password as _pwd_module  # noqa: E402
 import app.models  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
 from app.core.security.password import hash_password  # noqa: E402
-from app.db.session import get_session  # noqa: E402
+from app.db.session import get_async_session, get_session  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.company import Company  # noqa: E402
 from app.models.enums import CompanyType, UserType  # noqa: E402
 from app.models.user import User  # noqa: E402
+from app.services.storage import get_storage  # noqa: E402
+from app.services.upload_queue import process_pending_uploads  # noqa: E402
 
 # Use minimal Argon2 parameters in tests to avoid slow hashing
 _pwd_module._ph = PasswordHasher(
@@ -38,6 +45,16 @@ def engine(tmp_path_factory):
     return engine
 
 
+@pytest.fixture(scope="session")
+def async_engine(engine):
+    # NullPool: each TestClient request runs on its own event loop, so
+    # aiosqlite connections must not be reused across requests.
+    return create_async_engine(
+        engine.url.set(drivername="sqlite+aiosqlite"),
+        poolclass=NullPool,
+    )
+
+
 @pytest.fixture(scope="session")
 def session(engine):
     with Session(engine) as session:
@@ -70,11 +87,16 @@ def session(engine):
 
 
 @pytest.fixture()
-def client(session):
+def client(session, async_engine):
     def get_session_override():
         yield session
 
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
 
     with TestClient(app) as client:
         yield client
@@ -82,6 +104,33 @@ def client(session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture()
+def local_storage(tmp_path, monkeypatch):
+    """Backend de archivos en un directorio temporal, sin Supabase."""
+    settings = get_settings()
+    root = tmp_path / "storage"
+    monkeypatch.setattr(settings, "storage_backend", "local")
+    monkeypatch.setattr(settings, "storage_local_root", str(root))
+    monkeypatch.setattr(settings, "upload_spool_dir", str(tmp_path / "spool"))
+    get_storage.cache_clear()
+    yield root
+    get_storage.cache_clear()
+
+
+@pytest.fixture()
+def run_upload_worker(async_engine, local_storage):
+    """Procesa la cola de subidas como una pasada del worker del lifespan."""
+
+    def run(**kwargs) -> int:
+        async def process() -> int:
+            async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+                return await process_pending_uploads(async_session, **kwargs)
+
+        return anyio.run(process)
+
+    return run
+
+
 @pytest.fixture()
 def auth_headers(client, session: Session):
     admin = session.exec(select(User).where(User.email == "admin@local.dev")).first()
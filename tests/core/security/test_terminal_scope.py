@@ -0,0 +1,75 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from app.core.security.terminal_scope import TerminalScope
+from app.core.security.user_cache import clear_user_cache
+from app.db.session import get_session
+from app.main import app
+from app.models.enums import UserType
+from app.models.equipment import Equipment
+from app.models.user import User
+
+
+def _user(user_type: UserType = UserType.user) -> User:
+    return User(
+        id=9101,
+        name="Scope",
+        last_name="User",
+        email="scope@test.com",
+        user_type=user_type,
+        is_active=True,
+        password_hash="x",
+    )
+
+
+def test_unrestricted_scope_allows_any_terminal():
+    scope = TerminalScope(_user(UserType.superadmin))
+
+    assert scope.is_restricted is False
+    assert scope.has_access(1)
+    assert scope.has_access(None)
+    scope.check(42)
+
+
+def test_restricted_scope_checks_membership():
+    scope = TerminalScope(_user(), [1, 2])
+
+    assert scope.is_restricted is True
+    assert scope.has_access(2)
+    assert not scope.has_access(3)
+    assert not scope.has_access(None)
+    with pytest.raises(HTTPException) as exc_info:
+        scope.check(3)
+    assert exc_info.value.status_code == 403
+
+
+def test_apply_filters_statement_only_when_restricted():
+    statement = select(Equipment)
+
+    assert TerminalScope(_user()).apply(statement, Equipment.terminal_id) is statement
+
+    filtered = TerminalScope(_user(), [5, 4]).apply(statement, Equipment.terminal_id)
+    compiled = filtered.compile(compile_kwargs={"literal_binds": True})
+    assert "equipment.terminal_id IN (4, 5)" in str(compiled)
+
+
+def _no_sync_session():
+    raise AssertionError("async route opened a sync session")
+    yield
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/api/v1/equipment/", "/api/v1/company-terminals/", "/api/v1/samples/due-for-disposal"],
+)
+def test_async_listings_resolve_user_and_scope_without_sync_session(client, auth_headers, url):
+    clear_user_cache()
+    app.dependency_overrides[get_session] = _no_sync_session
+    try:
+        # Sin caché (carga el usuario) y con caché (lo adjunta a la AsyncSession).
+        assert client.get(url, headers=auth_headers).status_code == 200
+        assert client.get(url, headers=auth_headers).status_code == 200
+        assert client.get(url, headers={"Authorization": "Bearer invalid"}).status_code == 401
+    finally:
+        del app.dependency_overrides[get_session]
@@ -0,0 +1,77 @@
+from app.core.security.user_cache import (
+    cache_user,
+    clear_user_cache,
+    get_cached_user,
+    get_user_generation,
+    invalidate_user,
+    revoke_user_tokens,
+)
+from app.models.enums import UserType
+from app.models.user import User
+
+
+def _user(user_id: int = 9001, token_version: int = 0) -> User:
+    return User(
+        id=user_id,
+        name="Cache",
+        last_name="User",
+        email=f"cache{user_id}@test.com",
+        user_type=UserType.user,
+        is_active=True,
+        password_hash="x",
+        token_version=token_version,
+    )
+
+
+def test_cache_user_keyed_by_token_version():
+    clear_user_cache()
+    user = _user()
+    cache_user(user, [3, 5], get_user_generation(9001))
+
+    entry = get_cached_user(9001, 0)
+    assert entry is not None
+    assert entry.terminal_ids == (3, 5)
+    assert entry.data["email"] == "cache9001@test.com"
+    assert get_cached_user(9001, 1) is None
+
+
+def test_revoke_user_tokens_bumps_version_and_evicts():
+    clear_user_cache()
+    user = _user()
+    cache_user(user, [], get_user_generation(9001))
+
+    revoke_user_tokens(user)
+
+    assert user.token_version == 1
+    assert get_cached_user(9001, 0) is None
+
+
+def test_revoke_user_tokens_evicts_after_commit(session):
+    clear_user_cache()
+    user = _user(user_id=9002)
+    session.add(user)
+    session.commit()
+
+    revoke_user_tokens(user)
+    # Una request concurrente que leyó el usuario antes del commit.
+    stale = _user(user_id=9002)
+    cache_user(stale, [], get_user_generation(9002))
+    assert get_cached_user(9002, 0) is not None
+
+    session.add(user)
+    session.commit()
+
+    assert get_cached_user(9002, 0) is None
+    session.delete(user)
+    session.commit()
+
+
+def test_cache_user_skips_stale_load():
+    clear_user_cache()
+    user = _user()
+    generation = get_user_generation(9001)
+    invalidate_user(9001)
+
+    cache_user(user, [], generation)
+
+    assert get_cached_user(9001, 0) is None
@@ -0,0 +1,23 @@
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.core.bootstrap import ensure_bootstrap_data
+from app.core.config import get_settings
+from app.models.equipment import Equipment
+from app.models.equipment_compliance import EquipmentCompliance
+
+
+def test_bootstrap_equipment_gets_compliance_rows(monkeypatch):
+    monkeypatch.setattr(get_settings(), "superadmin_password", "supersecret123")
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        ensure_bootstrap_data(session, app_env="development", include_development_data=True)
+
+        equipment_ids = set(session.exec(select(Equipment.id)).all())
+        compliance_ids = set(
+            session.exec(select(func.distinct(EquipmentCompliance.equipment_id))).all()
+        )
+
+    assert equipment_ids
+    assert compliance_ids == equipment_ids
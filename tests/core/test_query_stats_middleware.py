@@ -0,0 +1,66 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.middleware import QueryStatsMiddleware
+
+
+def _app_with_repeated_queries(engine, repeat_threshold: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, repeat_threshold=repeat_threshold)
+
+    @app.get("/repeat")
+    def repeat() -> dict[str, int]:
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return {"ok": 1}
+
+    return app
+
+
+def test_query_stats_headers_on_api_request(client):
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert float(response.headers["X-DB-Time-ms"]) >= 0
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert "X-DB-Repeated-Queries" not in response.headers
+
+
+def test_query_stats_counts_statements_and_logs(engine, caplog):
+    app = _app_with_repeated_queries(engine, repeat_threshold=0)
+    with caplog.at_level(logging.INFO, logger="app.db.queries"):
+        response = TestClient(app).get("/repeat")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "4"
+    assert 'desc="4 queries"' in response.headers["Server-Timing"]
+    assert "X-DB-Repeated-Queries" not in response.headers
+
+    records = [r for r in caplog.records if r.name == "app.db.queries"]
+    assert len(records) == 1
+    assert records[0].db_queries == 4
+    assert records[0].path == "/repeat"
+    assert records[0].status == 200
+
+
+def test_query_stats_flags_repeated_statements(engine, caplog):
+    app = _app_with_repeated_queries(engine, repeat_threshold=2)
+    with caplog.at_level(logging.INFO, logger="app.db.queries"):
+        response = TestClient(app).get("/repeat")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Repeated-Queries"] == "1"
+
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "SELECT 1" in warnings[0].getMessage()
+    assert "3 times" in warnings[0].getMessage()
+
+
+def test_query_stats_counts_async_session_queries(client, auth_headers):
+    response = client.get("/api/v1/equipment/", headers=auth_headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) >= 1
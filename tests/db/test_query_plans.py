@@ -0,0 +1,183 @@
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import desc, func, tuple_
+from sqlmodel import select
+
+from app.models.equipment_calibration import (
+    EquipmentCalibration,
+    EquipmentCalibrationResult,
+)
+from app.models.equipment_inspection import (
+    EquipmentInspection,
+    EquipmentInspectionResponse,
+)
+from app.models.equipment_reading import EquipmentReading
+from app.models.equipment_status_history import EquipmentStatusHistory
+from app.models.equipment_terminal_history import EquipmentTerminalHistory
+from app.models.equipment_type_history import EquipmentTypeHistory
+from app.models.equipment_verification import (
+    EquipmentVerification,
+    EquipmentVerificationResponse,
+)
+from app.models.external_analysis_record import ExternalAnalysisRecord
+from app.models.sample import Sample, SampleAnalysis
+from app.models.user_terminal import UserTerminal
+from app.utils.sample_retention import due_for_disposal_statement
+
+SINCE = datetime(2024, 1, 1, tzinfo=UTC)
+
+# (consulta, índice esperado): mismas formas que usan los endpoints.
+HOT_QUERIES = [
+    (
+        select(EquipmentReading)
+        .where(EquipmentReading.equipment_id == 1)
+        .order_by(desc(EquipmentReading.measured_at)),
+        "ix_equipment_reading_equipment_measured",
+    ),
+    (
+        select(EquipmentInspection)
+        .where(EquipmentInspection.equipment_id == 1)
+        .order_by(desc(EquipmentInspection.inspected_at)),
+        "ix_equipment_inspection_equipment_inspected",
+    ),
+    (
+        select(func.max(EquipmentInspection.inspected_at)).where(
+            EquipmentInspection.equipment_id == 1
+        ),
+        "ix_equipment_inspection_equipment_inspected",
+    ),
+    (
+        select(EquipmentInspectionResponse).where(
+            EquipmentInspectionResponse.inspection_id.in_([1, 2, 3])  # type: ignore[attr-defined]
+        ),
+        "ix_equipment_inspection_response_inspection_id",
+    ),
+    (
+        select(EquipmentVerification)
+        .where(EquipmentVerification.equipment_id == 1)
+        .order_by(desc(EquipmentVerification.verified_at)),
+        "ix_equipment_verification_equipment_verified",
+    ),
+    (
+        select(
+            EquipmentVerification.verification_type_id,
+            func.max(EquipmentVerification.verified_at),
+        )
+        .where(EquipmentVerification.equipment_id == 1)
+        .group_by(EquipmentVerification.verification_type_id),  # type: ignore[arg-type]
+        "ix_equipment_verification_equipment_type_verified",
+    ),
+    (
+        select(EquipmentVerificationResponse).where(
+            EquipmentVerificationResponse.verification_id.in_([1, 2, 3])  # type: ignore[attr-defined]
+        ),
+        "ix_equipment_verification_response_verification_id",
+    ),
+    (
+        select(EquipmentCalibration)
+        .where(EquipmentCalibration.equipment_id == 1)
+        .order_by(desc(EquipmentCalibration.calibrated_at)),
+        "ix_equipment_calibration_equipment_calibrated",
+    ),
+    (
+        select(EquipmentCalibrationResult).where(
+            EquipmentCalibrationResult.calibration_id == 1
+        ),
+        "ix_equipment_calibration_result_calibration_id",
+    ),
+    (
+        select(EquipmentStatusHistory).where(
+            EquipmentStatusHistory.equipment_id == 1,
+            EquipmentStatusHistory.ended_at.is_(None),  # type: ignore[union-attr]
+        ),
+        "ix_equipment_status_history_equipment_ended",
+    ),
+    (
+        select(EquipmentTerminalHistory).where(
+            EquipmentTerminalHistory.equipment_id == 1,
+            EquipmentTerminalHistory.ended_at.is_(None),  # type: ignore[union-attr]
+        ),
+        "ix_equipment_terminal_history_equipment_ended",
+    ),
+    (
+        select(EquipmentTypeHistory).where(
+            EquipmentTypeHistory.equipment_id == 1,
+            EquipmentTypeHistory.ended_at.is_(None),  # type: ignore[union-attr]
+        ),
+        "ix_equipment_type_history_equipment_ended",
+    ),
+    (
+        select(Sample)
+        .where(
+            Sample.terminal_id == 1,
+            tuple_(Sample.created_at, Sample.id) < tuple_(SINCE, 100),
+        )
+        .order_by(desc(Sample.created_at), desc(Sample.id))
+        .limit(101),
+        "ix_sample_terminal_created_id",
+    ),
+    (
+        due_for_disposal_statement(SINCE).limit(101),
+        "ix_sample_disposal_due_pending",
+    ),
+    (
+        select(SampleAnalysis).where(
+            SampleAnalysis.sample_id.in_([1, 2, 3])  # type: ignore[attr-defined]
+        ),
+        "ix_sample_analysis_sample_id",
+    ),
+    (
+        select(ExternalAnalysisRecord)
+        .where(
+            ExternalAnalysisRecord.terminal_id == 1,
+            ExternalAnalysisRecord.analysis_type_id == 1,
+        )
+        .order_by(desc(ExternalAnalysisRecord.performed_at)),
+        "ix_external_analysis_record_terminal_type_performed",
+    ),
+    (
+        select(ExternalAnalysisRecord)
+        .where(
+            ExternalAnalysisRecord.terminal_id == 1,
+            tuple_(ExternalAnalysisRecord.performed_at, ExternalAnalysisRecord.id)
+            < tuple_(SINCE, 100),
+        )
+        .order_by(desc(ExternalAnalysisRecord.performed_at), desc(ExternalAnalysisRecord.id))
+        .limit(101),
+        "ix_external_analysis_record_terminal_performed_id",
+    ),
+    (
+        select(
+            ExternalAnalysisRecord.analysis_type_id,
+            func.max(ExternalAnalysisRecord.performed_at),
+        )
+        .where(ExternalAnalysisRecord.terminal_id == 1)
+        .group_by(ExternalAnalysisRecord.analysis_type_id),
+        "ix_external_analysis_record_terminal_type_performed",
+    ),
+    (
+        select(UserTerminal.terminal_id).where(UserTerminal.user_id == 1),
+        # El índice de la restricción única empieza por user_id.
+        "sqlite_autoindex_user_terminal_1",
+    ),
+]
+
+
+def _query_plan(engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("statement", "index_name"),
+    HOT_QUERIES,
+    ids=[index_name for _statement, index_name in HOT_QUERIES],
+)
+def test_hot_query_uses_index(engine, statement, index_name):
+    plan = _query_plan(engine, statement)
+    assert f"INDEX {index_name}" in plan, plan
+    # El orden/agrupación también debe salir del índice, sin ordenar aparte.
+    assert "TEMP B-TREE" not in plan, plan
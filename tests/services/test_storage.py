@@ -0,0 +1,88 @@
+import io
+
+import anyio
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.services.storage import (
+    LocalStorage,
+    check_upload_size,
+    iter_upload,
+    upload_external_analysis_report,
+)
+
+
+def _upload(data: bytes, *, content_type: str, filename: str, size: int | None) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(data),
+        size=size,
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+async def _collect(file: UploadFile, max_bytes: int) -> bytes:
+    return b"".join([chunk async for chunk in iter_upload(file, max_bytes, "El PDF")])
+
+
+def test_local_storage_upload_replaces_and_deletes(tmp_path):
+    storage = LocalStorage(tmp_path, "/storage")
+
+    async def chunks(*parts: bytes):
+        for part in parts:
+            yield part
+
+    async def scenario() -> str:
+        await storage.upload("reports/1/report.pdf", chunks(b"old"), "application/pdf")
+        url = await storage.upload(
+            "reports/1/report.pdf", chunks(b"%PDF", b"-new"), "application/pdf"
+        )
+        assert (tmp_path / "reports/1/report.pdf").read_bytes() == b"%PDF-new"
+        assert list((tmp_path / "reports/1").iterdir()) == [tmp_path / "reports/1/report.pdf"]
+        path = storage.path_from_url(url)
+        assert path == "reports/1/report.pdf"
+        await storage.delete(path)
+        return url
+
+    assert anyio.run(scenario) == "/storage/reports/1/report.pdf"
+    assert not (tmp_path / "reports/1/report.pdf").exists()
+
+
+def test_local_storage_rejects_paths_outside_root(tmp_path):
+    storage = LocalStorage(tmp_path / "root", "/storage")
+
+    async def chunks():
+        yield b"x"
+
+    with pytest.raises(HTTPException) as exc:
+        anyio.run(storage.upload, "../escape.pdf", chunks(), "application/pdf")
+    assert exc.value.status_code == 400
+
+
+def test_size_limit_checked_before_reading():
+    file = _upload(b"x" * 10, content_type="application/pdf", filename="a.pdf", size=10)
+    with pytest.raises(HTTPException) as exc:
+        check_upload_size(file, 5, "El PDF")
+    assert exc.value.status_code == 413
+    assert file.file.tell() == 0
+
+
+def test_iter_upload_stops_when_undeclared_size_exceeds_limit():
+    file = _upload(b"x" * 10, content_type="application/pdf", filename="a.pdf", size=None)
+    assert anyio.run(_collect, file, 10) == b"x" * 10
+    with pytest.raises(HTTPException) as exc:
+        anyio.run(_collect, file, 9)
+    assert exc.value.status_code == 413
+
+
+def test_upload_external_analysis_report_validates_pdf(local_storage):
+    not_pdf = _upload(b"text", content_type="text/plain", filename="a.txt", size=4)
+    with pytest.raises(HTTPException) as exc:
+        anyio.run(upload_external_analysis_report, not_pdf, 7)
+    assert exc.value.status_code == 400
+
+    pdf = _upload(b"%PDF-1.4", content_type="application/pdf", filename="a.pdf", size=8)
+    url = anyio.run(upload_external_analysis_report, pdf, 7)
+    assert url == "http://localhost:8080/storage/external_analysis_reports/7/report.pdf"
+    assert (local_storage / "external_analysis_reports/7/report.pdf").read_bytes() == b"%PDF-1.4"
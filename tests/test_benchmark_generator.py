@@ -0,0 +1,31 @@
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.models.equipment import Equipment
+from app.models.equipment_compliance import EquipmentCompliance
+from app.models.sample import Sample
+from benchmarks.generator import FleetSpec, generate_fleet
+
+
+def test_generate_fleet_small_scale(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    SQLModel.metadata.create_all(engine)
+    spec = FleetSpec(
+        companies=1,
+        terminals_per_company=2,
+        equipment_per_terminal=2,
+        users_per_company=2,
+        samples_per_terminal=3,
+        years=1,
+    )
+    with Session(engine) as session:
+        fleet = generate_fleet(session, spec)
+
+        assert len(fleet.terminal_ids) == 2
+        assert fleet.counts["equipment"] == 4
+        assert fleet.counts["samples"] == 6
+        assert fleet.counts["users"] == 2
+        assert fleet.counts["equipment_readings"] > 0
+        assert session.exec(select(func.count()).select_from(Equipment)).one() == 4
+        assert session.exec(select(func.count()).select_from(Sample)).one() == 6
+        assert session.exec(select(func.count()).select_from(EquipmentCompliance)).one() >= 8
+    engine.dispose()
@@ -0,0 +1,11 @@
+def test_health_db_reports_pool_status(client):
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert "pool" in data
+    if data["pool"] == "QueuePool":
+        assert data["checked_out"] >= 0
+        assert data["idle"] >= 0
+        assert data["size"] >= 1
+    assert "pool" in data["async_pool"]
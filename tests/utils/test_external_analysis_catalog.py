@@ -0,0 +1,42 @@
+from sqlmodel import Session
+
+from app.models.external_analysis_type import ExternalAnalysisType
+from app.utils.external_analysis_catalog import (
+    get_analysis_type_catalog,
+    invalidate_analysis_type_catalog,
+)
+
+
+def _add_type(session: Session, name: str) -> int:
+    row = ExternalAnalysisType(name=name, default_frequency_days=0, created_by_user_id=1)
+    session.add(row)
+    session.commit()
+    session.refresh(row)
+    assert row.id is not None
+    return row.id
+
+
+def test_catalog_is_reused_until_invalidated(session: Session):
+    invalidate_analysis_type_catalog()
+    type_id = _add_type(session, "Catalog Cached")
+    catalog = get_analysis_type_catalog(session)
+    assert catalog.names()[type_id] == "Catalog Cached"
+
+    row = session.get(ExternalAnalysisType, type_id)
+    assert row is not None
+    row.name = "Catalog Renamed"
+    session.add(row)
+    session.commit()
+    assert get_analysis_type_catalog(session) is catalog
+
+    invalidate_analysis_type_catalog()
+    assert get_analysis_type_catalog(session).names()[type_id] == "Catalog Renamed"
+
+
+def test_catalog_reloads_for_unknown_ids(session: Session):
+    catalog = get_analysis_type_catalog(session)
+    type_id = _add_type(session, "Catalog Created Elsewhere")
+    assert type_id not in catalog.types
+
+    reloaded = get_analysis_type_catalog(session, [type_id])
+    assert reloaded.names()[type_id] == "Catalog Created Elsewhere"
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from app.utils.hydrometer import api_60f_crude, api_60f_crude_batch
+
+
+def test_api_60f_crude_batch_matches_scalar_across_valid_range():
+    temps, apis = np.meshgrid(np.linspace(-58.0, 302.0, 145), np.linspace(0.5, 100.0, 200))
+    batch = api_60f_crude_batch(temps.ravel(), apis.ravel())
+    assert batch.valid.all()
+    expected = [api_60f_crude(t, a) for t, a in zip(temps.ravel().tolist(), apis.ravel().tolist(), strict=True)]
+    assert batch.values() == expected
+
+
+def test_api_60f_crude_batch_masks_invalid_inputs():
+    temps = [60.0, 400.0, 60.0, 60.0]
+    apis = [30.0, 30.0, -1.0, 200.0]
+    batch = api_60f_crude_batch(temps, apis)
+
+    assert batch.valid.tolist() == [True, False, False, False]
+    assert batch.temp_out_of_range.tolist() == [False, True, False, False]
+    assert batch.api_not_positive.tolist() == [False, False, True, False]
+    assert batch.density_out_of_range.tolist() == [False, False, False, True]
+    assert batch.values()[0] == api_60f_crude(60.0, 30.0)
+    assert batch.values()[1:] == [None, None, None]
+    for index in range(1, 4):
+        with pytest.raises(ValueError) as exc:
+            api_60f_crude(temps[index], apis[index])
+        assert batch.error(index) == str(exc.value)
+    assert batch.error(0) is None
+
+
+def test_api_60f_crude_batch_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        api_60f_crude_batch([60.0, 70.0], [30.0])
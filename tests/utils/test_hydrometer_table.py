@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.core.config import get_settings
+from app.utils import hydrometer_table
+from app.utils.hydrometer import api_60f_crude
+from app.utils.hydrometer_table import Api60fTable, api_60f_batch, build_api60f_table
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory) -> Api60fTable:
+    path = tmp_path_factory.mktemp("api60f") / "table.npy"
+    build_api60f_table().save(path)
+    return Api60fTable.load(path)
+
+
+def test_table_is_memory_mapped(table):
+    assert isinstance(table.grid, np.memmap)
+
+
+def test_table_exact_hits_match_solver(table):
+    rng = np.random.default_rng(1298)
+    temps = rng.integers(-580, 3021, 2000) / 10
+    apis = rng.integers(1, 1001, 2000) / 10
+    batch = table.lookup_batch(temps, apis)
+    expected = [api_60f_crude(t, a) for t, a in zip(temps.tolist(), apis.tolist(), strict=True)]
+    assert batch.values() == expected
+
+
+def test_table_off_grid_readings_match_solver(table):
+    rng = np.random.default_rng(60)
+    temps = np.concatenate([rng.uniform(-58.0, 302.0, 5000), rng.integers(-580, 3021, 5000) / 10])
+    apis = np.concatenate([rng.uniform(0.01, 100.0, 5000), rng.uniform(0.01, 100.0, 5000)])
+    batch = table.lookup_batch(temps, apis)
+    expected = [api_60f_crude(t, a) for t, a in zip(temps.tolist(), apis.tolist(), strict=True)]
+    assert batch.values() == expected
+
+
+def test_table_lookup_validates_like_solver(table):
+    assert table.lookup(70.0, 28.5) == api_60f_crude(70.0, 28.5)
+    with pytest.raises(ValueError):
+        table.lookup(9999.0, 30.0)
+    batch = table.lookup_batch([60.0, 60.0], [30.0, -1.0])
+    assert batch.valid.tolist() == [True, False]
+    assert batch.values()[1] is None
+
+
+def test_api_60f_batch_uses_table_when_enabled(table, monkeypatch):
+    def solver(*_args):
+        raise AssertionError("solver should not run when the lookup table is enabled")
+
+    monkeypatch.setattr(get_settings(), "api60f_lookup_enabled", True)
+    monkeypatch.setattr(hydrometer_table, "get_api60f_table", lambda: table)
+    monkeypatch.setattr(hydrometer_table, "api_60f_crude_batch", solver)
+    assert api_60f_batch([70.0], [28.5]).values() == [api_60f_crude(70.0, 28.5)]
@@ -0,0 +1,13 @@
+import pytest
+
+from app.utils.pagination import decode_id_cursor, encode_cursor
+
+
+def test_decode_id_cursor_round_trips():
+    assert decode_id_cursor(encode_cursor(42)) == 42
+
+
+@pytest.mark.parametrize("value", [{"a": 1}, "42", 1.5, True, None])
+def test_decode_id_cursor_rejects_non_integers(value):
+    with pytest.raises(ValueError):
+        decode_id_cursor(encode_cursor(value))